@@ -1,23 +1,74 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, Form
+from fastapi import FastAPI, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 
 # Import MCP router & tools from backend
-from backend.mcp_server.router import router as mcp_router
-from backend.mcp_server.tools import TOOL_REGISTRY
-from backend.config import DEFAULT_CHAT_MODEL
+from backend.mcp_server.router import llm_http_error, router as mcp_router, routing_http_error, stream_error
+from backend.mcp_server.dispatch import (
+    TOOL_SINGLE_FLIGHT,
+    ToolBusyError,
+    available_tools,
+    concurrency_slot,
+    dispatch_tool,
+)
+from backend.mcp_server.tools import astream_chat
+from backend.config import DEFAULT_CHAT_MODEL, config_summary, config_warnings
+from backend.data_store import DATA_STORE
+from backend.jobs import WORKFLOW_JOBS
+from backend.langgraph_pipeline import workflow_node_cache_stats
+from backend.llm_cache import llm_cache_stats
+from backend.llm_client import LLMError, aclose_clients
+from backend.llm_resilience import llm_resilience_stats
+from backend.logging_setup import configure_logging
+from backend.model_router import ModelRoutingError, route_payload, routing_stats
+from backend.observability import REGISTRY, TracingMiddleware, recent_spans
+from backend.prompt_profiler import PROMPT_PROFILER
+from backend.semantic_cache import CHAT_SEMANTIC_CACHE
+from backend.sse import SSE_HEADERS, format_sse
+
+
+logger = logging.getLogger("backend.app")
+
+
+# ============================================================
+# Application lifecycle
+#
+# Importing this module only wires routes; nothing is loaded and no client
+# is created. Startup logs the configuration and loads the synthetic data
+# (so the first request does not pay for it); the LangChain / LangGraph
+# stack is imported on the first LLM call or workflow run. Shutdown closes
+# the pooled HTTP clients.
+# ============================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging()
+    for warning in config_warnings():
+        logger.warning(warning)
+    logger.info("Configuration loaded", extra={"config": config_summary()})
+
+    snapshot = await asyncio.to_thread(DATA_STORE.snapshot)
+    logger.info("Synthetic data loaded (version %s, %d files)", snapshot.version, len(snapshot.data))
+
+    yield
+
+    await aclose_clients()
+    logger.info("Shutdown complete")
 
 
 # ============================================================
 # FastAPI application
 # ============================================================
 
-app = FastAPI(title="AI Transition LLM App (MCP + LangGraph)")
+app = FastAPI(title="AI Transition LLM App (MCP + LangGraph)", lifespan=lifespan)
 
 
 # ------------------------------------------------------------
@@ -31,6 +82,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# One "http.request" span + latency histogram per request (backend/observability.py)
+app.add_middleware(TracingMiddleware)
+
 
 # ------------------------------------------------------------
 # Include MCP router
@@ -76,17 +130,21 @@ async def serve_frontend() -> HTMLResponse:
 #     method: "POST",
 #     headers: { "Content-Type": "application/x-www-form-urlencoded" },
 #     body: "message=" + encodeURIComponent(text) + "&llm1=" + encodeURIComponent(llm1Model)
+#           + "&session_id=" + encodeURIComponent(sessionId)
 #   })
 #
 # This endpoint delegates to the MCP "chat" tool, which will:
-#   - Maintain chat history (in tools.py)
+#   - Maintain per-session chat history (backend/chat_memory.py)
 #   - Generate follow-up question suggestions
+#   - Answer paraphrases of earlier questions from the semantic cache
+#     (backend/semantic_cache.py), reported back as "semantic_cache"
 #   - Return JSON: { "answer": str, "suggestions": [str, ...] }
 # ------------------------------------------------------------
 @app.post("/chatbot")
 async def chatbot(
     message: str = Form(...),
     llm1: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
 ):
     """
     Interactive chatbot endpoint.
@@ -94,11 +152,13 @@ async def chatbot(
     - Uses the MCP `chat` tool under the hood.
     - `message` is the user's new question.
     - `llm1` (optional) is the selected LLM model from the UI; if not provided,
-      falls back to DEFAULT_CHAT_MODEL from backend.config.
+      falls back to DEFAULT_CHAT_MODEL from backend.config. "auto" lets
+      backend/model_router.py pick the model (reported back as "routing").
+    - `session_id` (optional) keeps each browser's conversation separate.
     """
     tool_name = "chat"  # must match key in TOOL_REGISTRY in backend.mcp_server.tools
 
-    if tool_name not in TOOL_REGISTRY:
+    if tool_name not in available_tools():
         # Safety check in case tools.py is not wired yet
         return {
             "answer": "Chat tool is not configured on the server.",
@@ -111,21 +171,84 @@ async def chatbot(
         "tool": tool_name,
         "model": model_to_use,
         "input": message,
+        "extra": {"session_id": session_id} if session_id else {},
         # You can add more fields if needed later, e.g. project id, user id, etc.
     }
 
-    chat_fn = TOOL_REGISTRY[tool_name]
-    result = chat_fn(payload)
+    # Awaited through the dispatch layer so the event loop is never blocked
+    try:
+        result = await dispatch_tool(tool_name, payload)
+    except ToolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except LLMError as e:
+        raise llm_http_error(e)
+    except ModelRoutingError as e:
+        raise routing_http_error(e)
+    except ValueError as e:
+        # Invalid tool arguments (e.g. a model outside ALLOWED_MODELS)
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Expecting result like: {"answer": "...", "suggestions": [...]}
     # If your MCP tool returns a different shape, adjust this mapping.
     answer = result.get("answer") or result.get("output") or "[No response]"
     suggestions = result.get("suggestions") or []
 
-    return {
+    response = {
         "answer": answer,
         "suggestions": suggestions,
     }
+    for key in ("routing", "semantic_cache"):
+        if key in result:
+            response[key] = result[key]
+    return response
+
+
+# ------------------------------------------------------------
+# Streaming chatbot endpoint (Server-Sent Events)
+#
+# Same form fields as /chatbot. Emits:
+#   event: routing      data: {"model": "...", "tier": ...}  (first, llm1=auto only)
+#   event: token        data: {"text": "..."}            (repeated)
+#   event: answer       data: {"answer": "<full text>"}   (+ "semantic_cache" on a cache hit)
+#   event: suggestions  data: {"suggestions": [...]}      (trailing)
+#   event: error        data: {"detail": "...", "status": 503}
+# ------------------------------------------------------------
+@app.post("/chatbot/stream")
+async def chatbot_stream(
+    message: str = Form(...),
+    llm1: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
+):
+    """
+    Streaming variant of /chatbot: answer tokens are sent immediately,
+    follow-up suggestions arrive as a separate trailing event.
+    """
+    try:
+        payload, decision = route_payload("chat", {
+            "tool": "chat",
+            "model": llm1 or DEFAULT_CHAT_MODEL,
+            "input": message,
+            "extra": {"session_id": session_id} if session_id else {},
+        })
+    except ModelRoutingError as e:
+        raise routing_http_error(e)
+
+    async def event_stream():
+        if decision is not None:
+            yield format_sse("routing", decision.to_dict())
+        try:
+            async with concurrency_slot("chat", payload):
+                async for ev in astream_chat(payload):
+                    data = {k: v for k, v in ev.items() if k != "event"}
+                    yield format_sse(ev["event"], data)
+        except Exception as e:
+            yield format_sse("error", stream_error(e, "Chat stream"))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
 
 
 # ------------------------------------------------------------
@@ -133,7 +256,95 @@ async def chatbot(
 # ------------------------------------------------------------
 @app.get("/health")
 async def health():
-    return {"status": "ok", "backend": "fastapi", "mcp": True}
+    return {
+        "status": "ok",
+        "backend": "fastapi",
+        "mcp": True,
+        "llm_cache": llm_cache_stats(),
+        "chat_semantic_cache": CHAT_SEMANTIC_CACHE.stats(),
+        "workflow_node_cache": workflow_node_cache_stats(),
+        "coalescing": TOOL_SINGLE_FLIGHT.stats(),
+        "llm": llm_resilience_stats(),
+        "workflow_jobs": WORKFLOW_JOBS.stats(),
+        "synthetic_data": DATA_STORE.stats(),
+        "model_routing": routing_stats(),
+    }
+
+
+# ------------------------------------------------------------
+# Metrics (Prometheus text format) + recent trace spans
+#
+# Request / tool / node / LLM latencies and token counts are recorded as
+# they happen; the gauges below are read from the existing stats at scrape
+# time. All values are per worker process.
+# ------------------------------------------------------------
+REGISTRY.gauge(
+    "workflow_jobs", "Workflow jobs held by this worker, by status.", ("status",),
+    lambda: {(status,): n for status, n in WORKFLOW_JOBS.stats().items()},
+)
+REGISTRY.gauge(
+    "llm_circuit_state", "1 for the current circuit breaker state of each model.", ("model", "state"),
+    lambda: {(model, s["circuit"]): 1 for model, s in llm_resilience_stats().items()},
+)
+REGISTRY.gauge(
+    "llm_guard_events", "Cumulative LLM attempts / retries / throttles / rejections per model.",
+    ("model", "event"),
+    lambda: {
+        (model, event): s[event]
+        for model, s in llm_resilience_stats().items()
+        for event in ("attempts", "successes", "failures", "retries", "throttled", "rejected")
+    },
+)
+REGISTRY.gauge(
+    "cache_lookups", "Cumulative cache lookups by cache and result.", ("cache", "result"),
+    lambda: {
+        (cache, result): stats[result]
+        for cache, stats in (
+            ("llm", llm_cache_stats()),
+            ("chat_semantic", CHAT_SEMANTIC_CACHE.stats()),
+            ("workflow_node", workflow_node_cache_stats()),
+        )
+        if stats.get("enabled")
+        for result in ("hits", "misses")
+    },
+)
+REGISTRY.gauge(
+    "mcp_coalesced_calls", "Cumulative tool calls that joined an identical in-flight call.", (),
+    lambda: {(): TOOL_SINGLE_FLIGHT.stats()["coalesced"]},
+)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/traces")
+async def traces(limit: int = 100, trace_id: Optional[str] = None):
+    """Most recent finished spans (newest first); filter by trace_id to see one request."""
+    return {"spans": recent_spans(limit=max(1, min(limit, 1000)), trace_id=trace_id)}
+
+
+# ------------------------------------------------------------
+# Prompt profile report
+#
+# Aggregates profiled LLM calls (PROMPT_PROFILING_ENABLED=1, or MCP calls
+# with extra.profile=true): tokens per prompt section for every agent / tool,
+# completion tokens and cost per model. Filter by agent, model or trace_id
+# (from /traces); `last` limits it to the N most recent calls.
+# ------------------------------------------------------------
+@app.get("/profile/prompts")
+async def prompt_profile(
+    agent: Optional[str] = None,
+    model: Optional[str] = None,
+    trace_id: Optional[str] = None,
+    last: Optional[int] = None,
+    include_calls: bool = False,
+):
+    report = PROMPT_PROFILER.report(agent=agent, model=model, trace_id=trace_id, last=last)
+    if include_calls:
+        report["calls_detail"] = PROMPT_PROFILER.records(agent=agent, model=model, trace_id=trace_id, last=last)
+    return report
 
 
 # ============================================================
@@ -21,8 +21,20 @@ Clean, structured text suitable for UI display + LangGraph supervisor agent.
 from __future__ import annotations
 from typing import Dict, Any
 
-from backend.llm_client import call_llm
+from backend.llm_client import call_llm, acall_llm
 from backend.config import DEFAULT_AGENT_MODEL
+from backend.context_selection import agent_context
+from backend.prompt_profiler import compose_prompt
+
+
+COMMS_AGENT_TEMPERATURE = 0.2
+COMMS_AGENT_SYSTEM_PROMPT = "You are an expert Communication Analyst for IT Transition Programs."
+
+# Bump when build_comms_prompt() changes what it writes (keys the workflow node cache)
+COMMS_AGENT_PROMPT_VERSION = 1
+
+# Synthetic data files this agent reads (also keys its workflow node cache)
+COMMS_AGENT_DATA_FILES = ["comms_logs.json", "project_data.json"]
 
 
 def build_comms_prompt(
@@ -32,14 +44,22 @@ def build_comms_prompt(
 ) -> str:
     """
     Builds the communication analysis prompt.
-    Includes synthetic comms logs from backend/synthetic_data.
+    Includes the synthetic comms log records relevant to the question
+    (within the comms agent's token budget).
+    Sections are named for the prompt profiler.
     """
 
-    comms_logs = synthetic_data.get("comms_logs.json", {})
-    project_data = synthetic_data.get("project_data.json", {})
+    context = agent_context(
+        "comms",
+        question,
+        synthetic_data,
+        COMMS_AGENT_DATA_FILES,
+    )
+    comms_logs = context["comms_logs.json"]
+    project_data = context["project_data.json"]
 
-    return f"""
-You are the Communication Analysis Agent in an IT Transition & Risk Tracking system.
+    return compose_prompt("comms", [
+        ("instructions", """You are the Communication Analysis Agent in an IT Transition & Risk Tracking system.
 
 Your responsibilities:
 - Identify stakeholder misalignment.
@@ -49,25 +69,8 @@ Your responsibilities:
 - Measure how well teams collaborate across onshore/offshore.
 - Highlight areas where poor communication increases risk.
 
-Use the context below:
-
--------------------------------------
-USER QUESTION:
-{question}
-
--------------------------------------
-PROJECT AGENT SUMMARY:
-{project_agent_summary}
-
--------------------------------------
-SYNTHETIC PROJECT METADATA:
-{project_data}
-
--------------------------------------
-COMMUNICATION LOGS (SYNTHETIC):
-{comms_logs}
-
--------------------------------------
+Use the context below:"""),
+        ("output_format", """-------------------------------------
 EXPECTED OUTPUT STRUCTURE:
 Provide a clear structured analysis:
 
@@ -79,8 +82,20 @@ Provide a clear structured analysis:
 6. Communication-Based Risks
 7. Recommendations & Fixes (actionable)
 
-Ensure clarity, avoid generic statements, and reference the synthetic data where useful.
-"""
+Ensure clarity, avoid generic statements, and reference the synthetic data where useful."""),
+        ("project_data.json", f"""-------------------------------------
+SYNTHETIC PROJECT METADATA:
+{project_data}"""),
+        ("comms_logs.json", f"""-------------------------------------
+COMMUNICATION LOGS (SYNTHETIC):
+{comms_logs}"""),
+        ("project_summary", f"""-------------------------------------
+PROJECT AGENT SUMMARY:
+{project_agent_summary}"""),
+        ("question", f"""-------------------------------------
+USER QUESTION:
+{question}"""),
+    ])
 
 
 def run_comms_agent(
@@ -107,8 +122,35 @@ def run_comms_agent(
     response = call_llm(
         model=model,
         prompt=prompt,
-        temperature=0.2,
-        system_prompt="You are an expert Communication Analyst for IT Transition Programs.",
+        temperature=COMMS_AGENT_TEMPERATURE,
+        system_prompt=COMMS_AGENT_SYSTEM_PROMPT,
     )
 
     return response
+
+
+async def arun_comms_agent(
+    question: str,
+    project_agent_summary: str,
+    model: str = DEFAULT_AGENT_MODEL,
+    synthetic_data: Dict[str, Any] = None
+) -> str:
+    """
+    Async version of run_comms_agent() (uses acall_llm).
+    """
+
+    if synthetic_data is None:
+        synthetic_data = {}
+
+    prompt = build_comms_prompt(
+        question=question,
+        project_agent_summary=project_agent_summary,
+        synthetic_data=synthetic_data,
+    )
+
+    return await acall_llm(
+        model=model,
+        prompt=prompt,
+        temperature=COMMS_AGENT_TEMPERATURE,
+        system_prompt=COMMS_AGENT_SYSTEM_PROMPT,
+    )
@@ -26,8 +26,22 @@ A structured summary suitable for:
 from __future__ import annotations
 from typing import Dict, Any
 
-from backend.llm_client import call_llm
+from backend.llm_client import call_llm, acall_llm
 from backend.config import DEFAULT_AGENT_MODEL
+from backend.context_selection import agent_context
+from backend.prompt_profiler import compose_prompt
+
+
+PROJECT_AGENT_TEMPERATURE = 0.1
+PROJECT_AGENT_SYSTEM_PROMPT = (
+    "You are an IT Transition Project Lead with deep expertise in migrations, KT, and hypercare."
+)
+
+# Bump when build_project_prompt() changes what it writes (keys the workflow node cache)
+PROJECT_AGENT_PROMPT_VERSION = 1
+
+# Synthetic data files this agent reads (also keys its workflow node cache)
+PROJECT_AGENT_DATA_FILES = ["project_data.json", "transition_examples.json"]
 
 
 # ============================================================
@@ -37,36 +51,30 @@ from backend.config import DEFAULT_AGENT_MODEL
 def build_project_prompt(question: str, synthetic_data: Dict[str, Any]) -> str:
     """
     Build prompt for project-level contextual analysis.
-    Takes synthetic data to anchor the reasoning.
+    Takes synthetic data to anchor the reasoning (only the records relevant
+    to the question, within the project agent's token budget).
+    Sections are named for the prompt profiler.
     """
 
-    project_data = synthetic_data.get("project_data.json", {})
-    transition_examples = synthetic_data.get("transition_examples.json", {})
+    context = agent_context(
+        "project",
+        question,
+        synthetic_data,
+        PROJECT_AGENT_DATA_FILES,
+    )
+    project_data = context["project_data.json"]
+    transition_examples = context["transition_examples.json"]
 
-    return f"""
-You are the Project Understanding Agent for an IT Transition Program.
+    return compose_prompt("project", [
+        ("instructions", """You are the Project Understanding Agent for an IT Transition Program.
 
 Your job is to:
 - Interpret the user's question.
 - Provide transition-aligned project understanding using real transition language.
 - Identify major milestones, readiness progress, KT state, gaps, ownership, and dependencies.
 - Consider synthetic project metadata as part of your reasoning.
-- Produce a structured summary usable by Risk, Comms, and Supervisor agents.
-
----------------------------------------
-USER QUESTION:
-{question}
-
----------------------------------------
-SYNTHETIC PROJECT METADATA:
-{project_data}
-
----------------------------------------
-SYNTHETIC TRANSITION EXAMPLES:
-(Examples of transitions, milestone definitions, KT progress, effectiveness measures)
-{transition_examples}
-
----------------------------------------
+- Produce a structured summary usable by Risk, Comms, and Supervisor agents."""),
+        ("output_format", """---------------------------------------
 EXPECTED OUTPUT STRUCTURE (STRICT):
 1. High-Level Understanding of the Ask
 2. Relevant Transition Milestones & Current Status
@@ -77,8 +85,18 @@ EXPECTED OUTPUT STRUCTURE (STRICT):
 7. Early Observed Risks (Avoid duplicating risk agent)
 8. Recommended Next Steps (Actionable)
 
-Make your response structured, crisp, and aligned with IT Transition best practices.
-"""
+Make your response structured, crisp, and aligned with IT Transition best practices."""),
+        ("project_data.json", f"""---------------------------------------
+SYNTHETIC PROJECT METADATA:
+{project_data}"""),
+        ("transition_examples.json", f"""---------------------------------------
+SYNTHETIC TRANSITION EXAMPLES:
+(Examples of transitions, milestone definitions, KT progress, effectiveness measures)
+{transition_examples}"""),
+        ("question", f"""---------------------------------------
+USER QUESTION:
+{question}"""),
+    ])
 
 
 # ============================================================
@@ -107,8 +125,33 @@ def run_project_agent(
     response = call_llm(
         model=model,
         prompt=prompt,
-        temperature=0.1,
-        system_prompt="You are an IT Transition Project Lead with deep expertise in migrations, KT, and hypercare."
+        temperature=PROJECT_AGENT_TEMPERATURE,
+        system_prompt=PROJECT_AGENT_SYSTEM_PROMPT,
     )
 
     return response
+
+
+async def arun_project_agent(
+    question: str,
+    model: str = DEFAULT_AGENT_MODEL,
+    synthetic_data: Dict[str, Any] = None
+) -> str:
+    """
+    Async version of run_project_agent() (uses acall_llm).
+    """
+
+    if synthetic_data is None:
+        synthetic_data = {}
+
+    prompt = build_project_prompt(
+        question=question,
+        synthetic_data=synthetic_data,
+    )
+
+    return await acall_llm(
+        model=model,
+        prompt=prompt,
+        temperature=PROJECT_AGENT_TEMPERATURE,
+        system_prompt=PROJECT_AGENT_SYSTEM_PROMPT,
+    )
@@ -24,8 +24,23 @@ Risk categories considered:
 from __future__ import annotations
 from typing import Dict, Any
 
-from backend.llm_client import call_llm
+from backend.llm_client import call_llm, acall_llm
 from backend.config import DEFAULT_AGENT_MODEL
+from backend.context_selection import agent_context
+from backend.prompt_profiler import compose_prompt
+
+
+RISK_AGENT_TEMPERATURE = 0.15
+RISK_AGENT_SYSTEM_PROMPT = (
+    "You are an expert IT Transition & Program Risk Manager. "
+    "Be precise, structured, and directly linked to transition execution."
+)
+
+# Bump when build_risk_prompt() changes what it writes (keys the workflow node cache)
+RISK_AGENT_PROMPT_VERSION = 1
+
+# Synthetic data files this agent reads (also keys its workflow node cache)
+RISK_AGENT_DATA_FILES = ["risk_logs.json", "project_data.json", "transition_examples.json"]
 
 
 # ============================================================
@@ -38,43 +53,30 @@ def build_risk_prompt(
     synthetic_data: Dict[str, Any]
 ) -> str:
     """
-    Construct the risk analysis prompt including synthetic risk metadata.
+    Construct the risk analysis prompt including synthetic risk metadata
+    (only the records relevant to the question, within the risk agent's budget).
+    Sections are named for the prompt profiler.
     """
 
-    risk_logs = synthetic_data.get("risk_logs.json", {})
-    project_data = synthetic_data.get("project_data.json", {})
-    transition_examples = synthetic_data.get("transition_examples.json", {})
+    context = agent_context(
+        "risk",
+        question,
+        synthetic_data,
+        RISK_AGENT_DATA_FILES,
+    )
+    risk_logs = context["risk_logs.json"]
+    project_data = context["project_data.json"]
+    transition_examples = context["transition_examples.json"]
 
-    return f"""
-You are the RISK ANALYST AGENT for an IT Transition & KT Program.
+    return compose_prompt("risk", [
+        ("instructions", """You are the RISK ANALYST AGENT for an IT Transition & KT Program.
 
 Your responsibilities:
 - Identify, classify, and assess risks that affect timeline, KT effectiveness, documentation, environment setup, and delivery.
 - Use synthetic risk logs for realistic patterns.
 - Use project metadata and the Project Agent's understanding as context.
-- Provide mitigation steps that are specific and actionable.
-
----------------------------------------
-USER QUESTION:
-{question}
-
----------------------------------------
-PROJECT AGENT SUMMARY:
-{project_agent_summary}
-
----------------------------------------
-SYNTHETIC PROJECT METADATA:
-{project_data}
-
----------------------------------------
-SYNTHETIC RISK LOGS:
-{risk_logs}
-
----------------------------------------
-TRANSITION EXAMPLES (for context and patterns):
-{transition_examples}
-
----------------------------------------
+- Provide mitigation steps that are specific and actionable."""),
+        ("output_format", """---------------------------------------
 EXPECTED OUTPUT STRUCTURE (STRICT):
 1. Key Transition Risks  
 2. Severity & Likelihood Assessment  
@@ -85,8 +87,23 @@ EXPECTED OUTPUT STRUCTURE (STRICT):
 7. Early Warning Indicators  
 8. Required Stakeholder Actions  
 
-Ensure clarity, avoid generic answers, and reference synthetic data where appropriate.
-"""
+Ensure clarity, avoid generic answers, and reference synthetic data where appropriate."""),
+        ("project_data.json", f"""---------------------------------------
+SYNTHETIC PROJECT METADATA:
+{project_data}"""),
+        ("risk_logs.json", f"""---------------------------------------
+SYNTHETIC RISK LOGS:
+{risk_logs}"""),
+        ("transition_examples.json", f"""---------------------------------------
+TRANSITION EXAMPLES (for context and patterns):
+{transition_examples}"""),
+        ("project_summary", f"""---------------------------------------
+PROJECT AGENT SUMMARY:
+{project_agent_summary}"""),
+        ("question", f"""---------------------------------------
+USER QUESTION:
+{question}"""),
+    ])
 
 
 # ============================================================
@@ -117,12 +134,36 @@ def run_risk_agent(
     response = call_llm(
         model=model,
         prompt=prompt,
-        temperature=0.15,
-        system_prompt=(
-            "You are an expert IT Transition & Program Risk Manager. "
-            "Be precise, structured, and directly linked to transition execution."
-        ),
+        temperature=RISK_AGENT_TEMPERATURE,
+        system_prompt=RISK_AGENT_SYSTEM_PROMPT,
     )
 
     return response
+
+
+async def arun_risk_agent(
+    question: str,
+    project_agent_summary: str,
+    model: str = DEFAULT_AGENT_MODEL,
+    synthetic_data: Dict[str, Any] = None
+) -> str:
+    """
+    Async version of run_risk_agent() (uses acall_llm).
+    """
+
+    if synthetic_data is None:
+        synthetic_data = {}
+
+    prompt = build_risk_prompt(
+        question=question,
+        project_agent_summary=project_agent_summary,
+        synthetic_data=synthetic_data,
+    )
+
+    return await acall_llm(
+        model=model,
+        prompt=prompt,
+        temperature=RISK_AGENT_TEMPERATURE,
+        system_prompt=RISK_AGENT_SYSTEM_PROMPT,
+    )
 # Risk agent logic
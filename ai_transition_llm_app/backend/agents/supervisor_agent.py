@@ -20,6 +20,7 @@ Inputs:
 - risk_summary: output from risk_agent.py
 - comms_summary: output from comms_agent.py
 - synthetic_data: optional additional context
+- question: original user question (used to pick relevant synthetic records)
 
 Output:
 --------
@@ -32,8 +33,24 @@ Structured final summary for:
 from __future__ import annotations
 from typing import Dict, Any
 
-from backend.llm_client import call_llm
+from backend.llm_client import call_llm, acall_llm
 from backend.config import DEFAULT_AGENT_MODEL
+from backend.context_selection import agent_context
+from backend.prompt_profiler import compose_prompt
+
+
+SUPERVISOR_AGENT_TEMPERATURE = 0.15
+SUPERVISOR_AGENT_SYSTEM_PROMPT = (
+    "You are the Program Director for a large-scale IT Transition. "
+    "Your job is to synthesize signals from multiple teams and provide "
+    "clear guidance to leadership."
+)
+
+# Bump when build_supervisor_prompt() changes what it writes (keys the workflow node cache)
+SUPERVISOR_AGENT_PROMPT_VERSION = 1
+
+# Synthetic data files this agent reads (also keys its workflow node cache)
+SUPERVISOR_AGENT_DATA_FILES = ["project_data.json", "transition_examples.json"]
 
 
 # ============================================================
@@ -44,39 +61,25 @@ def build_supervisor_prompt(
     project_summary: str,
     risk_summary: str,
     comms_summary: str,
-    synthetic_data: Dict[str, Any]
+    synthetic_data: Dict[str, Any],
+    question: str = "",
 ) -> str:
 
-    project_data = synthetic_data.get("project_data.json", {})
-    transition_examples = synthetic_data.get("transition_examples.json", {})
+    context = agent_context(
+        "supervisor",
+        question,
+        synthetic_data,
+        SUPERVISOR_AGENT_DATA_FILES,
+    )
+    project_data = context["project_data.json"]
+    transition_examples = context["transition_examples.json"]
 
-    return f"""
-You are the SUPERVISOR AGENT in an IT Transition Program.
+    return compose_prompt("supervisor", [
+        ("instructions", """You are the SUPERVISOR AGENT in an IT Transition Program.
 
 Your job is to consolidate the outputs of multiple agents and provide
-a final, leadership-ready summary.
-
----------------------------------------
-PROJECT AGENT SUMMARY:
-{project_summary}
-
----------------------------------------
-RISK AGENT SUMMARY:
-{risk_summary}
-
----------------------------------------
-COMMUNICATION AGENT SUMMARY:
-{comms_summary}
-
----------------------------------------
-SYNTHETIC PROJECT METADATA:
-{project_data}
-
----------------------------------------
-TRANSITION EXAMPLES (for reasoning patterns):
-{transition_examples}
-
----------------------------------------
+a final, leadership-ready summary."""),
+        ("output_format", """---------------------------------------
 EXPECTED OUTPUT STRUCTURE (STRICT):
 1. Executive Transition Summary
 2. Top 5 Risks Leadership Should Be Aware Of
@@ -93,8 +96,23 @@ Tone:
 - Executive-level
 - Insightful
 - Data-informed
-- No repetition of raw agent outputs
-"""
+- No repetition of raw agent outputs"""),
+        ("project_data.json", f"""---------------------------------------
+SYNTHETIC PROJECT METADATA:
+{project_data}"""),
+        ("transition_examples.json", f"""---------------------------------------
+TRANSITION EXAMPLES (for reasoning patterns):
+{transition_examples}"""),
+        ("project_summary", f"""---------------------------------------
+PROJECT AGENT SUMMARY:
+{project_summary}"""),
+        ("risk_summary", f"""---------------------------------------
+RISK AGENT SUMMARY:
+{risk_summary}"""),
+        ("comms_summary", f"""---------------------------------------
+COMMUNICATION AGENT SUMMARY:
+{comms_summary}"""),
+    ])
 
 
 # ============================================================
@@ -106,7 +124,8 @@ def run_supervisor_agent(
     risk_summary: str,
     comms_summary: str,
     model: str = DEFAULT_AGENT_MODEL,
-    synthetic_data: Dict[str, Any] = None
+    synthetic_data: Dict[str, Any] = None,
+    question: str = "",
 ) -> str:
     """
     Execute the Supervisor Agent.
@@ -122,17 +141,45 @@ def run_supervisor_agent(
         risk_summary=risk_summary,
         comms_summary=comms_summary,
         synthetic_data=synthetic_data,
+        question=question,
     )
 
     response = call_llm(
         model=model,
         prompt=prompt,
-        temperature=0.15,
-        system_prompt=(
-            "You are the Program Director for a large-scale IT Transition. "
-            "Your job is to synthesize signals from multiple teams and provide "
-            "clear guidance to leadership."
-        ),
+        temperature=SUPERVISOR_AGENT_TEMPERATURE,
+        system_prompt=SUPERVISOR_AGENT_SYSTEM_PROMPT,
     )
 
     return response
+
+
+async def arun_supervisor_agent(
+    project_summary: str,
+    risk_summary: str,
+    comms_summary: str,
+    model: str = DEFAULT_AGENT_MODEL,
+    synthetic_data: Dict[str, Any] = None,
+    question: str = "",
+) -> str:
+    """
+    Async version of run_supervisor_agent() (uses acall_llm).
+    """
+
+    if synthetic_data is None:
+        synthetic_data = {}
+
+    prompt = build_supervisor_prompt(
+        project_summary=project_summary,
+        risk_summary=risk_summary,
+        comms_summary=comms_summary,
+        synthetic_data=synthetic_data,
+        question=question,
+    )
+
+    return await acall_llm(
+        model=model,
+        prompt=prompt,
+        temperature=SUPERVISOR_AGENT_TEMPERATURE,
+        system_prompt=SUPERVISOR_AGENT_SYSTEM_PROMPT,
+    )
@@ -0,0 +1,219 @@
+"""
+Chat memory store for the chatbot.
+
+Replaces the old single, unbounded CHAT_HISTORY list with:
+- one history per session id
+- a token budget per session: when the recent turns exceed it, the oldest
+  turns are folded into a rolling summary (so prompt size stays bounded)
+- idle-session eviction (and a cap on the number of live sessions)
+- a lock around every mutation, safe for threads and the event loop
+
+The rolling summary is built locally (no extra LLM call on the chat path):
+each evicted turn is condensed to its first sentence, and the summary itself
+is capped to its own token budget by dropping its oldest lines.
+
+Used by:
+    backend/mcp_server/tools.py → chat tools
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from backend.config import (
+    CHAT_MAX_SESSIONS,
+    CHAT_MEMORY_TOKEN_BUDGET,
+    CHAT_SESSION_IDLE_SECONDS,
+    CHAT_SUMMARY_TOKEN_BUDGET,
+)
+from backend.tokens import count_tokens
+
+
+DEFAULT_CHAT_SESSION = "default"
+
+# Max words kept per turn when it is folded into the summary
+SUMMARY_WORDS_PER_TURN = 30
+
+# How often (seconds) idle sessions are swept
+SWEEP_INTERVAL_SECONDS = 60.0
+
+
+# ============================================================
+# Data structures
+# ============================================================
+
+@dataclass
+class ChatTurn:
+    role: str      # "user" | "assistant"
+    text: str
+    tokens: int
+
+
+@dataclass
+class ChatSession:
+    session_id: str
+    turns: Deque[ChatTurn] = field(default_factory=deque)
+    turn_tokens: int = 0
+    summary_lines: Deque[str] = field(default_factory=deque)
+    summary_tokens: int = 0
+    last_access: float = field(default_factory=time.time)
+    rendered: Optional[str] = None   # cached history text, reset on change
+
+
+def _condense(turn: ChatTurn) -> str:
+    """One-line digest of a turn for the rolling summary."""
+    first_sentence = re.split(r"(?<=[.!?])\s+", turn.text.strip(), maxsplit=1)[0]
+    words = first_sentence.split()
+    digest = " ".join(words[:SUMMARY_WORDS_PER_TURN])
+    if len(words) > SUMMARY_WORDS_PER_TURN:
+        digest += " …"
+
+    role = "User asked" if turn.role == "user" else "Assistant said"
+    return f"- {role}: {digest}"
+
+
+# ============================================================
+# Store
+# ============================================================
+
+class ChatMemoryStore:
+    """Bounded, per-session chat history with rolling summaries."""
+
+    def __init__(
+        self,
+        token_budget: int = CHAT_MEMORY_TOKEN_BUDGET,
+        summary_token_budget: int = CHAT_SUMMARY_TOKEN_BUDGET,
+        idle_seconds: float = CHAT_SESSION_IDLE_SECONDS,
+        max_sessions: int = CHAT_MAX_SESSIONS,
+    ):
+        self.token_budget = token_budget
+        self.summary_token_budget = summary_token_budget
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+
+    def history_text(self, session_id: str = DEFAULT_CHAT_SESSION) -> str:
+        """
+        Conversation context for the prompt: rolling summary of older turns
+        followed by the recent turns verbatim.
+        """
+        with self._lock:
+            session = self._get(session_id, create=False)
+            if session is None:
+                return ""
+
+            if session.rendered is None:
+                parts = []
+                if session.summary_lines:
+                    parts.append("Summary of earlier conversation:")
+                    parts.extend(session.summary_lines)
+                    parts.append("")
+                for turn in session.turns:
+                    role = "User" if turn.role == "user" else "Assistant"
+                    parts.append(f"{role}: {turn.text}")
+                session.rendered = "\n".join(parts) + ("\n" if parts else "")
+
+            return session.rendered
+
+    def append_turn(
+        self,
+        user_message: str,
+        bot_reply: str,
+        session_id: str = DEFAULT_CHAT_SESSION,
+    ) -> None:
+        """Record one user/assistant exchange and enforce the token budget."""
+        user_turn = ChatTurn("user", user_message, count_tokens(user_message))
+        bot_turn = ChatTurn("assistant", bot_reply, count_tokens(bot_reply))
+
+        with self._lock:
+            session = self._get(session_id, create=True)
+            for turn in (user_turn, bot_turn):
+                session.turns.append(turn)
+                session.turn_tokens += turn.tokens
+
+            self._enforce_budget(session)
+            session.rendered = None
+
+    def turns(self, session_id: str = DEFAULT_CHAT_SESSION) -> List[Dict[str, str]]:
+        """Recent (not yet summarized) turns as {"role", "text"} dicts."""
+        with self._lock:
+            session = self._get(session_id, create=False)
+            if session is None:
+                return []
+            return [{"role": t.role, "text": t.text} for t in session.turns]
+
+    def clear(self, session_id: str = DEFAULT_CHAT_SESSION) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "token_budget": self.token_budget,
+                "summary_token_budget": self.summary_token_budget,
+            }
+
+    # --------------------------------------------------------
+    # Internals (caller holds self._lock)
+    # --------------------------------------------------------
+
+    def _get(self, session_id: str, create: bool) -> Optional[ChatSession]:
+        now = time.time()
+        self._sweep(now)
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            if not create:
+                return None
+            session = ChatSession(session_id=session_id)
+            self._sessions[session_id] = session
+
+            # Cap live sessions: drop least recently used
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+        session.last_access = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _sweep(self, now: float) -> None:
+        """Evict sessions idle for longer than idle_seconds."""
+        if now - self._last_sweep < SWEEP_INTERVAL_SECONDS:
+            return
+        self._last_sweep = now
+
+        # OrderedDict is in LRU order, so idle sessions are at the front
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_access <= self.idle_seconds:
+                break
+            self._sessions.popitem(last=False)
+
+    def _enforce_budget(self, session: ChatSession) -> None:
+        # Turns are stored in user/assistant pairs: evict whole exchanges,
+        # and always keep the latest exchange verbatim
+        while session.turn_tokens > self.token_budget and len(session.turns) > 2:
+            for _ in range(2):
+                turn = session.turns.popleft()
+                session.turn_tokens -= turn.tokens
+
+                line = _condense(turn)
+                session.summary_lines.append(line)
+                session.summary_tokens += count_tokens(line)
+
+        while session.summary_tokens > self.summary_token_budget and session.summary_lines:
+            dropped = session.summary_lines.popleft()
+            session.summary_tokens -= count_tokens(dropped)
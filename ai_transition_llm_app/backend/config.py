@@ -6,19 +6,46 @@ Contains:
 - Base URL for TCS GenAI Lab
 - API key (read from env variable or hardcoded temporarily for dev)
 - Default model selections for chatbot & workflow
+- Complexity / latency based model routing (model "auto")
+- LLM response cache settings
+- Workflow node output cache (checkpoints)
+- Chat memory limits
+- Agent prompt context budgets + rendering format
+- Semantic chat answer cache
+- MCP dispatch concurrency limits
+- Background workflow job queue
+- Outbound LLM resilience (rate limits, retries, circuit breaker)
+- Metrics + trace spans
+- Prompt size / cost profiling
+- Offline evaluation settings + model pricing
+- Logging settings
 - Synthetic data loading helper
+- Startup summary / warnings (logged by the app at startup, nothing is
+  printed at import time)
 """
 
 import os
 import json
+import logging
+import importlib.util
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+
+def _json_env(name: str, default):
+    """Read a JSON value (e.g. a dict of limits) from an environment variable."""
+    raw = os.getenv(name)
+    return json.loads(raw) if raw else default
+
 
 # ============================================================
 # API BASE URL (TCS GenAI Lab Endpoint)
 # ============================================================
 
-BASE_URL = "https://genailab.tcs.in"
+# Override with GENAI_BASE_URL, e.g. to point at the local mock server used
+# by benchmarks/ (http://127.0.0.1:8900)
+BASE_URL = os.getenv("GENAI_BASE_URL", "https://genailab.tcs.in")
 
 
 # ============================================================
@@ -28,12 +55,6 @@ BASE_URL = "https://genailab.tcs.in"
 # You can set an environment variable:  export GENAI_KEY="sk-xxxx"
 GENAI_API_KEY = os.getenv("GENAI_KEY", "REPLACE_ME_WITH_YOUR_KEY_HERE")
 
-if GENAI_API_KEY == "REPLACE_ME_WITH_YOUR_KEY_HERE":
-    print(
-        "[CONFIG WARNING] GENAI_API_KEY not set. Please update config.py or "
-        "export environment variable GENAI_KEY=your_key"
-    )
-
 
 # ============================================================
 # ALLOWED MODELS FOR THE HACKATHON (Mandatory List)
@@ -65,12 +86,279 @@ DEFAULT_JUDGE_MODEL = ALLOWED_MODELS["Phi 4 Reasoning"]
 DEFAULT_AGENT_MODEL = ALLOWED_MODELS["DeepSeek V3"]
 
 
+# ============================================================
+# MODEL ROUTING (backend/model_router.py)
+# ============================================================
+
+# Pseudo model id: requests sent with model "auto" are routed by complexity
+AUTO_MODEL = "auto"
+
+# Candidate models per complexity tier, in order of preference, and the
+# average latency (seconds) above which the next candidate is preferred
+MODEL_ROUTING_TIERS = _json_env("MODEL_ROUTING_TIERS", {
+    "simple": {
+        "models": [ALLOWED_MODELS["GPT-4o Mini"], ALLOWED_MODELS["GPT-4o"]],
+        "max_latency_s": 5,
+    },
+    "moderate": {
+        "models": [ALLOWED_MODELS["DeepSeek V3"], ALLOWED_MODELS["GPT-4o"]],
+        "max_latency_s": 20,
+    },
+    "complex": {
+        "models": [ALLOWED_MODELS["DeepSeek R1 (Reasoning)"], ALLOWED_MODELS["DeepSeek V3"]],
+        "max_latency_s": 60,
+    },
+})
+
+# Lowest tier used for workflow agents (their prompts are long and structured)
+MODEL_ROUTING_AGENT_MIN_TIER = os.getenv("MODEL_ROUTING_AGENT_MIN_TIER", "moderate")
+
+# A candidate is skipped while its recent error rate is above this
+MODEL_ROUTING_MAX_ERROR_RATE = float(os.getenv("MODEL_ROUTING_MAX_ERROR_RATE", "0.3"))
+
+# Weight of the newest call in the moving latency / error averages, and how
+# long a model's averages count before it is treated as unmeasured again
+MODEL_ROUTING_EWMA_ALPHA = float(os.getenv("MODEL_ROUTING_EWMA_ALPHA", "0.2"))
+MODEL_ROUTING_STATS_TTL_SECONDS = float(os.getenv("MODEL_ROUTING_STATS_TTL_SECONDS", "300"))
+
+
+# ============================================================
+# LLM RESPONSE CACHE
+# ============================================================
+
+# Set LLM_CACHE_ENABLED=0 to disable caching entirely
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+
+# In-memory LRU tier
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+
+# Entries older than this are treated as misses (0 = never expire)
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+
+# Optional on-disk SQLite tier that survives restarts, e.g. ".cache/llm_cache.sqlite3"
+LLM_CACHE_DB_PATH = os.getenv("LLM_CACHE_DB_PATH") or None
+LLM_CACHE_MAX_DISK_ENTRIES = int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "20000"))
+
+
+# ============================================================
+# WORKFLOW NODE OUTPUT CACHE
+# ============================================================
+
+# Per-node memoization of agent outputs, keyed by the node's exact inputs
+# (question, model, upstream outputs, digests of the data files it reads)
+# and a fingerprint of its prompt template and context settings.
+# Also acts as a checkpoint: re-running a failed workflow reuses the nodes
+# that had already finished.
+WORKFLOW_NODE_CACHE_ENABLED = os.getenv("WORKFLOW_NODE_CACHE_ENABLED", "1") != "0"
+WORKFLOW_NODE_CACHE_MAX_ENTRIES = int(os.getenv("WORKFLOW_NODE_CACHE_MAX_ENTRIES", "512"))
+WORKFLOW_NODE_CACHE_TTL_SECONDS = float(os.getenv("WORKFLOW_NODE_CACHE_TTL_SECONDS", "86400"))
+
+# SQLite file for checkpoints that survive restarts (defaults to
+# "workflow_node_cache.sqlite3" next to LLM_CACHE_DB_PATH; never the same file)
+WORKFLOW_NODE_CACHE_DB_PATH = os.getenv("WORKFLOW_NODE_CACHE_DB_PATH") or (
+    str(Path(LLM_CACHE_DB_PATH).with_name("workflow_node_cache.sqlite3")) if LLM_CACHE_DB_PATH else None
+)
+
+
+# ============================================================
+# CHAT MEMORY
+# ============================================================
+
+# Recent turns kept verbatim per session; older turns are summarized
+CHAT_MEMORY_TOKEN_BUDGET = int(os.getenv("CHAT_MEMORY_TOKEN_BUDGET", "1500"))
+CHAT_SUMMARY_TOKEN_BUDGET = int(os.getenv("CHAT_SUMMARY_TOKEN_BUDGET", "300"))
+
+# Sessions idle for longer than this are dropped
+CHAT_SESSION_IDLE_SECONDS = float(os.getenv("CHAT_SESSION_IDLE_SECONDS", "1800"))
+CHAT_MAX_SESSIONS = int(os.getenv("CHAT_MAX_SESSIONS", "1000"))
+
+
+# ============================================================
+# AGENT PROMPT CONTEXT SELECTION
+# ============================================================
+
+# Set CONTEXT_SELECTION_ENABLED=0 to paste whole synthetic files (old behavior)
+CONTEXT_SELECTION_ENABLED = os.getenv("CONTEXT_SELECTION_ENABLED", "1") != "0"
+
+# How synthetic records are written into prompts: "table" (flat items as
+# table rows, column names once per table) or "json" (one minified JSON line
+# per record)
+CONTEXT_RENDER_FORMAT = os.getenv("CONTEXT_RENDER_FORMAT", "table")
+
+# Max tokens of synthetic-data records each agent may put in its prompt
+AGENT_CONTEXT_TOKEN_BUDGETS = {
+    "project": int(os.getenv("PROJECT_AGENT_CONTEXT_TOKENS", "900")),
+    "risk": int(os.getenv("RISK_AGENT_CONTEXT_TOKENS", "1200")),
+    "comms": int(os.getenv("COMMS_AGENT_CONTEXT_TOKENS", "900")),
+    "supervisor": int(os.getenv("SUPERVISOR_AGENT_CONTEXT_TOKENS", "700")),
+}
+
+# Number of matching synthetic records added to each chat prompt (0 = none)
+CHAT_CONTEXT_RECORDS = int(os.getenv("CHAT_CONTEXT_RECORDS", "3"))
+
+# Max results of one "search" tool call (extra.k is clamped to 1..SEARCH_MAX_K)
+SEARCH_MAX_K = int(os.getenv("SEARCH_MAX_K", "50"))
+
+
+# ============================================================
+# SEMANTIC CHAT CACHE (backend/semantic_cache.py)
+# ============================================================
+
+# Set CHAT_SEMANTIC_CACHE_ENABLED=0 to always send chat questions to the model
+CHAT_SEMANTIC_CACHE_ENABLED = os.getenv("CHAT_SEMANTIC_CACHE_ENABLED", "1") != "0"
+
+# Cosine similarity (0..1) a new question needs with a cached one to reuse
+# its answer; lower values hit more often but risk mismatched answers
+CHAT_SEMANTIC_CACHE_THRESHOLD = float(os.getenv("CHAT_SEMANTIC_CACHE_THRESHOLD", "0.9"))
+
+# Cached questions (LRU eviction), their lifetime, and embedding dimensions
+CHAT_SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_SEMANTIC_CACHE_MAX_ENTRIES", "2048"))
+CHAT_SEMANTIC_CACHE_TTL_SECONDS = float(os.getenv("CHAT_SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+CHAT_SEMANTIC_CACHE_DIM = int(os.getenv("CHAT_SEMANTIC_CACHE_DIM", "512"))
+
+
+# ============================================================
+# MCP DISPATCH CONCURRENCY
+# ============================================================
+
+# Worker threads for tools that only have a sync implementation
+MCP_SYNC_TOOL_WORKERS = int(os.getenv("MCP_SYNC_TOOL_WORKERS", "16"))
+
+# Max concurrent calls per tool, e.g. MCP_TOOL_CONCURRENCY='{"workflow": 4}'
+MCP_TOOL_CONCURRENCY = _json_env("MCP_TOOL_CONCURRENCY", {
+    "workflow": 8,
+    "compare": 8,
+    "judge": 8,
+    "chat": 32,
+    "evaluate": 2,
+})
+
+# Max concurrent tool calls per model ID (models not listed use the default)
+MODEL_CONCURRENCY_DEFAULT = int(os.getenv("MODEL_CONCURRENCY_DEFAULT", "16"))
+MODEL_CONCURRENCY = _json_env("MODEL_CONCURRENCY", {})
+
+# Max models in one "compare" call (extra.models); their calls run concurrently
+COMPARE_MAX_MODELS = int(os.getenv("COMPARE_MAX_MODELS", str(len(ALLOWED_MODELS))))
+
+# How long a call may wait for a free slot before the server answers 503
+MCP_QUEUE_TIMEOUT_SECONDS = float(os.getenv("MCP_QUEUE_TIMEOUT_SECONDS", "30"))
+
+# Tools whose identical concurrent calls share one in-flight execution
+MCP_COALESCE_TOOLS = set(_json_env("MCP_COALESCE_TOOLS", ["workflow", "chat", "compare", "judge"]))
+
+# /mcp/batch: max parallelism per batch (also capped per tool by
+# MCP_TOOL_CONCURRENCY) and max calls per request
+MCP_BATCH_MAX_PARALLEL = int(os.getenv("MCP_BATCH_MAX_PARALLEL", "8"))
+MCP_BATCH_MAX_CALLS = int(os.getenv("MCP_BATCH_MAX_CALLS", "500"))
+
+# How long a batch call may wait for a concurrency slot (0 = no limit, so long
+# batches queue behind interactive traffic instead of failing with 503)
+MCP_BATCH_QUEUE_TIMEOUT_SECONDS = float(os.getenv("MCP_BATCH_QUEUE_TIMEOUT_SECONDS", "0"))
+
+
+# ============================================================
+# BACKGROUND WORKFLOW JOBS
+# ============================================================
+
+# Worker threads running queued workflow jobs (sized independently of the
+# web workers), max jobs waiting for a worker, and how long finished jobs
+# (and their results) are kept
+WORKFLOW_JOB_WORKERS = int(os.getenv("WORKFLOW_JOB_WORKERS", "4"))
+WORKFLOW_JOB_MAX_QUEUED = int(os.getenv("WORKFLOW_JOB_MAX_QUEUED", "100"))
+WORKFLOW_JOB_RETENTION_SECONDS = float(os.getenv("WORKFLOW_JOB_RETENTION_SECONDS", "3600"))
+
+
+# ============================================================
+# OUTBOUND LLM RESILIENCE
+# ============================================================
+
+# Token bucket per model: sustained requests/second and burst size.
+# MODEL_RATE_LIMITS overrides the default per model id, e.g.
+#   {"azure/genailab-maas-gpt-4o": {"rps": 2, "burst": 4}}
+LLM_RATE_LIMIT_DEFAULT = _json_env("LLM_RATE_LIMIT_DEFAULT", {"rps": 5, "burst": 10})
+MODEL_RATE_LIMITS = _json_env("MODEL_RATE_LIMITS", {})
+
+# Give up (LLMRateLimitError) instead of queueing longer than this locally
+LLM_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT_SECONDS", "10"))
+
+# Retries for transient errors (429, 5xx, timeouts, connection errors)
+# with full-jitter exponential backoff
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_DELAY_SECONDS = float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", "0.5"))
+LLM_RETRY_MAX_DELAY_SECONDS = float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", "8"))
+
+# Circuit breaker per model: open after N consecutive transient failures,
+# allow one probe call after the reset period
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+
+# ============================================================
+# METRICS + TRACING (backend/observability.py)
+# ============================================================
+
+# Histogram buckets (seconds) for HTTP, tool, node and LLM call latencies
+METRICS_LATENCY_BUCKETS = _json_env(
+    "METRICS_LATENCY_BUCKETS", [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120]
+)
+
+# Finished spans kept in memory for GET /traces
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "1000"))
+
+# Set TRACE_LOG_SPANS=1 to also log every finished span as one JSON line
+TRACE_LOG_SPANS = os.getenv("TRACE_LOG_SPANS", "0") == "1"
+
+# ============================================================
+# PROMPT PROFILING (backend/prompt_profiler.py)
+# ============================================================
+
+# Profile every LLM call (prompt sections, tokens, cost). Single requests can
+# opt in without this via payload.extra.profile = true.
+PROMPT_PROFILING_ENABLED = os.getenv("PROMPT_PROFILING_ENABLED", "0") == "1"
+
+# Profiled calls kept in memory for GET /profile/prompts
+PROMPT_PROFILE_HISTORY = int(os.getenv("PROMPT_PROFILE_HISTORY", "1000"))
+
+# ============================================================
+# OFFLINE EVALUATION (backend/evaluation.py)
+# ============================================================
+
+# Questions evaluated at the same time (each fans out to every model)
+EVAL_MAX_PARALLEL = int(os.getenv("EVAL_MAX_PARALLEL", "4"))
+
+# Where the "evaluate" tool keeps its resumable run logs and reports
+EVAL_OUTPUT_DIR = os.getenv("EVAL_OUTPUT_DIR", ".eval")
+
+# Max questions per "evaluate" tool call (the CLI has no limit)
+EVAL_MAX_QUESTIONS = int(os.getenv("EVAL_MAX_QUESTIONS", "200"))
+
+# USD per 1M tokens by model id, e.g.
+#   {"azure/genailab-maas-gpt-4o": {"input": 2.5, "output": 10.0}}
+# Models without pricing report cost as null. Also used by the prompt profiler.
+MODEL_PRICING = _json_env("MODEL_PRICING", {})
+
+
+# ============================================================
+# LOGGING (backend/logging_setup.py)
+# ============================================================
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# "text" for humans, "json" for one JSON object per line (log shippers)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+
+
 # ============================================================
 # SYNTHETIC DATA FOLDER
 # ============================================================
 
 BASE_DIR = Path(__file__).resolve().parent
-SYNTHETIC_DATA_DIR = BASE_DIR / "synthetic_data"
+SYNTHETIC_DATA_DIR = Path(os.getenv("SYNTHETIC_DATA_DIR") or BASE_DIR / "synthetic_data")
+
+SYNTHETIC_DATA_FILES = ["project_data.json", "risk_logs.json", "comms_logs.json", "transition_examples.json"]
+
+# How often (seconds) backend/data_store.py checks file mtimes for changes
+DATA_STORE_CHECK_INTERVAL_SECONDS = float(os.getenv("DATA_STORE_CHECK_INTERVAL_SECONDS", "2"))
 
 
 def load_json(filename: str):
@@ -94,23 +382,55 @@ def load_all_synthetic_data():
     """
     data_cache = {}
 
-    for file in ["project_data.json", "risk_logs.json", "comms_logs.json", "transition_examples.json"]:
+    for file in SYNTHETIC_DATA_FILES:
         try:
             data_cache[file] = load_json(file)
         except Exception as e:
-            print(f"[Synthetic Data Warning] {file}: {e}")
+            logger.warning("Synthetic data file %s could not be loaded: %s", file, e)
 
     return data_cache
 
 
 # ============================================================
-# PRINT SUMMARY
+# STARTUP SUMMARY
 # ============================================================
 
-print("\n[CONFIG] AI Transition App Configuration Loaded:")
-print(f"- Base URL: {BASE_URL}")
-print(f"- API Key Loaded: {'YES' if GENAI_API_KEY != 'REPLACE_ME_WITH_YOUR_KEY_HERE' else 'NO'}")
-print(f"- Synthetic Data Directory: {SYNTHETIC_DATA_DIR}")
-print(f"- Default Chat Model: {DEFAULT_CHAT_MODEL}")
-print(f"- Default Agent Model: {DEFAULT_AGENT_MODEL}")
-print("===========================================================\n")
+def config_summary() -> dict:
+    """Key settings, logged once by the app at startup."""
+    return {
+        "base_url": BASE_URL,
+        "api_key_loaded": GENAI_API_KEY != "REPLACE_ME_WITH_YOUR_KEY_HERE",
+        "synthetic_data_dir": str(SYNTHETIC_DATA_DIR),
+        "default_chat_model": DEFAULT_CHAT_MODEL,
+        "default_agent_model": DEFAULT_AGENT_MODEL,
+    }
+
+
+def config_warnings() -> list:
+    """Configuration problems worth a warning at startup."""
+    warnings = []
+    if GENAI_API_KEY == "REPLACE_ME_WITH_YOUR_KEY_HERE":
+        warnings.append(
+            "GENAI_API_KEY not set. Please update config.py or "
+            "export environment variable GENAI_KEY=your_key"
+        )
+    for tier in MODEL_ROUTING_TIERS.values():
+        unknown = [m for m in tier.get("models", []) if m not in ALLOWED_MODELS.values()]
+        if unknown:
+            warnings.append(f"MODEL_ROUTING_TIERS lists models outside ALLOWED_MODELS: {', '.join(unknown)}")
+    missing_tiers = [t for t in ("simple", "moderate", "complex") if not MODEL_ROUTING_TIERS.get(t, {}).get("models")]
+    if missing_tiers:
+        warnings.append(
+            f"MODEL_ROUTING_TIERS has no models for: {', '.join(missing_tiers)}; "
+            "model 'auto' answers 503 for those tiers."
+        )
+    if CHAT_SEMANTIC_CACHE_ENABLED and importlib.util.find_spec("numpy") is None:
+        warnings.append(
+            "CHAT_SEMANTIC_CACHE_ENABLED is set but NumPy is not installed; "
+            "the semantic chat cache stays empty (pip install numpy)."
+        )
+    if CONTEXT_RENDER_FORMAT not in ("table", "json"):
+        warnings.append(
+            f"CONTEXT_RENDER_FORMAT={CONTEXT_RENDER_FORMAT!r} is not 'table' or 'json'; using 'table'."
+        )
+    return warnings
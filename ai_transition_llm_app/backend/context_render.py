@@ -0,0 +1,200 @@
+"""
+Compact rendering of synthetic data for prompts.
+
+Pasting the data dicts into f-strings gives their Python repr (quotes,
+brackets and every key repeated per item), rebuilt on every call. Instead,
+the records of the search index (backend/search_index.py) are rendered once
+per data version:
+
+- items of a list of flat objects (one risk, one milestone, ...) become rows
+  of a table whose column names are written once per prompt:
+      transition_risks: risk_id|title|severity|...
+      R1|KT gaps|High|...
+- keyed flat objects (environments.dev_environment, ...) become rows of a
+  table with the key as first column
+- a record holding a list of flat objects (teams.onshore_smes) is a table
+  of its own
+- anything else keeps the record's minified JSON text
+
+Column lists are fixed per data version (not per selection), so the same
+records always render to the same bytes. Whole-file renderings, used when
+context selection is off, are cached per file and shared by every agent
+that reads the file: together with the instructions they form a stable
+prompt prefix that provider-side prompt caching can reuse.
+
+CONTEXT_RENDER_FORMAT=json keeps the one-JSON-line-per-record format.
+
+Used by:
+    backend/context_selection.py  → agent prompt context
+    backend/mcp_server/tools.py   → chat context
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.config import CONTEXT_RENDER_FORMAT
+from backend.search_index import ContextRecord, get_index
+
+# Bump when the rendered text of records or files changes (keys the workflow
+# node cache)
+CONTEXT_RENDER_VERSION = 1
+
+_INDEXED_PATH_RE = re.compile(r"^(.+)\[\d+\]$")
+
+# (source file, table name)
+_TableKey = Tuple[str, str]
+
+
+# ============================================================
+# Cells
+# ============================================================
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def _is_flat(value: Any) -> bool:
+    """A dict whose values are scalars or lists of scalars."""
+    return isinstance(value, dict) and all(
+        _is_scalar(v) or (isinstance(v, list) and all(_is_scalar(x) for x in v))
+        for v in value.values()
+    )
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "; ".join(_cell(v) for v in value)
+    text = value if isinstance(value, str) else json.dumps(value)
+    # "|" separates cells and a newline ends the row
+    return text.replace("|", "/").replace("\n", " ")
+
+
+def _row(columns: Sequence[str], item: Dict[str, Any], key: Optional[str] = None) -> str:
+    cells = [key] if key is not None else []
+    cells.extend(_cell(item.get(c)) for c in (columns[1:] if key is not None else columns))
+    return "|".join(cells)
+
+
+def _table_layout(record: ContextRecord) -> Optional[Tuple[str, Optional[str], List[Dict[str, Any]]]]:
+    """(table name, key cell or None, items) if the record renders as table rows."""
+    value = record.value
+    match = _INDEXED_PATH_RE.match(record.path)
+    if match and _is_flat(value):
+        return match.group(1), None, [value]
+    if "." in record.path and _is_flat(value):
+        table, _, key = record.path.partition(".")
+        return table, key, [value]
+    if isinstance(value, list) and value and all(_is_flat(v) for v in value):
+        return record.path, None, list(value)
+    return None
+
+
+# ============================================================
+# Rendered data version
+# ============================================================
+
+class RenderedContext:
+    """Table rows + column headers for every record of one data version."""
+
+    def __init__(self, records: Sequence[ContextRecord]):
+        # (source, path) -> (table key, rows) for records rendered as table rows
+        self._rows: Dict[Tuple[str, str], Tuple[_TableKey, Tuple[str, ...]]] = {}
+        self._headers: Dict[_TableKey, str] = {}
+        self._by_source: Dict[str, List[ContextRecord]] = {}
+        self._files: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        for record in records:
+            self._by_source.setdefault(record.source, []).append(record)
+
+        if CONTEXT_RENDER_FORMAT == "json":
+            return
+
+        layouts = {}
+        columns: Dict[_TableKey, List[str]] = {}
+        for record in records:
+            layout = _table_layout(record)
+            if layout is None:
+                continue
+            table, key, items = layout
+            layouts[(record.source, record.path)] = layout
+            cols = columns.setdefault((record.source, table), ["key"] if key is not None else [])
+            for item in items:
+                cols.extend(c for c in item if c not in cols)
+
+        for (source, path), (table, key, items) in layouts.items():
+            cols = columns[(source, table)]
+            self._rows[(source, path)] = ((source, table), tuple(_row(cols, item, key) for item in items))
+        for (source, table), cols in columns.items():
+            self._headers[(source, table)] = f"{table}: {'|'.join(cols)}"
+
+    def render(self, records: Sequence[ContextRecord]) -> str:
+        """
+        Render `records` as text blocks: table rows are grouped under their
+        table header (at the position of the table's first row), other
+        records keep their JSON line. Records are kept in the given order.
+        """
+        blocks: "OrderedDict[Any, List[str]]" = OrderedDict()
+        for record in records:
+            entry = self._rows.get((record.source, record.path))
+            if entry is None:
+                blocks[(record.source, record.path, "json")] = [record.text]
+                continue
+            table, rows = entry
+            if table not in blocks:
+                blocks[table] = [self._headers[table]]
+            blocks[table].extend(rows)
+        return "\n".join(line for lines in blocks.values() for line in lines)
+
+    def file_text(self, source: str) -> str:
+        """Rendering of every record of one data file (cached)."""
+        text = self._files.get(source)
+        if text is None:
+            text = self.render(self._by_source.get(source, []))
+            with self._lock:
+                self._files[source] = text
+        return text
+
+
+# ============================================================
+# Shared rendering per data object
+# ============================================================
+
+_RENDER_CACHE: Dict[int, Tuple[Dict[str, Any], RenderedContext]] = {}
+_RENDER_LOCK = threading.Lock()
+
+
+def get_rendered(synthetic_data: Dict[str, Any]) -> RenderedContext:
+    """Return the (cached) rendering for this synthetic data dict."""
+    key = id(synthetic_data)
+    entry = _RENDER_CACHE.get(key)
+    if entry is not None and entry[0] is synthetic_data:
+        return entry[1]
+
+    with _RENDER_LOCK:
+        entry = _RENDER_CACHE.get(key)
+        if entry is None or entry[0] is not synthetic_data:
+            # Holding a reference to the data keeps its id() from being reused
+            entry = (synthetic_data, RenderedContext(get_index(synthetic_data).records))
+            _RENDER_CACHE[key] = entry
+            # Same retention as the search index cache
+            while len(_RENDER_CACHE) > 4:
+                _RENDER_CACHE.pop(next(iter(_RENDER_CACHE)))
+    return entry[1]
+
+
+def render_records(synthetic_data: Dict[str, Any], records: Sequence[ContextRecord]) -> str:
+    """Compact text for index records of `synthetic_data` (see RenderedContext.render)."""
+    return get_rendered(synthetic_data).render(records)
+
+
+def render_file(synthetic_data: Dict[str, Any], source: str) -> str:
+    """Compact text for a whole data file, rendered once per data version."""
+    return get_rendered(synthetic_data).file_text(source)
@@ -0,0 +1,113 @@
+"""
+Context selection for agent prompts.
+
+Instead of pasting whole synthetic JSON files into every prompt, each file is
+split into small records (one risk, one milestone, one comms issue, ...; see
+backend/search_index.py), records are BM25-scored against the user's
+question, and the best ones are packed into a per-agent token budget
+(config.AGENT_CONTEXT_TOKEN_BUDGETS). File metadata records are always kept.
+
+Chosen records are written in the compact format of backend/context_render.py.
+Budgets are measured on the records' JSON text, so the same records are
+chosen in either format and the table format only makes the block smaller.
+
+Used by:
+    backend/agents/*_agent.py → build_*_prompt()
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+from backend.config import AGENT_CONTEXT_TOKEN_BUDGETS, CONTEXT_SELECTION_ENABLED
+from backend.context_render import render_file, render_records
+from backend.search_index import ContextRecord, get_index
+
+# Bump when record selection or search_index ranking changes which records
+# a prompt gets (keys the workflow node cache)
+CONTEXT_SELECTION_VERSION = 1
+
+
+# ============================================================
+# Selection
+# ============================================================
+
+def select_records(
+    records: Sequence[ContextRecord],
+    scores: Sequence[float],
+    token_budget: int,
+) -> List[ContextRecord]:
+    """
+    Greedily pack the highest-scoring records into `token_budget`.
+
+    Metadata records are always included first. If nothing matches the
+    query, records are taken in file order so the agent still gets context.
+    The result is returned in file order.
+    """
+    chosen: List[ContextRecord] = []
+    used = 0
+
+    for record in records:
+        if record.always:
+            chosen.append(record)
+            used += record.tokens
+
+    ranked = sorted(
+        (i for i, r in enumerate(records) if not r.always),
+        key=lambda i: (-scores[i], records[i].order),
+    )
+
+    if any(scores[i] > 0 for i in ranked):
+        ranked = [i for i in ranked if scores[i] > 0]
+
+    for i in ranked:
+        record = records[i]
+        if used + record.tokens > token_budget:
+            continue
+        chosen.append(record)
+        used += record.tokens
+
+    return sorted(chosen, key=lambda r: (r.source, r.order))
+
+
+def select_context(
+    query: str,
+    synthetic_data: Dict[str, Any],
+    sources: Sequence[str],
+    token_budget: int,
+) -> Dict[str, str]:
+    """
+    Pick the records of `sources` most relevant to `query` within `token_budget`.
+
+    Returns {source file: text block} ready to paste into a prompt. When
+    selection is disabled (CONTEXT_SELECTION_ENABLED=0) each block is the
+    whole file, rendered once per data version and identical on every call.
+    """
+    if not CONTEXT_SELECTION_ENABLED:
+        return {source: render_file(synthetic_data, source) or "(no data)" for source in sources}
+
+    index = get_index(synthetic_data)
+    all_scores = index.bm25_scores(query)
+
+    wanted = set(sources)
+    picked = [i for i, r in enumerate(index.records) if r.source in wanted]
+    records = [index.records[i] for i in picked]
+    scores = [all_scores[i] for i in picked]
+
+    chosen = select_records(records, scores, token_budget)
+
+    blocks: Dict[str, str] = {}
+    for source in sources:
+        text = render_records(synthetic_data, [r for r in chosen if r.source == source])
+        blocks[source] = text or "(no relevant records)"
+    return blocks
+
+
+def agent_context(
+    agent: str,
+    query: str,
+    synthetic_data: Dict[str, Any],
+    sources: Sequence[str],
+) -> Dict[str, str]:
+    """select_context() with the configured token budget for `agent`."""
+    return select_context(query, synthetic_data, sources, AGENT_CONTEXT_TOKEN_BUDGETS[agent])
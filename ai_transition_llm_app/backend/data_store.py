@@ -0,0 +1,218 @@
+"""
+Versioned, hot-reloadable store for the synthetic data files.
+
+Replaces the one-off `SYN_DATA = load_all_synthetic_data()` at import time:
+
+- files are loaded once into an immutable DataSnapshot (nested dicts/lists
+  are frozen, so no request can modify shared data)
+- file mtimes/sizes are checked at most every DATA_STORE_CHECK_INTERVAL_SECONDS
+  (lazily, on access); when a file changed, a new snapshot is built and
+  swapped in atomically — requests already running keep the snapshot they
+  started with
+- each snapshot has a version id derived from the file contents, so every
+  worker process (and every restart) computes the same version for the same
+  data, and caches keyed on it stay warm across workers
+- a file that fails to parse (e.g. caught mid-write) keeps the previous
+  snapshot until the file changes again
+
+Used by:
+    backend/langgraph_pipeline.py → workflow runs + node cache keys
+    backend/mcp_server/tools.py   → chat context + "search" tool
+    app.py                        → /health (data version)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from backend.config import (
+    DATA_STORE_CHECK_INTERVAL_SECONDS,
+    SYNTHETIC_DATA_DIR,
+    SYNTHETIC_DATA_FILES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Immutable containers
+# ============================================================
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("Synthetic data snapshots are read-only")
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation (still a dict for json / isinstance)."""
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):   # copy / pickle without going through __setitem__
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """list that refuses mutation (still a list for json / isinstance)."""
+
+    __setitem__ = __delitem__ = _readonly
+    append = extend = insert = pop = remove = reverse = sort = clear = _readonly
+    __iadd__ = __imul__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert parsed JSON into FrozenDict / FrozenList."""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+# ============================================================
+# Snapshot
+# ============================================================
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    version: str                  # content hash of all files (short)
+    data: Dict[str, Any]          # file name -> frozen JSON content
+    digests: Dict[str, str]       # file name -> SHA-256 of its raw bytes
+    loaded_at: float
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "files": {name: digest[:12] for name, digest in self.digests.items()},
+            "loaded_at": self.loaded_at,
+        }
+
+
+# (mtime_ns, size) per file; None when the file is missing
+_FileStamp = Optional[Tuple[int, int]]
+
+
+class DataStore:
+    """Loads the synthetic data files and swaps in new snapshots on change."""
+
+    def __init__(
+        self,
+        directory: Path = SYNTHETIC_DATA_DIR,
+        files: Sequence[str] = SYNTHETIC_DATA_FILES,
+        check_interval: float = DATA_STORE_CHECK_INTERVAL_SECONDS,
+    ):
+        self.directory = Path(directory)
+        self.files = list(files)
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._snapshot: Optional[DataSnapshot] = None
+        self._stamps: Dict[str, _FileStamp] = {}
+        self._last_check = 0.0
+        self.reloads = 0
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+
+    def snapshot(self) -> DataSnapshot:
+        """The current snapshot (reloaded first if files changed)."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._last_check < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._last_check >= self.check_interval:
+                self._refresh()
+            return self._snapshot
+
+    @property
+    def version(self) -> str:
+        return self.snapshot().version
+
+    def reload(self) -> DataSnapshot:
+        """Force a check for changed files now."""
+        with self._lock:
+            self._stamps = {}
+            self._refresh()
+            return self._snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.snapshot().info(), "reloads": self.reloads}
+
+    # --------------------------------------------------------
+    # Internals (caller holds self._lock)
+    # --------------------------------------------------------
+
+    def _stamp(self, name: str) -> _FileStamp:
+        try:
+            st = (self.directory / name).stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _refresh(self) -> None:
+        self._last_check = time.monotonic()
+
+        stamps = {name: self._stamp(name) for name in self.files}
+        if self._snapshot is not None and stamps == self._stamps:
+            return
+
+        try:
+            snapshot = self._load(stamps)
+        except Exception as e:
+            if self._snapshot is None:
+                raise
+            # Keep serving the previous snapshot until the files change again
+            self._stamps = stamps
+            logger.warning("Synthetic data reload failed, keeping version %s: %s", self._snapshot.version, e)
+            return
+
+        self._stamps = stamps
+        if self._snapshot is None or snapshot.version != self._snapshot.version:
+            if self._snapshot is not None:
+                self.reloads += 1
+                logger.info("Synthetic data reloaded: %s → %s", self._snapshot.version, snapshot.version)
+            self._snapshot = snapshot   # atomic swap: readers see old or new, never a mix
+
+    def _load(self, stamps: Dict[str, _FileStamp]) -> DataSnapshot:
+        data: Dict[str, Any] = {}
+        digests: Dict[str, str] = {}
+
+        for name in self.files:
+            if stamps[name] is None:
+                logger.warning("Synthetic data file %s not found in %s", name, self.directory)
+                continue
+            raw = (self.directory / name).read_bytes()
+            data[name] = freeze(json.loads(raw.decode("utf-8")))
+            digests[name] = hashlib.sha256(raw).hexdigest()
+
+        combined = hashlib.sha256(
+            json.dumps(sorted(digests.items())).encode("utf-8")
+        ).hexdigest()
+
+        return DataSnapshot(
+            version=combined[:16],
+            data=FrozenDict(data),
+            digests=digests,
+            loaded_at=time.time(),
+        )
+
+
+DATA_STORE = DataStore()
+
+
+def current_data() -> Dict[str, Any]:
+    """Synthetic data of the current snapshot ({file name: content})."""
+    return DATA_STORE.snapshot().data
@@ -0,0 +1,370 @@
+"""
+Offline evaluation harness: batch compare + judge → leaderboard.
+
+Runs a question set across several models and ranks them:
+
+1. every question is answered by every model concurrently (measured calls:
+   latency, time-to-first-token, token counts — see llm_client)
+2. every pair of answers is judged by the judge model; the verdict is parsed
+   into a structured winner (A/B order is shuffled per pair to spread the
+   judge's position bias)
+3. results are aggregated into a leaderboard: win rate, wins/losses/ties,
+   latency and TTFT percentiles, tokens and cost (config.MODEL_PRICING)
+
+Every answer and verdict is appended to a JSONL run log as soon as it is
+known. Re-running with the same log skips everything that already succeeded,
+so an interrupted evaluation resumes where it stopped. Verdicts are kept per
+judge model: resuming with another judge re-judges every pair.
+
+Questions file (JSONL), one per line:
+    {"id": "q1", "question": "What are the top cutover risks?"}
+    "Plain strings work too"
+
+CLI (run from ai_transition_llm_app/):
+    python -m backend.evaluation questions.jsonl \
+        --models "GPT-4o" "GPT-4o Mini" "DeepSeek V3" \
+        [--judge "Phi 4 Reasoning"] [--log run.jsonl] [--out report.json] [--parallel 4]
+
+Used by:
+    backend/mcp_server/tools.py → "evaluate" tool
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.config import (
+    DEFAULT_JUDGE_MODEL,
+    EVAL_MAX_PARALLEL,
+    EVAL_OUTPUT_DIR,
+)
+from backend.llm_client import LLMError, acall_llm, acall_llm_measured, aclose_clients
+from backend.logging_setup import configure_logging
+from backend.mcp_server.tools import (
+    JUDGE_SYSTEM_PROMPT,
+    build_judge_prompt,
+    compare_models,
+    parse_verdict,
+    resolve_model,
+)
+from backend.prompt_profiler import token_cost
+
+
+# ============================================================
+# Questions
+# ============================================================
+
+def _question_id(question: str) -> str:
+    return hashlib.sha256(question.encode("utf-8")).hexdigest()[:12]
+
+
+def normalize_questions(items: Sequence[Any]) -> List[Dict[str, str]]:
+    """Accept strings or {"id"?, "question"|"input"} dicts; ids default to a content hash."""
+    questions = []
+    for item in items:
+        if isinstance(item, str):
+            item = {"question": item}
+        text = (item.get("question") or item.get("input") or "").strip()
+        if not text:
+            continue
+        questions.append({"id": str(item.get("id") or _question_id(text)), "question": text})
+    return questions
+
+
+def load_questions(path: str) -> List[Dict[str, str]]:
+    """Read a JSONL question set."""
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                items.append(json.loads(line))
+    return normalize_questions(items)
+
+
+# ============================================================
+# Run log (append-only JSONL, makes runs resumable)
+# ============================================================
+
+class RunLog:
+    """Answers and verdicts of one evaluation, optionally persisted to JSONL."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.answers: Dict[Tuple[str, str], Dict[str, Any]] = {}           # (qid, model)
+        # (qid, model_a, model_b, judge_model)
+        self.verdicts: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if path is not None and path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue   # torn last line from an interrupted run
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        # Later records replace earlier ones (a retried failure supersedes it)
+        if record.get("type") == "answer":
+            self.answers[(record["qid"], record["model"])] = record
+        elif record.get("type") == "verdict":
+            key = (record["qid"], record["model_a"], record["model_b"], record.get("judge_model", ""))
+            self.verdicts[key] = record
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._apply(record)
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def answer_ok(self, qid: str, model: str) -> Optional[Dict[str, Any]]:
+        record = self.answers.get((qid, model))
+        return record if record and record.get("answer") is not None else None
+
+    def verdict_ok(self, qid: str, model_a: str, model_b: str, judge_model: str) -> bool:
+        record = self.verdicts.get((qid, model_a, model_b, judge_model))
+        return bool(record) and not record.get("error")
+
+
+# ============================================================
+# Evaluation
+# ============================================================
+
+def _judge_order_swapped(qid: str, model_a: str, model_b: str) -> bool:
+    """Deterministic per-pair coin flip: which answer the judge sees first."""
+    digest = hashlib.sha256(f"{qid}|{model_a}|{model_b}".encode("utf-8")).digest()
+    return digest[0] % 2 == 1
+
+
+async def run_evaluation(
+    questions: Sequence[Dict[str, str]],
+    models: Sequence[str],
+    judge_model: str = DEFAULT_JUDGE_MODEL,
+    log_path: Optional[Path] = None,
+    max_parallel: int = EVAL_MAX_PARALLEL,
+) -> Dict[str, Any]:
+    """
+    Evaluate `models` on `questions` and return the leaderboard report.
+
+    `models` and `judge_model` may be ids or display names from
+    ALLOWED_MODELS (anything else raises ValueError before any call). With
+    `log_path`, completed answers/verdicts are persisted and reused.
+    """
+    models = compare_models({"extra": {"models": list(models)}})
+    judge_model = resolve_model(judge_model)
+    log = RunLog(log_path)
+    limit = asyncio.Semaphore(max(1, max_parallel))
+    started = time.perf_counter()
+    calls = {"answers": 0, "verdicts": 0}
+
+    async def answer(q: Dict[str, str], model: str) -> None:
+        try:
+            result = await acall_llm_measured(model, prompt=q["question"])
+        except LLMError as e:
+            result = {"model": model, "answer": None, "error": str(e), "status": e.status_code}
+        calls["answers"] += 1
+        log.add({"type": "answer", "qid": q["id"], **result})
+
+    async def judge(q: Dict[str, str], model_a: str, model_b: str) -> None:
+        ans_a = log.answer_ok(q["id"], model_a)["answer"]
+        ans_b = log.answer_ok(q["id"], model_b)["answer"]
+        swapped = _judge_order_swapped(q["id"], model_a, model_b)
+        first, second = (ans_b, ans_a) if swapped else (ans_a, ans_b)
+
+        record: Dict[str, Any] = {"type": "verdict", "qid": q["id"], "model_a": model_a,
+                                  "model_b": model_b, "judge_model": judge_model, "swapped": swapped}
+        try:
+            raw = await acall_llm(
+                judge_model,
+                prompt=build_judge_prompt(q["question"], first, second),
+                temperature=0.0,
+                system_prompt=JUDGE_SYSTEM_PROMPT,
+            )
+        except LLMError as e:
+            record["error"] = str(e)
+        else:
+            letter = parse_verdict(raw)
+            if letter in ("A", "B"):
+                shown_first = letter == "A"
+                record["winner"] = model_a if shown_first != swapped else model_b
+            else:
+                record["winner"] = letter   # "tie" or None (unparseable verdict)
+            record["judge_raw"] = raw
+        calls["verdicts"] += 1
+        log.add(record)
+
+    async def evaluate_question(q: Dict[str, str]) -> None:
+        async with limit:
+            await asyncio.gather(*(
+                answer(q, m) for m in models if not log.answer_ok(q["id"], m)
+            ))
+            await asyncio.gather(*(
+                judge(q, a, b)
+                for a, b in itertools.combinations(models, 2)
+                if log.answer_ok(q["id"], a) and log.answer_ok(q["id"], b)
+                and not log.verdict_ok(q["id"], a, b, judge_model)
+            ))
+
+    await asyncio.gather(*(evaluate_question(q) for q in questions))
+
+    report = build_report(questions, models, log, judge_model)
+    report["run"] = {
+        "questions": len(questions),
+        "models": list(models),
+        "judge_model": judge_model,
+        "new_answer_calls": calls["answers"],
+        "new_judge_calls": calls["verdicts"],
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "log_path": str(log_path) if log_path else None,
+    }
+    return report
+
+
+# ============================================================
+# Report
+# ============================================================
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (None for no values)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return round(ordered[rank - 1], 3)
+
+
+def build_report(
+    questions: Sequence[Dict[str, str]],
+    models: Sequence[str],
+    log: RunLog,
+    judge_model: str,
+) -> Dict[str, Any]:
+    """Aggregate the run log (verdicts of `judge_model`) into a leaderboard + head-to-head matrix."""
+    qids = [q["id"] for q in questions]
+    rows: Dict[str, Dict[str, Any]] = {}
+    head_to_head = {a: {b: {"wins": 0, "losses": 0, "ties": 0} for b in models if b != a} for a in models}
+
+    for model in models:
+        records = [log.answers.get((qid, model)) for qid in qids]
+        ok = [r for r in records if r and r.get("answer") is not None]
+        costs = [token_cost(model, r["prompt_tokens"], r["completion_tokens"]) for r in ok]
+        priced = [c for c in costs if c is not None]
+        rows[model] = {
+            "model": model,
+            "answered": len(ok),
+            "errors": sum(1 for r in records if r and r.get("answer") is None),
+            "wins": 0,
+            "losses": 0,
+            "ties": 0,
+            "undecided": 0,
+            "latency_p50_s": percentile([r["latency_s"] for r in ok], 50),
+            "latency_p95_s": percentile([r["latency_s"] for r in ok], 95),
+            "ttft_p50_s": percentile([r["ttft_s"] for r in ok if r.get("ttft_s") is not None], 50),
+            "avg_completion_tokens": round(sum(r["completion_tokens"] for r in ok) / len(ok), 1) if ok else None,
+            "cost_usd": round(sum(priced), 6) if priced else None,
+        }
+
+    for qid in qids:
+        for a, b in itertools.combinations(models, 2):
+            record = log.verdicts.get((qid, a, b, judge_model))
+            if not record or record.get("error"):
+                continue
+            winner = record.get("winner")
+            if winner in (a, b):
+                loser = b if winner == a else a
+                rows[winner]["wins"] += 1
+                rows[loser]["losses"] += 1
+                head_to_head[winner][loser]["wins"] += 1
+                head_to_head[loser][winner]["losses"] += 1
+            elif winner == "tie":
+                for x, y in ((a, b), (b, a)):
+                    rows[x]["ties"] += 1
+                    head_to_head[x][y]["ties"] += 1
+            else:
+                rows[a]["undecided"] += 1
+                rows[b]["undecided"] += 1
+
+    for row in rows.values():
+        games = row["wins"] + row["losses"] + row["ties"]
+        row["win_rate"] = round((row["wins"] + 0.5 * row["ties"]) / games, 4) if games else None
+
+    leaderboard = sorted(
+        rows.values(),
+        key=lambda r: (-(r["win_rate"] or 0), r["latency_p50_s"] if r["latency_p50_s"] is not None else math.inf),
+    )
+    return {"leaderboard": leaderboard, "head_to_head": head_to_head}
+
+
+def render_markdown(report: Dict[str, Any]) -> str:
+    """Leaderboard as a Markdown table."""
+    def fmt(value: Any) -> str:
+        return "–" if value is None else str(value)
+
+    lines = [
+        "| # | Model | Win rate | W / L / T | p50 latency (s) | p95 latency (s) | p50 TTFT (s) | Avg out tokens | Cost (USD) | Errors |",
+        "|---|-------|----------|-----------|-----------------|-----------------|--------------|----------------|------------|--------|",
+    ]
+    for i, r in enumerate(report["leaderboard"], start=1):
+        lines.append(
+            f"| {i} | {r['model']} | {fmt(r['win_rate'])} | {r['wins']} / {r['losses']} / {r['ties']} "
+            f"| {fmt(r['latency_p50_s'])} | {fmt(r['latency_p95_s'])} | {fmt(r['ttft_p50_s'])} "
+            f"| {fmt(r['avg_completion_tokens'])} | {fmt(r['cost_usd'])} | {r['errors']} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Evaluate models on a JSONL question set.")
+    parser.add_argument("questions", help="JSONL file of questions")
+    parser.add_argument("--models", nargs="+", required=True, help="model ids or ALLOWED_MODELS names")
+    parser.add_argument("--judge", default=DEFAULT_JUDGE_MODEL, help="judge model id or name")
+    parser.add_argument("--log", help="resumable run log (default: <EVAL_OUTPUT_DIR>/<questions>.log.jsonl)")
+    parser.add_argument("--out", help="report JSON (default: <EVAL_OUTPUT_DIR>/<questions>.report.json)")
+    parser.add_argument("--parallel", type=int, default=EVAL_MAX_PARALLEL, help="questions in flight")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    stem = Path(args.questions).stem
+    log_path = Path(args.log or Path(EVAL_OUTPUT_DIR) / f"{stem}.log.jsonl")
+    out_path = Path(args.out or Path(EVAL_OUTPUT_DIR) / f"{stem}.report.json")
+
+    async def run() -> Dict[str, Any]:
+        try:
+            return await run_evaluation(
+                load_questions(args.questions),
+                args.models,
+                judge_model=args.judge,
+                log_path=log_path,
+                max_parallel=args.parallel,
+            )
+        finally:
+            await aclose_clients()
+
+    report = asyncio.run(run())
+
+    markdown = render_markdown(report)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    out_path.with_suffix(".md").write_text(markdown, encoding="utf-8")
+
+    print(markdown)
+    print(f"Report: {out_path}  (log: {log_path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Background job queue for long-running workflow executions.
+
+Instead of holding an HTTP connection open for the whole 4-agent pipeline,
+clients can submit a workflow job and get a job id back immediately:
+
+- a bounded worker pool (config.WORKFLOW_JOB_WORKERS) runs run_full_workflow()
+- each finished agent is recorded as progress while the job runs
+- clients poll the job (JobQueue.get → Job.to_dict) or subscribe to its
+  events (Job.follow), which replays past events and then streams new ones
+- finished jobs are kept for config.WORKFLOW_JOB_RETENTION_SECONDS
+- a failed job can be retried as a new job; agents that had finished are
+  served from the workflow node cache, so the run resumes where it failed
+
+Jobs live in process memory: they do not survive a restart and are only
+visible to the worker process that accepted them.
+
+Used by:
+    backend/mcp_server/router.py → /mcp/jobs endpoints
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from backend.config import (
+    WORKFLOW_JOB_MAX_QUEUED,
+    WORKFLOW_JOB_RETENTION_SECONDS,
+    WORKFLOW_JOB_WORKERS,
+)
+from backend.langgraph_pipeline import NODE_RESULT_KEYS, check_workflow_graph, run_full_workflow
+from backend.llm_client import LLMError
+
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFullError(RuntimeError):
+    """Too many jobs are already waiting for a worker."""
+
+
+# ============================================================
+# Job
+# ============================================================
+
+@dataclass
+class Job:
+    job_id: str
+    question: str
+    model: str
+    graph: str
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: Dict[str, str] = field(default_factory=dict)   # result key -> agent output
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None                   # {"detail", "status"}
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = field(default_factory=set, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "model": self.model,
+                "graph": self.graph,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "progress": dict(self.progress),
+                "completed_agents": len(self.progress),
+                "total_agents": len(NODE_RESULT_KEYS),
+                "result": self.result,
+                "error": self.error,
+            }
+
+    # --------------------------------------------------------
+    # Events (written by the worker thread, read by the event loop)
+    # --------------------------------------------------------
+
+    def publish(self, event: Dict[str, Any], **changes: Any) -> None:
+        """Apply state changes and append an event atomically, then wake subscribers."""
+        with self._lock:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self.events.append(event)
+            waiters = list(self._waiters)
+
+        for loop, wakeup in waiters:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass   # subscriber's loop already closed
+
+    async def follow(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every event of the job (past ones first) until it finishes."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.add(waiter)
+
+        try:
+            sent = 0
+            while True:
+                waiter[1].clear()
+                with self._lock:
+                    new = self.events[sent:]
+                    done = self.finished
+                for event in new:
+                    yield event
+                sent += len(new)
+                if done:
+                    return
+                await waiter[1].wait()
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+# ============================================================
+# Queue
+# ============================================================
+
+class JobQueue:
+    """Bounded worker pool + in-memory job store with TTL retention."""
+
+    def __init__(
+        self,
+        workers: int = WORKFLOW_JOB_WORKERS,
+        max_queued: int = WORKFLOW_JOB_MAX_QUEUED,
+        retention_seconds: float = WORKFLOW_JOB_RETENTION_SECONDS,
+    ):
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="workflow-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, question: str, model: str, graph: str) -> Job:
+        """
+        Queue a workflow run and return its job immediately.
+
+        Raises ValueError for an unknown graph and JobQueueFullError when
+        max_queued jobs are already waiting.
+        """
+        # Fail fast on unknown graph names; the graph itself is compiled by the worker
+        check_workflow_graph(graph)
+
+        with self._lock:
+            self._sweep()
+            queued = sum(1 for job in self._jobs.values() if job.status == QUEUED)
+            if queued >= self.max_queued:
+                raise JobQueueFullError(f"{queued} workflow jobs already queued; retry later.")
+
+            job = Job(job_id=uuid.uuid4().hex, question=question, model=model, graph=graph)
+            job.events.append({"event": "status", "status": QUEUED})
+            self._jobs[job.job_id] = job
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._sweep()
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._sweep()
+            counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+
+    def _sweep(self) -> None:
+        """Drop finished jobs older than the retention period (caller holds lock)."""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _run(self, job: Job) -> None:
+        job.publish({"event": "status", "status": RUNNING}, status=RUNNING, started_at=time.time())
+
+        def on_node_end(node: str, update: Dict[str, Any]) -> None:
+            key = NODE_RESULT_KEYS.get(node)
+            if key is None:
+                return
+            output = update.get(f"{key}_output", "")
+            job.publish(
+                {"event": "node_end", "node": node, "key": key, "output": output},
+                progress={**job.progress, key: output},
+            )
+
+        try:
+            result = run_full_workflow(job.question, model=job.model, graph_name=job.graph,
+                                       on_node_end=on_node_end)
+        except Exception as e:
+            status = e.status_code if isinstance(e, LLMError) else 500
+            error = {"detail": f"Workflow job failed: {e}", "status": status}
+            job.publish({"event": "error", **error},
+                        status=FAILED, error=error, finished_at=time.time())
+            return
+
+        job.publish({"event": "done", "result": result},
+                    status=SUCCEEDED, result=result, finished_at=time.time())
+
+
+WORKFLOW_JOBS = JobQueue()
@@ -8,8 +8,44 @@ This file builds a 4-agent orchestrated workflow:
     3. Communication Agent  (stakeholder gaps, communication inefficiencies)
     4. Supervisor Agent     (final combined summary)
 
+Risk and Communication only depend on the Project Agent output, so they
+run in parallel (fan-out) and the Supervisor joins on both (fan-in):
+
+                 ┌──> Risk ───┐
+    Project ─────┤            ├──> Supervisor → END
+                 └──> Comms ──┘
+
 This pipeline is called by:
-    backend/mcp_server/tools.py   → workflow_tool()
+    backend/mcp_server/tools.py   → workflow_tool() / aworkflow_tool()
+
+Every node has a sync and an async implementation, so the same graph can be
+driven with invoke() (run_full_workflow) or ainvoke() (arun_full_workflow).
+
+Graphs are compiled ONCE (lazily, on first use) and shared across requests.
+LangGraph / LangChain are imported only when the first graph is built, so
+importing this module (e.g. for the job queue or /health) stays cheap.
+Alternate graph variants can be registered by name with
+register_workflow_graph() and selected per request.
+
+astream_workflow_events() streams node start/finish events and per-agent
+token chunks while the graph runs (used by the SSE endpoint).
+
+Synthetic data comes from backend/data_store.py: each run pins the current
+data snapshot in its state, so all four agents see the same data version
+even if the files are reloaded mid-run.
+
+Each node's output is memoized (WORKFLOW_NODE_CACHE) under a hash of exactly
+its inputs: question, model, upstream agent outputs and the digests of the
+data files that agent reads, plus a fingerprint of how its prompt is built
+(the *_PROMPT_VERSION of the agent template, the context selection /
+rendering versions, token budget, render format), so a deploy that bumps a
+prompt version never serves outputs of the old prompt. A
+repeated question reuses every node; after an edit to comms_logs.json only
+Comms and Supervisor re-run; and a run that failed at the Supervisor resumes
+from the cached upstream outputs.
+
+Every node run is recorded as a "workflow.node" trace span with its latency
+(backend/observability.py), labelled with whether the cache answered it.
 
 The workflow returns a structured dictionary that the front-end
 can display in separate cards.
@@ -17,29 +53,81 @@ can display in separate cards.
 
 from __future__ import annotations
 
-from langgraph.graph import StateGraph, END
-from typing import Dict, Any
-
-from backend.config import DEFAULT_AGENT_MODEL, load_all_synthetic_data
-from backend.llm_client import call_llm
-from backend.agents.project_agent import run_project_agent
-from backend.agents.risk_agent import run_risk_agent
-from backend.agents.comms_agent import run_comms_agent
-from backend.agents.supervisor_agent import run_supervisor_agent
+import threading
+
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, Any, Optional, TypedDict
+
+from backend.config import (
+    AGENT_CONTEXT_TOKEN_BUDGETS,
+    CONTEXT_RENDER_FORMAT,
+    CONTEXT_SELECTION_ENABLED,
+    DEFAULT_AGENT_MODEL,
+    WORKFLOW_NODE_CACHE_DB_PATH,
+    WORKFLOW_NODE_CACHE_ENABLED,
+    WORKFLOW_NODE_CACHE_MAX_ENTRIES,
+    WORKFLOW_NODE_CACHE_TTL_SECONDS,
+)
+from backend.agents.project_agent import (
+    PROJECT_AGENT_DATA_FILES,
+    PROJECT_AGENT_SYSTEM_PROMPT,
+    PROJECT_AGENT_PROMPT_VERSION,
+    PROJECT_AGENT_TEMPERATURE,
+    run_project_agent,
+    arun_project_agent,
+)
+from backend.agents.risk_agent import (
+    RISK_AGENT_DATA_FILES,
+    RISK_AGENT_SYSTEM_PROMPT,
+    RISK_AGENT_PROMPT_VERSION,
+    RISK_AGENT_TEMPERATURE,
+    run_risk_agent,
+    arun_risk_agent,
+)
+from backend.agents.comms_agent import (
+    COMMS_AGENT_DATA_FILES,
+    COMMS_AGENT_SYSTEM_PROMPT,
+    COMMS_AGENT_PROMPT_VERSION,
+    COMMS_AGENT_TEMPERATURE,
+    run_comms_agent,
+    arun_comms_agent,
+)
+from backend.agents.supervisor_agent import (
+    SUPERVISOR_AGENT_DATA_FILES,
+    SUPERVISOR_AGENT_SYSTEM_PROMPT,
+    SUPERVISOR_AGENT_PROMPT_VERSION,
+    SUPERVISOR_AGENT_TEMPERATURE,
+    run_supervisor_agent,
+    arun_supervisor_agent,
+)
+from backend.context_render import CONTEXT_RENDER_VERSION
+from backend.context_selection import CONTEXT_SELECTION_VERSION
+from backend.data_store import DATA_STORE, DataSnapshot
+from backend.llm_cache import ResponseCache, make_cache_key
+from backend.observability import NODE_SECONDS, span
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableLambda
+    from langgraph.graph import StateGraph
 
 
 # ============================================================
 # SHARED STATE FOR THE GRAPH
 # ============================================================
 
-class WorkflowState(dict):
+class WorkflowState(TypedDict, total=False):
     """
     LangGraph uses simple dict-like states.
-    Each agent reads from and writes to the state.
+    Each agent reads from the state and returns ONLY the keys it writes.
+
+    Returning partial updates (instead of the whole mutated state) is what
+    makes the parallel Risk/Comms branches safe: each branch writes its own
+    key, so LangGraph can merge both updates in the same step without
+    conflicting writes to shared keys.
     """
 
     project_input: str     # main question from user
     model: str             # LLM model ID chosen by user
+    data_snapshot: DataSnapshot   # synthetic data version pinned for this run
     project_agent_output: str
     risk_agent_output: str
     comms_agent_output: str
@@ -47,12 +135,15 @@ class WorkflowState(dict):
 
 
 # ============================================================
-# CREATE SYNTHETIC DATA CONTEXT
+# SYNTHETIC DATA CONTEXT
 # ============================================================
 
-SYN_DATA = load_all_synthetic_data()
+def _snapshot(state: WorkflowState) -> DataSnapshot:
+    """Data snapshot pinned for this run (current one if the caller set none)."""
+    return state.get("data_snapshot") or DATA_STORE.snapshot()
+
 
-# Contents inside SYN_DATA:
+# Contents of a snapshot's data:
 #   {
 #       "project_data.json": {...},
 #       "risk_logs.json": {...},
@@ -72,10 +163,9 @@ def project_node(state: WorkflowState) -> WorkflowState:
     output = run_project_agent(
         question=state["project_input"],
         model=state["model"],
-        synthetic_data=SYN_DATA
+        synthetic_data=_snapshot(state).data
     )
-    state["project_agent_output"] = output
-    return state
+    return {"project_agent_output": output}
 
 
 def risk_node(state: WorkflowState) -> WorkflowState:
@@ -84,10 +174,9 @@ def risk_node(state: WorkflowState) -> WorkflowState:
         question=state["project_input"],
         project_agent_summary=state["project_agent_output"],
         model=state["model"],
-        synthetic_data=SYN_DATA
+        synthetic_data=_snapshot(state).data
     )
-    state["risk_agent_output"] = output
-    return state
+    return {"risk_agent_output": output}
 
 
 def comms_node(state: WorkflowState) -> WorkflowState:
@@ -96,10 +185,9 @@ def comms_node(state: WorkflowState) -> WorkflowState:
         question=state["project_input"],
         project_agent_summary=state["project_agent_output"],
         model=state["model"],
-        synthetic_data=SYN_DATA
+        synthetic_data=_snapshot(state).data
     )
-    state["comms_agent_output"] = output
-    return state
+    return {"comms_agent_output": output}
 
 
 def supervisor_node(state: WorkflowState) -> WorkflowState:
@@ -109,31 +197,229 @@ def supervisor_node(state: WorkflowState) -> WorkflowState:
         risk_summary=state["risk_agent_output"],
         comms_summary=state["comms_agent_output"],
         model=state["model"],
-        synthetic_data=SYN_DATA
+        synthetic_data=_snapshot(state).data,
+        question=state["project_input"],
     )
-    state["supervisor_output"] = output
-    return state
+    return {"supervisor_output": output}
+
+
+async def aproject_node(state: WorkflowState) -> WorkflowState:
+    """Runs Project Agent (async)."""
+    output = await arun_project_agent(
+        question=state["project_input"],
+        model=state["model"],
+        synthetic_data=_snapshot(state).data
+    )
+    return {"project_agent_output": output}
+
+
+async def arisk_node(state: WorkflowState) -> WorkflowState:
+    """Runs Risk Agent (async)."""
+    output = await arun_risk_agent(
+        question=state["project_input"],
+        project_agent_summary=state["project_agent_output"],
+        model=state["model"],
+        synthetic_data=_snapshot(state).data
+    )
+    return {"risk_agent_output": output}
+
+
+async def acomms_node(state: WorkflowState) -> WorkflowState:
+    """Runs Communication Agent (async)."""
+    output = await arun_comms_agent(
+        question=state["project_input"],
+        project_agent_summary=state["project_agent_output"],
+        model=state["model"],
+        synthetic_data=_snapshot(state).data
+    )
+    return {"comms_agent_output": output}
+
+
+async def asupervisor_node(state: WorkflowState) -> WorkflowState:
+    """Runs Supervisor Agent (async)."""
+    output = await arun_supervisor_agent(
+        project_summary=state["project_agent_output"],
+        risk_summary=state["risk_agent_output"],
+        comms_summary=state["comms_agent_output"],
+        model=state["model"],
+        synthetic_data=_snapshot(state).data,
+        question=state["project_input"],
+    )
+    return {"supervisor_output": output}
 
 
 # ============================================================
-# BUILD THE GRAPH
+# NODE OUTPUT CACHE (memoization + checkpoints)
 # ============================================================
 
-def build_workflow_graph():
+# node -> (state key it writes, upstream state keys it reads,
+#          data files it reads, temperature, system prompt)
+NODE_CACHE_SPECS: Dict[str, tuple] = {
+    "project": ("project_agent_output", [],
+                PROJECT_AGENT_DATA_FILES, PROJECT_AGENT_TEMPERATURE, PROJECT_AGENT_SYSTEM_PROMPT),
+    "risk": ("risk_agent_output", ["project_agent_output"],
+             RISK_AGENT_DATA_FILES, RISK_AGENT_TEMPERATURE, RISK_AGENT_SYSTEM_PROMPT),
+    "comms": ("comms_agent_output", ["project_agent_output"],
+              COMMS_AGENT_DATA_FILES, COMMS_AGENT_TEMPERATURE, COMMS_AGENT_SYSTEM_PROMPT),
+    "supervisor": ("supervisor_output",
+                   ["project_agent_output", "risk_agent_output", "comms_agent_output"],
+                   SUPERVISOR_AGENT_DATA_FILES, SUPERVISOR_AGENT_TEMPERATURE,
+                   SUPERVISOR_AGENT_SYSTEM_PROMPT),
+}
+
+# node -> version of its prompt template (part of the prompt fingerprint)
+NODE_PROMPT_VERSIONS: Dict[str, int] = {
+    "project": PROJECT_AGENT_PROMPT_VERSION,
+    "risk": RISK_AGENT_PROMPT_VERSION,
+    "comms": COMMS_AGENT_PROMPT_VERSION,
+    "supervisor": SUPERVISOR_AGENT_PROMPT_VERSION,
+}
+
+WORKFLOW_NODE_CACHE: Optional[ResponseCache] = (
+    ResponseCache(
+        max_entries=WORKFLOW_NODE_CACHE_MAX_ENTRIES,
+        ttl_seconds=WORKFLOW_NODE_CACHE_TTL_SECONDS,
+        db_path=WORKFLOW_NODE_CACHE_DB_PATH,
+        table="workflow_nodes",
+    )
+    if WORKFLOW_NODE_CACHE_ENABLED
+    else None
+)
+
+
+def prompt_fingerprint(node: str) -> str:
     """
-    LangGraph pipeline:
-        Project → Risk → Comms → Supervisor → END
+    Digest of everything besides the state that shapes `node`'s prompt: the
+    template version, the context selection / rendering versions and the
+    context settings.
     """
+    return make_cache_key(
+        NODE_PROMPT_VERSIONS[node],
+        CONTEXT_SELECTION_VERSION,
+        CONTEXT_RENDER_VERSION,
+        CONTEXT_SELECTION_ENABLED,
+        CONTEXT_RENDER_FORMAT,
+        AGENT_CONTEXT_TOKEN_BUDGETS.get(node),
+    )
+
+
+def node_cache_key(node: str, state: WorkflowState) -> str:
+    """Hash of exactly the inputs that determine `node`'s output."""
+    _, upstream, files, temperature, system_prompt = NODE_CACHE_SPECS[node]
+    return make_cache_key(
+        "workflow-node",
+        node,
+        prompt_fingerprint(node),
+        state["project_input"],
+        state["model"],
+        [state.get(key, "") for key in upstream],
+        {name: _snapshot(state).digests.get(name) for name in files},
+        temperature,
+        system_prompt,
+    )
+
+
+def _cached_node(node: str, func, afunc) -> RunnableLambda:
+    """
+    Wrap a node's sync/async implementations with the node output cache
+    and a "workflow.node" trace span.
+    """
+    from langchain_core.runnables import RunnableLambda
+
+    output_key = NODE_CACHE_SPECS[node][0]
+
+    def run(state: WorkflowState) -> WorkflowState:
+        with span("workflow.node", NODE_SECONDS, node=node, cache="off") as s:
+            if WORKFLOW_NODE_CACHE is None:
+                return func(state)
+            key = node_cache_key(node, state)
+            cached = WORKFLOW_NODE_CACHE.get(key)
+            if cached is not None:
+                s.set(cache="hit")
+                return {output_key: cached}
+            s.set(cache="miss")
+            update = func(state)
+            WORKFLOW_NODE_CACHE.set(key, update[output_key])
+            return update
+
+    async def arun(state: WorkflowState) -> WorkflowState:
+        with span("workflow.node", NODE_SECONDS, node=node, cache="off") as s:
+            if WORKFLOW_NODE_CACHE is None:
+                return await afunc(state)
+            key = node_cache_key(node, state)
+            cached = await WORKFLOW_NODE_CACHE.aget(key)
+            if cached is not None:
+                s.set(cache="hit")
+                return {output_key: cached}
+            s.set(cache="miss")
+            update = await afunc(state)
+            await WORKFLOW_NODE_CACHE.aset(key, update[output_key])
+            return update
+
+    return RunnableLambda(run, afunc=arun)
+
+
+def workflow_node_cache_stats() -> Dict[str, Any]:
+    """Hit/miss statistics of the workflow node output cache."""
+    if WORKFLOW_NODE_CACHE is None:
+        return {"enabled": False}
+    return {"enabled": True, **WORKFLOW_NODE_CACHE.stats()}
+
+
+# ============================================================
+# BUILD THE GRAPH
+# ============================================================
+
+def _new_agent_graph() -> StateGraph:
+    """Create a StateGraph with the four agent nodes registered (no edges)."""
+    from langgraph.graph import StateGraph
 
     graph = StateGraph(WorkflowState)
 
-    # Register nodes
-    graph.add_node("project", project_node)
-    graph.add_node("risk", risk_node)
-    graph.add_node("comms", comms_node)
-    graph.add_node("supervisor", supervisor_node)
+    # Register nodes (sync implementation for invoke, async for ainvoke),
+    # each behind the node output cache
+    graph.add_node("project", _cached_node("project", project_node, aproject_node))
+    graph.add_node("risk", _cached_node("risk", risk_node, arisk_node))
+    graph.add_node("comms", _cached_node("comms", comms_node, acomms_node))
+    graph.add_node("supervisor", _cached_node("supervisor", supervisor_node, asupervisor_node))
+
+    return graph
+
+
+def build_workflow_graph():
+    """
+    LangGraph pipeline (fan-out / fan-in):
+        Project → (Risk ∥ Comms) → Supervisor → END
+
+    Prefer get_workflow_graph(), which returns a cached compiled graph.
+    """
+    from langgraph.graph import END
+
+    graph = _new_agent_graph()
 
     # Edges
+    graph.set_entry_point("project")
+
+    # Fan-out: Risk and Comms both start as soon as Project finishes
+    graph.add_edge("project", "risk")
+    graph.add_edge("project", "comms")
+
+    # Fan-in: Supervisor waits for BOTH branches before running
+    graph.add_edge(["risk", "comms"], "supervisor")
+    graph.add_edge("supervisor", END)
+
+    return graph.compile()
+
+
+def build_sequential_workflow_graph():
+    """
+    Original strictly sequential pipeline, kept as a variant for comparison:
+        Project → Risk → Comms → Supervisor → END
+    """
+    from langgraph.graph import END
+
+    graph = _new_agent_graph()
+
     graph.set_entry_point("project")
     graph.add_edge("project", "risk")
     graph.add_edge("risk", "comms")
@@ -143,16 +429,85 @@ def build_workflow_graph():
     return graph.compile()
 
 
+# ============================================================
+# COMPILED GRAPH REGISTRY
+# ============================================================
+
+DEFAULT_WORKFLOW_GRAPH = "default"
+
+# name -> builder returning a compiled graph
+WORKFLOW_GRAPH_BUILDERS: Dict[str, Callable[[], Any]] = {
+    DEFAULT_WORKFLOW_GRAPH: build_workflow_graph,
+    "sequential": build_sequential_workflow_graph,
+}
+
+_COMPILED_GRAPHS: Dict[str, Any] = {}
+_COMPILED_GRAPHS_LOCK = threading.Lock()
+
+
+def register_workflow_graph(name: str, builder: Callable[[], Any]) -> None:
+    """
+    Register an alternate graph variant under `name`.
+
+    `builder` must return a compiled graph. It is called once, on first use.
+    Re-registering a name drops the previously compiled graph.
+    """
+    with _COMPILED_GRAPHS_LOCK:
+        WORKFLOW_GRAPH_BUILDERS[name] = builder
+        _COMPILED_GRAPHS.pop(name, None)
+
+
+def check_workflow_graph(name: str) -> None:
+    """Raise ValueError if no graph is registered under `name` (nothing is built)."""
+    if name not in WORKFLOW_GRAPH_BUILDERS:
+        raise ValueError(
+            f"Unknown workflow graph '{name}'. "
+            f"Available graphs: {list(WORKFLOW_GRAPH_BUILDERS.keys())}"
+        )
+
+
+def get_workflow_graph(name: str = DEFAULT_WORKFLOW_GRAPH):
+    """
+    Return the compiled graph registered under `name`, compiling it on first use.
+
+    Compiled graphs carry no per-run state (no checkpointer), so a single
+    instance is safely shared by concurrent requests; each invoke() gets its
+    own fresh state dict.
+    """
+    graph = _COMPILED_GRAPHS.get(name)
+    if graph is not None:
+        return graph
+
+    with _COMPILED_GRAPHS_LOCK:
+        graph = _COMPILED_GRAPHS.get(name)
+        if graph is None:
+            check_workflow_graph(name)
+            graph = WORKFLOW_GRAPH_BUILDERS[name]()
+            _COMPILED_GRAPHS[name] = graph
+
+    return graph
+
+
 # ============================================================
 # PUBLIC FUNCTION USED BY MCP TOOL
 # ============================================================
 
-def run_full_workflow(user_question: str, model: str = DEFAULT_AGENT_MODEL) -> Dict[str, Any]:
+def run_full_workflow(
+    user_question: str,
+    model: str = DEFAULT_AGENT_MODEL,
+    graph_name: str = DEFAULT_WORKFLOW_GRAPH,
+    on_node_end: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
     """
     Runs the complete 4-agent LangGraph workflow.
 
+    `graph_name` selects a registered graph variant (see WORKFLOW_GRAPH_BUILDERS).
+    `on_node_end(node, update)` is called as each agent finishes (used for
+    job progress); the graph is then driven with stream(stream_mode="updates").
+
     Called by:
         backend/mcp_server/tools.py  → workflow_tool
+        backend/jobs.py              → background workflow jobs
 
     Returns:
         {
@@ -163,18 +518,124 @@ def run_full_workflow(user_question: str, model: str = DEFAULT_AGENT_MODEL) -> D
         }
     """
 
-    workflow = build_workflow_graph()
+    workflow = get_workflow_graph(graph_name)
 
     initial_state = WorkflowState(
         project_input=user_question,
         model=model,
+        data_snapshot=DATA_STORE.snapshot(),
     )
 
-    final_state = workflow.invoke(initial_state)
+    if on_node_end is None:
+        final_state = workflow.invoke(initial_state)
+        return _workflow_result(final_state)
+
+    final_state: Dict[str, Any] = dict(initial_state)
+    for step in workflow.stream(initial_state, stream_mode="updates"):
+        for node, update in step.items():
+            final_state.update(update or {})
+            on_node_end(node, update or {})
+
+    return _workflow_result(final_state)
+
 
+async def arun_full_workflow(
+    user_question: str,
+    model: str = DEFAULT_AGENT_MODEL,
+    graph_name: str = DEFAULT_WORKFLOW_GRAPH,
+) -> Dict[str, Any]:
+    """
+    Async version of run_full_workflow().
+
+    Drives the graph with ainvoke(), so every agent uses acall_llm()
+    and the event loop stays free while the models are working.
+    """
+
+    workflow = get_workflow_graph(graph_name)
+
+    initial_state = WorkflowState(
+        project_input=user_question,
+        model=model,
+        data_snapshot=DATA_STORE.snapshot(),
+    )
+
+    final_state = await workflow.ainvoke(initial_state)
+
+    return _workflow_result(final_state)
+
+
+# Graph node name -> key in the workflow result returned to MCP tools
+NODE_RESULT_KEYS = {
+    "project": "project_agent",
+    "risk": "risk_agent",
+    "comms": "comms_agent",
+    "supervisor": "supervisor",
+}
+
+
+def _workflow_result(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the final graph state to the shape returned to MCP tools."""
     return {
         "project_agent": final_state.get("project_agent_output", ""),
         "risk_agent": final_state.get("risk_agent_output", ""),
         "comms_agent": final_state.get("comms_agent_output", ""),
         "supervisor": final_state.get("supervisor_output", ""),
     }
+
+
+async def astream_workflow_events(
+    user_question: str,
+    model: str = DEFAULT_AGENT_MODEL,
+    graph_name: str = DEFAULT_WORKFLOW_GRAPH,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the workflow and yield progress events as they happen.
+
+    Yields dicts shaped like:
+        {"event": "node_start", "node": "project", "key": "project_agent"}
+        {"event": "token",      "node": "risk",    "key": "risk_agent", "text": "..."}
+        {"event": "node_end",   "node": "comms",   "key": "comms_agent", "output": "..."}
+        {"event": "done",       "result": { ...same shape as run_full_workflow()... }}
+
+    Token chunks come from the agents' LLM calls: under astream_events()
+    LangChain streams the model response even though agents call ainvoke().
+    Parallel branches (Risk / Comms) interleave their tokens.
+    """
+
+    workflow = get_workflow_graph(graph_name)
+
+    initial_state = WorkflowState(
+        project_input=user_question,
+        model=model,
+        data_snapshot=DATA_STORE.snapshot(),
+    )
+
+    final_state: Dict[str, Any] = dict(initial_state)
+
+    async for ev in workflow.astream_events(initial_state, version="v2"):
+        node = ev.get("metadata", {}).get("langgraph_node")
+        if node not in NODE_RESULT_KEYS:
+            continue
+
+        kind = ev["event"]
+        key = NODE_RESULT_KEYS[node]
+
+        if kind == "on_chat_model_stream":
+            text = getattr(ev["data"].get("chunk"), "content", "")
+            if text:
+                yield {"event": "token", "node": node, "key": key, "text": text}
+
+        elif kind == "on_chain_start" and ev["name"] == node:
+            yield {"event": "node_start", "node": node, "key": key}
+
+        elif kind == "on_chain_end" and ev["name"] == node:
+            update = ev["data"].get("output") or {}
+            final_state.update(update)
+            yield {
+                "event": "node_end",
+                "node": node,
+                "key": key,
+                "output": next(iter(update.values()), ""),
+            }
+
+    yield {"event": "done", "result": _workflow_result(final_state)}
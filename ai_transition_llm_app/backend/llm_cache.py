@@ -0,0 +1,289 @@
+"""
+Content-addressed response cache for LLM calls.
+
+Two tiers:
+- In-process LRU (OrderedDict) with TTL and max-entries eviction
+- Optional SQLite tier on disk that survives restarts (set LLM_CACHE_DB_PATH);
+  async callers use aget() / aset(), which run it in a worker thread
+
+Keys are SHA-256 digests of the call inputs (model, system prompt, prompt,
+temperature), so identical prompts map to the same entry no matter which
+agent or tool produced them.
+
+Used by:
+    backend/llm_client.py         → call_llm() / acall_llm() / call_llm_stream()
+    backend/langgraph_pipeline.py → workflow node output cache
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from backend.config import (
+    LLM_CACHE_DB_PATH,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_DISK_ENTRIES,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+)
+
+
+# ============================================================
+# Cache Key
+# ============================================================
+
+def make_cache_key(*parts: Any) -> str:
+    """Stable SHA-256 digest of JSON-serializable parts."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def llm_cache_key(
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    temperature: float,
+) -> str:
+    """Cache key for a single LLM call."""
+    return make_cache_key("llm", model, system_prompt or "", prompt, float(temperature))
+
+
+# ============================================================
+# Two-tier Cache
+# ============================================================
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of text values with TTL, plus an optional SQLite tier.
+
+    - get(): memory first, then disk (disk hits are promoted to memory)
+    - set(): writes to both tiers
+    - aget() / aset(): the same for async callers; the disk tier runs in a
+      worker thread so SQLite I/O never blocks the event loop
+    - TTL applies to both tiers (ttl_seconds <= 0 disables expiry)
+
+    Disk hits do not write: their access times are collected and flushed
+    with the next store, right before size-based eviction needs them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        db_path: Optional[str] = None,
+        max_disk_entries: int = 20000,
+        table: str = "llm_responses",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.table = table
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+        self._db: Optional[sqlite3.Connection] = None
+        # Guards the connection; separate from _lock so memory hits never wait on disk I/O
+        self._db_lock = threading.Lock()
+        self._touched: Dict[str, float] = {}     # key → last disk hit, not yet written
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is None and self._db is not None:
+            value = self._get_disk(key, now)
+        if value is None:
+            self._count("misses")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        self._set_memory(key, value, now)
+        if self._db is not None:
+            self._set_disk(key, value, now)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() for async callers (disk lookups run in a worker thread)."""
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is None and self._db is not None:
+            value = await asyncio.to_thread(self._get_disk, key, now)
+        if value is None:
+            self._count("misses")
+        return value
+
+    async def aset(self, key: str, value: str) -> None:
+        """set() for async callers (the disk write runs in a worker thread)."""
+        now = time.time()
+        self._set_memory(key, value, now)
+        if self._db is not None:
+            await asyncio.to_thread(self._set_disk, key, value, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._touched.clear()
+                self._db.execute(f"DELETE FROM {self.table}")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_enabled"] = self._db is not None
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    # --------------------------------------------------------
+    # Memory tier
+    # --------------------------------------------------------
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            value, created = entry
+            if self._expired(created, now):
+                del self._memory[key]
+                self._stats["expirations"] += 1
+                return None
+            self._memory.move_to_end(key)
+            self._stats["hits"] += 1
+            self._stats["memory_hits"] += 1
+            return value
+
+    def _set_memory(self, key: str, value: str, created: float) -> None:
+        with self._lock:
+            self._put_memory(key, value, created)
+            self._stats["stores"] += 1
+
+    # --------------------------------------------------------
+    # Disk tier (blocking; async callers run it in a thread)
+    # --------------------------------------------------------
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        with self._db_lock:
+            row = self._db.execute(
+                f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self._expired(created, now):
+                self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._db.commit()
+                self._touched.pop(key, None)
+                expired = True
+            else:
+                self._touched[key] = now
+                expired = False
+
+        with self._lock:
+            if expired:
+                self._stats["expirations"] += 1
+                return None
+            self._put_memory(key, value, created)
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+        return value
+
+    def _set_disk(self, key: str, value: str, now: float) -> None:
+        with self._db_lock:
+            self._touched.pop(key, None)
+            if self._touched:
+                # Access times of disk hits since the last store, written in one go
+                self._db.executemany(
+                    f"UPDATE {self.table} SET accessed = ? WHERE key = ?",
+                    [(accessed, k) for k, accessed in self._touched.items()],
+                )
+                self._touched.clear()
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            # Size-based eviction on disk: drop least recently accessed rows
+            self._db.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed ASC "
+                f"LIMIT MAX(0, (SELECT COUNT(*) FROM {self.table}) - ?))",
+                (self.max_disk_entries,),
+            )
+            self._db.commit()
+
+    # --------------------------------------------------------
+    # Internals (caller holds self._lock)
+    # --------------------------------------------------------
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created > self.ttl_seconds
+
+    def _put_memory(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+
+# ============================================================
+# Shared LLM response cache
+# ============================================================
+
+LLM_RESPONSE_CACHE: Optional[ResponseCache] = (
+    ResponseCache(
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds=LLM_CACHE_TTL_SECONDS,
+        db_path=LLM_CACHE_DB_PATH,
+        max_disk_entries=LLM_CACHE_MAX_DISK_ENTRIES,
+    )
+    if LLM_CACHE_ENABLED
+    else None
+)
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    """Hit/miss statistics of the shared LLM response cache."""
+    if LLM_RESPONSE_CACHE is None:
+        return {"enabled": False}
+    return {"enabled": True, **LLM_RESPONSE_CACHE.stats()}
@@ -3,41 +3,111 @@ LLM Client helper for all agents + MCP tools + LangGraph workflow.
 
 This module provides:
 - call_llm(): Simple wrapper to call TCS GenAI Lab models using LangChain ChatOpenAI
-- create_llm(): Reusable LLM object
-- global httpx client with verify=False (required for internal GenAI Lab endpoint)
-
-The rest of the backend only calls call_llm() for consistency.
+- acall_llm(): Native async version of call_llm() for async tools / agents
+- call_llm_stream(): Async streaming version (yields incremental chunks)
+- call_llm_measured() / acall_llm_measured(): uncached call that also reports
+  latency, time-to-first-token and prompt/completion token counts
+- create_llm(): Cached LLM handle per (model, temperature)
+- response caching via backend.llm_cache (pass use_cache=False to opt out)
+- per-model rate limiting, retries with backoff and circuit breaking via
+  backend.llm_resilience; failures raise LLMError subclasses (never error
+  strings), so callers can react instead of passing errors on as content
+- shared httpx clients (sync + async) with verify=False (required for internal
+  GenAI Lab endpoint), tuned connection limits and keep-alive; created on
+  first use and closed by aclose_clients() on application shutdown
+- one "llm.call" trace span + latency / token metrics per call that reaches
+  the model (cache hits are not counted) via backend.observability, and a
+  prompt profile entry when profiling is on (backend.prompt_profiler)
+- live per-model latency / error averages for backend.model_router
+
+The rest of the backend only calls call_llm() / acall_llm() for consistency.
+
+langchain_openai (and with it the OpenAI SDK) is imported on the first
+create_llm() call, not when this module is imported, so processes that never
+call a model (CLI tools, cold workers before their first request) start fast.
 """
 
 from __future__ import annotations
 
-import traceback
-from typing import Optional
-
-import httpx
-from langchain_openai import ChatOpenAI
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from backend.config import BASE_URL, GENAI_API_KEY
+from backend.llm_cache import LLM_RESPONSE_CACHE, llm_cache_key
+from backend.model_router import MODEL_STATS
+from backend.observability import LLM_CALL_SECONDS, Span, record_llm_tokens, span
+from backend.prompt_profiler import PROMPT_PROFILER
+from backend.tokens import count_tokens
+from backend.llm_resilience import (  # noqa: F401  (errors re-exported for callers)
+    LLMCircuitOpenError,
+    LLMError,
+    LLMRateLimitError,
+    LLMTimeoutError,
+    LLMUnavailableError,
+    model_guard,
+)
+
+if TYPE_CHECKING:
+    import httpx
+    from langchain_openai import ChatOpenAI
 
 
 # ============================================================
-# Shared HTTPX Client
+# Shared HTTPX Clients
 # ============================================================
 
-# Using verify=False because GenAI Lab internal CA is not recognized externally.
-http_client = httpx.Client(
-    verify=False,
-    timeout=60.0  # can be increased depending on model latency
-)
+_HTTP_CLIENTS: Optional[Tuple["httpx.Client", "httpx.AsyncClient"]] = None
+_HTTP_CLIENTS_LOCK = threading.Lock()
+
+
+def _http_clients() -> Tuple["httpx.Client", "httpx.AsyncClient"]:
+    """The shared (sync, async) httpx clients, created on first use."""
+    global _HTTP_CLIENTS
+    if _HTTP_CLIENTS is not None:
+        return _HTTP_CLIENTS
+
+    with _HTTP_CLIENTS_LOCK:
+        if _HTTP_CLIENTS is None:
+            import httpx
+
+            # Connection pool shared by every model handle. Keep-alive connections are
+            # reused across agent calls, chat turns and comparisons instead of paying a
+            # fresh TLS handshake per request.
+            limits = httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0,
+            )
+
+            # Generous read timeout because some models take a while to answer,
+            # but fail fast if the endpoint cannot be reached at all.
+            timeout = httpx.Timeout(60.0, connect=10.0)
+
+            # Using verify=False because GenAI Lab internal CA is not recognized externally.
+            _HTTP_CLIENTS = (
+                httpx.Client(verify=False, timeout=timeout, limits=limits),
+                httpx.AsyncClient(verify=False, timeout=timeout, limits=limits),
+            )
+    return _HTTP_CLIENTS
 
 
 # ============================================================
-# LLM Factory
+# LLM Factory (cached handles)
 # ============================================================
 
+_LLM_HANDLES: Dict[Tuple[str, float], "ChatOpenAI"] = {}
+_LLM_HANDLES_LOCK = threading.Lock()
+
+
 def create_llm(model: str, temperature: float = 0.2) -> ChatOpenAI:
     """
-    Create a LangChain ChatOpenAI LLM object for the given model.
+    Return a LangChain ChatOpenAI LLM object for the given model.
+
+    Handles are cached per (model, temperature) and share the pooled
+    sync/async httpx clients, so repeated calls do not rebuild the client.
 
     Args:
         model: full model string, e.g. "azure/genailab-maas-gpt-4o"
@@ -46,13 +116,110 @@ def create_llm(model: str, temperature: float = 0.2) -> ChatOpenAI:
     Returns:
         ChatOpenAI object
     """
-    return ChatOpenAI(
-        base_url=BASE_URL,
-        api_key=GENAI_API_KEY,
-        model=model,
-        temperature=temperature,
-        http_client=http_client,
-    )
+    key = (model, float(temperature))
+
+    llm = _LLM_HANDLES.get(key)
+    if llm is not None:
+        return llm
+
+    with _LLM_HANDLES_LOCK:
+        llm = _LLM_HANDLES.get(key)
+        if llm is None:
+            from langchain_openai import ChatOpenAI
+
+            http_client, async_http_client = _http_clients()
+            llm = ChatOpenAI(
+                base_url=BASE_URL,
+                api_key=GENAI_API_KEY,
+                model=model,
+                temperature=temperature,
+                http_client=http_client,
+                http_async_client=async_http_client,
+                # Retries are handled by backend.llm_resilience
+                max_retries=0,
+            )
+            _LLM_HANDLES[key] = llm
+
+    return llm
+
+
+def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+    """Build the chat message list shared by every call variant."""
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def _cache_key(
+    model: str,
+    prompt: str,
+    temperature: float,
+    system_prompt: Optional[str],
+    use_cache: bool,
+) -> Optional[str]:
+    """Cache key for this call, or None when caching does not apply."""
+    if not use_cache or LLM_RESPONSE_CACHE is None:
+        return None
+    return llm_cache_key(model, system_prompt, prompt, temperature)
+
+
+def _response_text(response) -> str:
+    """Extract text content from a LangChain response object."""
+    if hasattr(response, "content"):
+        return response.content
+
+    # Fallback for safety
+    return str(response)
+
+
+def _token_usage(
+    prompt: str,
+    system_prompt: Optional[str],
+    text: str,
+    usage: Optional[Dict[str, Any]],
+) -> Tuple[int, int, str]:
+    """(prompt_tokens, completion_tokens, source), estimated locally if not reported."""
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0), "reported"
+    return count_tokens((system_prompt or "") + prompt), count_tokens(text), "estimated"
+
+
+def _record_usage(
+    model: str,
+    prompt: str,
+    system_prompt: Optional[str],
+    text: str,
+    usage: Optional[Dict[str, Any]],
+) -> Tuple[int, int, str]:
+    """Report a finished call's tokens to the metrics and the prompt profiler."""
+    prompt_tokens, completion_tokens, source = _token_usage(prompt, system_prompt, text, usage)
+    record_llm_tokens(model, prompt_tokens, completion_tokens)
+    PROMPT_PROFILER.record_call(model, prompt, system_prompt, prompt_tokens, completion_tokens, source)
+    return prompt_tokens, completion_tokens, source
+
+
+@contextmanager
+def _llm_call_span(model: str, mode: str) -> Iterator[Span]:
+    """
+    "llm.call" span that also feeds the model router's live latency / error
+    averages. Calls abandoned by the caller (closed stream, cancelled task)
+    are not counted either way.
+    """
+    started = time.perf_counter()
+    ok = None
+    with span("llm.call", LLM_CALL_SECONDS, model=model, mode=mode) as s:
+        try:
+            yield s
+            ok = True
+        except LLMError:
+            ok = False
+            raise
+        finally:
+            if ok is not None:
+                MODEL_STATS.observe(model, time.perf_counter() - started, ok)
 
 
 # ============================================================
@@ -64,64 +231,293 @@ def call_llm(
     prompt: str,
     temperature: float = 0.2,
     system_prompt: Optional[str] = None,
+    use_cache: bool = True,
 ) -> str:
     """
     Call any TCS GenAI Lab LLM with a standardized prompt.
 
-    Agents and MCP tools should ONLY use this function.
+    Agents and MCP tools should ONLY use this function (or acall_llm).
 
     Args:
         model: selected model ID (from config.ALLOWED_MODELS mapping)
         prompt: user or agent-generated prompt text
         temperature: creativity level
         system_prompt: optional system instruction
+        use_cache: set False to bypass the response cache for this call
 
     Returns:
         Model's text output
+
+    Raises:
+        LLMError (or a subclass) once retries are exhausted
     """
 
-    try:
-        llm = create_llm(model=model, temperature=temperature)
+    key = _cache_key(model, prompt, temperature, system_prompt, use_cache)
+    if key is not None:
+        cached = LLM_RESPONSE_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    llm = create_llm(model=model, temperature=temperature)
+    guard = model_guard(model)
+    attempt = 0
+    with _llm_call_span(model, "invoke") as s:
+        while True:
+            guard.acquire()
+            try:
+                response = llm.invoke(_build_messages(prompt, system_prompt))
+                text = _response_text(response)
+            except Exception as e:
+                error, delay = guard.on_failure(e, attempt)
+                if delay is None:
+                    raise error from e
+                time.sleep(delay)
+                attempt += 1
+                continue
+            guard.on_success()
+            break
+        s.set(attempts=attempt + 1)
+        _record_usage(model, prompt, system_prompt, text, getattr(response, "usage_metadata", None))
+
+    # Only successful, non-empty responses are cached
+    if key is not None and text:
+        LLM_RESPONSE_CACHE.set(key, text)
+
+    return text
+
+
+async def acall_llm(
+    model: str,
+    prompt: str,
+    temperature: float = 0.2,
+    system_prompt: Optional[str] = None,
+    use_cache: bool = True,
+) -> str:
+    """
+    Async version of call_llm().
 
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+    Uses the shared httpx.AsyncClient so the event loop is never blocked
+    while waiting for the model (or backing off between retries).
+    """
+
+    key = _cache_key(model, prompt, temperature, system_prompt, use_cache)
+    if key is not None:
+        cached = await LLM_RESPONSE_CACHE.aget(key)
+        if cached is not None:
+            return cached
+
+    llm = create_llm(model=model, temperature=temperature)
+    guard = model_guard(model)
+    attempt = 0
+    with _llm_call_span(model, "invoke") as s:
+        while True:
+            await guard.aacquire()
+            try:
+                response = await llm.ainvoke(_build_messages(prompt, system_prompt))
+                text = _response_text(response)
+            except Exception as e:
+                error, delay = guard.on_failure(e, attempt)
+                if delay is None:
+                    raise error from e
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            guard.on_success()
+            break
+        s.set(attempts=attempt + 1)
+        _record_usage(model, prompt, system_prompt, text, getattr(response, "usage_metadata", None))
+
+    # Only successful, non-empty responses are cached
+    if key is not None and text:
+        await LLM_RESPONSE_CACHE.aset(key, text)
+
+    return text
 
-        messages.append({"role": "user", "content": prompt})
 
-        response = llm.invoke(messages)
+# ============================================================
+# Streaming Version
+# ============================================================
 
-        if hasattr(response, "content"):
-            return response.content
+async def call_llm_stream(
+    model: str,
+    prompt: str,
+    temperature: float = 0.2,
+    system_prompt: Optional[str] = None,
+    use_cache: bool = True,
+) -> AsyncIterator[str]:
+    """
+    Asynchronous streaming version of call_llm().
 
-        # Fallback for safety
-        return str(response)
+    Yields incremental chunks. A cache hit is yielded as a single chunk;
+    a fully streamed response is stored in the cache.
 
-    except Exception as e:
-        traceback.print_exc()
-        return f"[LLM ERROR] {e}"
+    Transient failures are retried only until the first chunk has been
+    yielded; after that an LLMError is raised mid-stream.
+    """
+    key = _cache_key(model, prompt, temperature, system_prompt, use_cache)
+    if key is not None:
+        cached = await LLM_RESPONSE_CACHE.aget(key)
+        if cached is not None:
+            yield cached
+            return
+
+    llm = create_llm(model=model, temperature=temperature)
+    guard = model_guard(model)
+    chunks: List[str] = []
+    attempt = 0
+    with _llm_call_span(model, "stream") as s:
+        while True:
+            await guard.aacquire()
+            try:
+                async for chunk in llm.astream(_build_messages(prompt, system_prompt)):
+                    if hasattr(chunk, "content") and chunk.content:
+                        chunks.append(chunk.content)
+                        yield chunk.content
+            except Exception as e:
+                error, delay = guard.on_failure(e, attempt)
+                if delay is None or chunks:
+                    raise error from e
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            guard.on_success()
+            break
+        s.set(attempts=attempt + 1)
+        _record_usage(model, prompt, system_prompt, "".join(chunks), None)
+
+    # An empty stream (no content chunks) is not cached
+    text = "".join(chunks)
+    if key is not None and text:
+        await LLM_RESPONSE_CACHE.aset(key, text)
 
 
 # ============================================================
-# Streaming Version (optional future use)
+# Measured Calls (model comparison)
 # ============================================================
 
-async def call_llm_stream(model: str, prompt: str, temperature: float = 0.2):
-    """
-    Asynchronous streaming version (optional).
-    Not used yet, but MCP chat tool may choose to use streaming later.
-
-    Yields incremental chunks.
+def _measurement(
+    model: str,
+    prompt: str,
+    system_prompt: Optional[str],
+    text: str,
+    started: float,
+    first_token_at: Optional[float],
+    usage: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Answer + timing + token counts (estimated locally if usage was not reported)."""
+    latency = time.perf_counter() - started
+    prompt_tokens, completion_tokens, usage_source = _record_usage(model, prompt, system_prompt, text, usage)
+
+    generation_time = latency - ((first_token_at - started) if first_token_at else 0.0)
+    return {
+        "model": model,
+        "answer": text,
+        "latency_s": round(latency, 3),
+        "ttft_s": round(first_token_at - started, 3) if first_token_at else None,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "tokens_per_s": round(completion_tokens / generation_time, 1) if generation_time > 0 else None,
+        "usage_source": usage_source,
+    }
+
+
+def call_llm_measured(
+    model: str,
+    prompt: str,
+    temperature: float = 0.2,
+    system_prompt: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    try:
-        llm = create_llm(model=model, temperature=temperature)
-
-        messages = [{"role": "user", "content": prompt}]
+    Call the model (streaming, never cached) and report how it performed.
 
-        async for chunk in llm.astream(messages):
-            if hasattr(chunk, "content") and chunk.content:
-                yield chunk.content
+    Returns:
+        {"model", "answer", "latency_s", "ttft_s", "prompt_tokens",
+         "completion_tokens", "tokens_per_s", "usage_source"}
 
-    except Exception as e:
-        yield f"[STREAM ERROR] {e}"
-# ChatOpenAI + embeddings + httpx client
+    Latency is wall-clock time including retries and rate-limit waits.
+    Token counts come from the endpoint's usage report when available
+    (usage_source="reported"), otherwise they are estimated locally.
+    """
+    llm = create_llm(model=model, temperature=temperature)
+    guard = model_guard(model)
+    messages = _build_messages(prompt, system_prompt)
+
+    started = time.perf_counter()
+    first_token_at: Optional[float] = None
+    chunks: List[str] = []
+    usage = None
+    attempt = 0
+    with _llm_call_span(model, "measured") as s:
+        while True:
+            guard.acquire()
+            try:
+                for chunk in llm.stream(messages, stream_usage=True):
+                    if chunk.content:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        chunks.append(chunk.content)
+                    if getattr(chunk, "usage_metadata", None):
+                        usage = chunk.usage_metadata
+            except Exception as e:
+                error, delay = guard.on_failure(e, attempt)
+                if delay is None or chunks:
+                    raise error from e
+                time.sleep(delay)
+                attempt += 1
+                continue
+            guard.on_success()
+            break
+        s.set(attempts=attempt + 1)
+        return _measurement(model, prompt, system_prompt, "".join(chunks), started, first_token_at, usage)
+
+
+async def acall_llm_measured(
+    model: str,
+    prompt: str,
+    temperature: float = 0.2,
+    system_prompt: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Async version of call_llm_measured()."""
+    llm = create_llm(model=model, temperature=temperature)
+    guard = model_guard(model)
+    messages = _build_messages(prompt, system_prompt)
+
+    started = time.perf_counter()
+    first_token_at: Optional[float] = None
+    chunks: List[str] = []
+    usage = None
+    attempt = 0
+    with _llm_call_span(model, "measured") as s:
+        while True:
+            await guard.aacquire()
+            try:
+                async for chunk in llm.astream(messages, stream_usage=True):
+                    if chunk.content:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        chunks.append(chunk.content)
+                    if getattr(chunk, "usage_metadata", None):
+                        usage = chunk.usage_metadata
+            except Exception as e:
+                error, delay = guard.on_failure(e, attempt)
+                if delay is None or chunks:
+                    raise error from e
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            guard.on_success()
+            break
+        s.set(attempts=attempt + 1)
+        return _measurement(model, prompt, system_prompt, "".join(chunks), started, first_token_at, usage)
+
+
+async def aclose_clients() -> None:
+    """Close the shared httpx clients (call on application shutdown)."""
+    global _HTTP_CLIENTS
+    with _HTTP_CLIENTS_LOCK, _LLM_HANDLES_LOCK:
+        clients, _HTTP_CLIENTS = _HTTP_CLIENTS, None
+        # Handles hold the closed clients; rebuild them if a call comes later
+        _LLM_HANDLES.clear()
+    if clients is not None:
+        clients[0].close()
+        await clients[1].aclose()
@@ -0,0 +1,341 @@
+"""
+Outbound resilience for LLM calls.
+
+Wraps every request to the GenAI Lab endpoint with, per model:
+- a token-bucket rate limit (config.LLM_RATE_LIMIT_DEFAULT / MODEL_RATE_LIMITS)
+- bounded retries with full-jitter exponential backoff for transient errors
+  (429, 5xx, timeouts, connection failures), honoring Retry-After
+- a circuit breaker that fails fast while a model keeps failing
+
+Failures surface as typed exceptions (LLMError and subclasses) instead of
+error strings, so callers never mistake an error for model output. Each
+error carries the HTTP status the API layer should answer with.
+
+Used by:
+    backend/llm_client.py → call_llm() / acall_llm() / call_llm_stream()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from backend.config import (
+    LLM_BREAKER_FAILURE_THRESHOLD,
+    LLM_BREAKER_RESET_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_RATE_LIMIT_DEFAULT,
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS,
+    LLM_RETRY_BASE_DELAY_SECONDS,
+    LLM_RETRY_MAX_DELAY_SECONDS,
+    MODEL_RATE_LIMITS,
+)
+
+
+# ============================================================
+# Errors
+# ============================================================
+
+class LLMError(RuntimeError):
+    """An LLM call failed. Base class of all LLM errors."""
+
+    status_code = 502      # HTTP status to report to API clients
+    transient = False      # worth retrying?
+
+    def __init__(self, message: str, model: Optional[str] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.model = model
+        self.retry_after = retry_after
+
+
+class LLMRateLimitError(LLMError):
+    """Throttled: by the endpoint (429) or by the local rate limiter."""
+
+    status_code = 429
+    transient = True
+
+
+class LLMUnavailableError(LLMError):
+    """Endpoint unreachable or returning 5xx."""
+
+    status_code = 503
+    transient = True
+
+
+class LLMCircuitOpenError(LLMUnavailableError):
+    """The model's circuit breaker is open; the call was not attempted."""
+
+    transient = False
+
+
+class LLMTimeoutError(LLMError):
+    """The model did not answer in time."""
+
+    status_code = 504
+    transient = True
+
+
+def _retry_after_header(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc: BaseException, model: str) -> LLMError:
+    """Map an exception raised by the OpenAI / httpx stack to an LLMError."""
+    if isinstance(exc, LLMError):
+        return exc
+
+    # Imported here so importing this module does not pull in the OpenAI SDK
+    import httpx
+    import openai
+
+    message = f"{model}: {type(exc).__name__}: {exc}"
+
+    if isinstance(exc, openai.RateLimitError):
+        return LLMRateLimitError(message, model, _retry_after_header(exc))
+    # APITimeoutError subclasses APIConnectionError, so check it first
+    if isinstance(exc, (openai.APITimeoutError, httpx.TimeoutException, asyncio.TimeoutError)):
+        return LLMTimeoutError(message, model)
+    if isinstance(exc, (openai.APIConnectionError, httpx.TransportError)):
+        return LLMUnavailableError(message, model)
+
+    status = getattr(exc, "status_code", None)
+    if status == 429:
+        return LLMRateLimitError(message, model, _retry_after_header(exc))
+    if isinstance(status, int) and status >= 500:
+        return LLMUnavailableError(message, model, _retry_after_header(exc))
+
+    # 4xx, bad responses, programming errors: retrying will not help
+    return LLMError(message, model)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    cap = min(LLM_RETRY_MAX_DELAY_SECONDS, LLM_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    delay = random.uniform(0, cap)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+# ============================================================
+# Token bucket
+# ============================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. reserve() books a token and returns how long
+    the caller has to wait for it, so sync and async callers can share one
+    bucket (time.sleep vs asyncio.sleep).
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Seconds to wait before calling, or None if that exceeds max_wait."""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            # Tokens may go negative: later callers queue behind this one
+            self._tokens -= 1
+            return wait
+
+
+# ============================================================
+# Circuit breaker
+# ============================================================
+
+class CircuitBreaker:
+    """
+    closed    → calls pass; consecutive transient failures are counted
+    open      → calls fail fast until reset_seconds have passed
+    half_open → one probe call is let through; success closes the circuit,
+                failure re-opens it
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+
+            now = time.monotonic()
+            if self.state == "open" and now - self._opened_at < self.reset_seconds:
+                return False
+
+            # Let one probe through (and another if the last probe never reported back)
+            if self._probe_started is None or now - self._probe_started >= self.reset_seconds:
+                self.state = "half_open"
+                self._probe_started = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+
+
+# ============================================================
+# Per-model guard
+# ============================================================
+
+class ModelGuard:
+    """Rate limit + circuit breaker + retry bookkeeping for one model."""
+
+    def __init__(self, model: str):
+        limits = {**LLM_RATE_LIMIT_DEFAULT, **MODEL_RATE_LIMITS.get(model, {})}
+        self.model = model
+        self.bucket = TokenBucket(limits.get("rps", 0), limits.get("burst", 1))
+        self.breaker = CircuitBreaker(LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RESET_SECONDS)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "attempts": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "throttled": 0,       # calls that waited for the local rate limiter
+            "rejected": 0,        # calls refused locally (circuit open / wait too long)
+        }
+
+    # --------------------------------------------------------
+    # Before each attempt
+    # --------------------------------------------------------
+
+    def _admit(self) -> float:
+        """Check the breaker and book a rate-limit token; returns the wait."""
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise LLMCircuitOpenError(
+                f"{self.model}: circuit open after repeated failures; failing fast.",
+                self.model,
+                retry_after=self.breaker.retry_after(),
+            )
+
+        wait = self.bucket.reserve(LLM_RATE_LIMIT_MAX_WAIT_SECONDS)
+        if wait is None:
+            self._count("rejected")
+            raise LLMRateLimitError(
+                f"{self.model}: local rate limit exceeded.",
+                self.model,
+                retry_after=1.0,
+            )
+        if wait > 0:
+            self._count("throttled")
+        self._count("attempts")
+        return wait
+
+    def acquire(self) -> None:
+        wait = self._admit()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        wait = self._admit()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # --------------------------------------------------------
+    # After each attempt
+    # --------------------------------------------------------
+
+    def on_success(self) -> None:
+        self.breaker.record_success()
+        self._count("successes")
+
+    def on_failure(self, exc: BaseException, attempt: int) -> Tuple[LLMError, Optional[float]]:
+        """
+        Record a failed attempt. Returns the typed error and the delay before
+        the next attempt, or None when the caller should give up and raise.
+        """
+        error = classify_error(exc, self.model)
+        self._count("failures")
+
+        if error.transient:
+            self.breaker.record_failure()
+        else:
+            # The endpoint answered (e.g. 400): the model itself is up
+            self.breaker.record_success()
+            return error, None
+
+        if attempt >= LLM_MAX_RETRIES:
+            return error, None
+
+        delay = backoff_delay(attempt, error.retry_after)
+        if delay > LLM_RETRY_MAX_DELAY_SECONDS:
+            # Server asked us to back off longer than we are willing to wait
+            return error, None
+
+        self._count("retries")
+        return error, delay
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["circuit"] = self.breaker.state
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+
+_GUARDS: Dict[str, ModelGuard] = {}
+_GUARDS_LOCK = threading.Lock()
+
+
+def model_guard(model: str) -> ModelGuard:
+    """Shared guard for `model` (created on first use)."""
+    guard = _GUARDS.get(model)
+    if guard is None:
+        with _GUARDS_LOCK:
+            guard = _GUARDS.setdefault(model, ModelGuard(model))
+    return guard
+
+
+def llm_resilience_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-model attempt / retry / circuit stats for /health."""
+    return {model: guard.stats() for model, guard in list(_GUARDS.items())}
@@ -0,0 +1,64 @@
+"""
+Logging setup for the backend.
+
+All backend modules log through loggers under "backend" (e.g.
+"backend.data_store", "backend.trace"). configure_logging() attaches one
+stream handler to that logger, plain text or one JSON object per line
+(config.LOG_FORMAT), at config.LOG_LEVEL. Nothing is configured at import
+time; the app calls it from its startup hook, CLI entry points from main().
+
+Extra fields passed with `extra={...}` are included in JSON output.
+
+Used by:
+    app.py               → lifespan startup
+    backend/evaluation.py → CLI main()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import time
+
+from backend.config import LOG_FORMAT, LOG_LEVEL
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                  + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _STANDARD_ATTRS and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """Attach a stream handler to the "backend" logger (idempotent)."""
+    logger = logging.getLogger("backend")
+    logger.setLevel(level)
+    # Own handler, so output does not depend on how the server configured the root logger
+    logger.propagate = False
+
+    for handler in logger.handlers:
+        if getattr(handler, "_backend_handler", False):
+            logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler._backend_handler = True
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(handler)
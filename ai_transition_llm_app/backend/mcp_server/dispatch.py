@@ -0,0 +1,213 @@
+"""
+MCP Dispatch Layer
+
+Runs MCP tools without blocking the event loop:
+
+- tools with a native async implementation (ASYNC_TOOL_REGISTRY) are awaited
+- sync-only tools (TOOL_REGISTRY) are offloaded to a bounded worker pool
+- per-tool and per-model concurrency limits (config.MCP_TOOL_CONCURRENCY,
+  config.MODEL_CONCURRENCY) cap how many calls run at once; callers waiting
+  longer than MCP_QUEUE_TIMEOUT_SECONDS get ToolBusyError (batch calls pass
+  their own queue timeout, see router.py /mcp/batch)
+- identical concurrent calls of tools in config.MCP_COALESCE_TOOLS share one
+  in-flight execution (see singleflight.py); only that execution takes slots
+- every dispatched call is recorded as an "mcp.tool" trace span with its
+  latency (backend/observability.py)
+- payload.extra.profile = true profiles every prompt the call sends and adds
+  the breakdown to the result as "profile" (backend/prompt_profiler.py);
+  profiled calls are never coalesced
+- model "auto" is replaced by the model backend/model_router.py picks for
+  the request, before any slot is taken
+
+Used by:
+    backend/mcp_server/router.py → /mcp/invoke, /mcp/workflow/stream
+    app.py                       → /chatbot, /chatbot/stream
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from backend.config import (
+    MCP_COALESCE_TOOLS,
+    MCP_QUEUE_TIMEOUT_SECONDS,
+    MCP_SYNC_TOOL_WORKERS,
+    MCP_TOOL_CONCURRENCY,
+    MODEL_CONCURRENCY,
+    MODEL_CONCURRENCY_DEFAULT,
+)
+from backend.mcp_server.singleflight import SingleFlight, coalesce_key
+from backend.mcp_server.tools import ASYNC_TOOL_REGISTRY, TOOL_REGISTRY
+from backend.model_router import route_payload
+from backend.observability import TOOL_CALL_SECONDS, span
+from backend.prompt_profiler import profile_request, summarize
+
+
+# ============================================================
+# Errors
+# ============================================================
+
+class UnknownToolError(KeyError):
+    """Requested tool is not registered."""
+
+
+class ToolBusyError(RuntimeError):
+    """A concurrency slot could not be acquired within the queue timeout."""
+
+
+# ============================================================
+# Worker pool for sync-only tools
+# ============================================================
+
+_SYNC_TOOL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MCP_SYNC_TOOL_WORKERS,
+    thread_name_prefix="mcp-tool",
+)
+
+
+# ============================================================
+# Concurrency limits
+# ============================================================
+
+# Semaphores are bound to the event loop they are used on, so keep one set
+# per loop (normally just uvicorn's loop).
+_LOOP_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphores = _LOOP_SEMAPHORES.setdefault(loop, {})
+    sem = semaphores.get(name)
+    if sem is None:
+        sem = semaphores[name] = asyncio.Semaphore(limit)
+    return sem
+
+
+def available_tools() -> List[str]:
+    return sorted(set(TOOL_REGISTRY) | set(ASYNC_TOOL_REGISTRY))
+
+
+def payload_models(payload: Dict[str, Any]) -> List[str]:
+    """Every model a tool call will hit (compare may use several)."""
+    extra = payload.get("extra") or {}
+    models = [payload.get("model"), extra.get("model2")]
+    models.extend(extra.get("models") or [])
+    return sorted({m for m in models if m})
+
+
+@asynccontextmanager
+async def concurrency_slot(
+    tool_name: str,
+    payload: Dict[str, Any],
+    queue_timeout: Optional[float] = MCP_QUEUE_TIMEOUT_SECONDS,
+) -> AsyncIterator[None]:
+    """
+    Hold one slot of the tool's limit and of every model's limit.
+
+    Slots are always acquired in the same order (tool, then models sorted by
+    name), so calls that need several models cannot deadlock each other.
+    queue_timeout=None waits for a slot as long as it takes.
+    """
+    limits = []
+    if tool_name in MCP_TOOL_CONCURRENCY:
+        limits.append((f"tool:{tool_name}", MCP_TOOL_CONCURRENCY[tool_name]))
+    for model in payload_models(payload):
+        limits.append((f"model:{model}", MODEL_CONCURRENCY.get(model, MODEL_CONCURRENCY_DEFAULT)))
+
+    async with AsyncExitStack() as stack:
+        for name, limit in limits:
+            sem = _semaphore(name, limit)
+            try:
+                await asyncio.wait_for(sem.acquire(), timeout=queue_timeout)
+            except asyncio.TimeoutError:
+                raise ToolBusyError(
+                    f"Too many concurrent requests for {name}; retry shortly."
+                ) from None
+            stack.callback(sem.release)
+        yield
+
+
+# ============================================================
+# Dispatch
+# ============================================================
+
+async def run_tool(tool_name: str, payload: Dict[str, Any]) -> Any:
+    """Run a tool without blocking the event loop (no concurrency limits)."""
+    async_fn = ASYNC_TOOL_REGISTRY.get(tool_name)
+    if async_fn is not None:
+        return await async_fn(payload)
+
+    sync_fn = TOOL_REGISTRY.get(tool_name)
+    if sync_fn is None:
+        raise UnknownToolError(tool_name)
+
+    # Copy contextvars so tracing/profiling context follows the call into the pool
+    ctx = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _SYNC_TOOL_EXECUTOR, functools.partial(ctx.run, sync_fn, payload)
+    )
+
+
+TOOL_SINGLE_FLIGHT = SingleFlight()
+
+
+async def _limited_run(tool_name: str, payload: Dict[str, Any], queue_timeout: Optional[float]) -> Any:
+    async with concurrency_slot(tool_name, payload, queue_timeout):
+        return await run_tool(tool_name, payload)
+
+
+async def dispatch_tool(
+    tool_name: str,
+    payload: Dict[str, Any],
+    queue_timeout: Optional[float] = MCP_QUEUE_TIMEOUT_SECONDS,
+) -> Any:
+    """
+    Run a tool under its per-tool and per-model concurrency limits,
+    coalescing identical in-flight calls for tools in MCP_COALESCE_TOOLS.
+    Model "auto" is resolved first; the routing decision is added to a
+    dict result as "routing". `queue_timeout` bounds the wait for a slot
+    (None: no limit).
+    """
+    if tool_name not in TOOL_REGISTRY and tool_name not in ASYNC_TOOL_REGISTRY:
+        raise UnknownToolError(tool_name)
+
+    payload, decision = route_payload(tool_name, payload)
+    result = await _dispatch(tool_name, payload, queue_timeout)
+    if decision is not None and isinstance(result, dict):
+        result = {**result, "routing": decision.to_dict()}
+    return result
+
+
+async def _dispatch(tool_name: str, payload: Dict[str, Any], queue_timeout: Optional[float]) -> Any:
+    if (payload.get("extra") or {}).get("profile"):
+        return await _profiled_run(tool_name, payload, queue_timeout)
+
+    with span("mcp.tool", TOOL_CALL_SECONDS, tool=tool_name, model=payload.get("model")):
+        if tool_name in MCP_COALESCE_TOOLS:
+            return await TOOL_SINGLE_FLIGHT.do(
+                coalesce_key(tool_name, payload),
+                lambda: _limited_run(tool_name, payload, queue_timeout),
+            )
+
+        return await _limited_run(tool_name, payload, queue_timeout)
+
+
+async def _profiled_run(tool_name: str, payload: Dict[str, Any], queue_timeout: Optional[float]) -> Any:
+    """Run the tool (uncoalesced) with prompt profiling; attach the profile to a dict result."""
+    with span("mcp.tool", TOOL_CALL_SECONDS, tool=tool_name, model=payload.get("model")) as s:
+        with profile_request() as records:
+            result = await _limited_run(tool_name, payload, queue_timeout)
+        s.set(profiled=True)
+
+    if isinstance(result, dict):
+        result = {**result, "profile": {**summarize(records), "calls": records}}
+    return result
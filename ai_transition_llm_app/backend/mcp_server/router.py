@@ -1,32 +1,84 @@
 """
 MCP Router
 
-This exposes a single FastAPI endpoint:
+This exposes the FastAPI endpoints:
 
-    POST /mcp/invoke
+    POST /mcp/invoke             → run one tool, return JSON
+    POST /mcp/batch              → run many tool calls concurrently, return JSON
+    POST /mcp/workflow/stream    → run the 4-agent workflow, stream SSE events
+    POST /mcp/jobs               → queue a workflow run, return a job id (202)
+    GET  /mcp/jobs/{job_id}      → job status, per-agent progress, result
+    GET  /mcp/jobs/{job_id}/events → job events as SSE (replayed, then live)
+    POST /mcp/jobs/{job_id}/retry  → re-queue a failed job (resumes from the
+                                     agents that had already finished)
 
 Frontend or internal backend services call this endpoint with:
 {
-    "tool": "workflow" | "chat" | "compare" | "judge",
-    "model": "<model_id>",
+    "tool": "workflow" | "chat" | "compare" | "judge" | "search" | "evaluate",
+    "model": "<model_id>" | "auto",   # "auto": routed by backend/model_router.py
     "input": "<user input>",
     "extra": {...}            # Optional extra parameters
 }
 
 The router:
 1. Validates the tool name
-2. Looks up the function in TOOL_REGISTRY
-3. Passes the payload to the tool
-4. Returns the tool output as JSON
+2. Dispatches the payload through backend/mcp_server/dispatch.py
+   (native async tools are awaited, sync-only tools run in a worker pool,
+   per-tool / per-model concurrency limits apply)
+3. Returns the tool output as JSON (503 if the limits stay saturated;
+   LLM failures map to 429 / 502 / 503 / 504 with Retry-After when known)
+
+The batch endpoint accepts {"calls": [<invoke body>, ...], "max_parallel": N}.
+Identical calls inside one batch run once; results come back in request
+order, each as {"ok": true, "result": ...} or {"ok": false, "status", "error"}.
+max_parallel is capped by MCP_BATCH_MAX_PARALLEL and, per tool, by
+MCP_TOOL_CONCURRENCY; batch calls wait for a slot up to
+MCP_BATCH_QUEUE_TIMEOUT_SECONDS (no limit by default) instead of failing
+with 503 after the interactive queue timeout.
+
+The streaming endpoint accepts the same request body as /mcp/invoke and emits
+Server-Sent Events:
+    routing     {"model", "tier", ...}   (first, only for model "auto")
+    node_start  {"node", "key"}
+    token       {"node", "key", "text"}
+    node_end    {"node", "key", "output"}
+    done        {"result": {...same shape as the workflow tool...}}
+    error       {"detail", "status"}
+
+Job events use the same names: status {"status"}, node_end, done, error.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import math
+import time
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 
-from backend.mcp_server.tools import TOOL_REGISTRY
+from backend.config import (
+    DEFAULT_CHAT_MODEL,
+    MCP_BATCH_MAX_CALLS,
+    MCP_BATCH_MAX_PARALLEL,
+    MCP_BATCH_QUEUE_TIMEOUT_SECONDS,
+    MCP_QUEUE_TIMEOUT_SECONDS,
+    MCP_TOOL_CONCURRENCY,
+)
+from backend.jobs import FAILED, WORKFLOW_JOBS, JobQueueFullError
+from backend.langgraph_pipeline import DEFAULT_WORKFLOW_GRAPH, astream_workflow_events, check_workflow_graph
+from backend.llm_client import LLMError
+from backend.mcp_server.dispatch import (
+    ToolBusyError,
+    available_tools,
+    concurrency_slot,
+    dispatch_tool,
+)
+from backend.model_router import ModelRoutingError, route_payload
+from backend.sse import SSE_HEADERS, format_sse
 
 
 # ============================================================
@@ -40,6 +92,18 @@ class MCPInvokeRequest(BaseModel):
     extra: Optional[Dict[str, Any]] = None
 
 
+class MCPBatchRequest(BaseModel):
+    calls: List[MCPInvokeRequest]
+    max_parallel: Optional[int] = None   # default / max: MCP_BATCH_MAX_PARALLEL
+
+
+class MCPJobRequest(BaseModel):
+    tool: str = "workflow"               # only the workflow runs as a job
+    model: Optional[str] = None
+    input: Optional[Any] = None
+    extra: Optional[Dict[str, Any]] = None
+
+
 # ============================================================
 # MCP Router
 # ============================================================
@@ -47,33 +111,66 @@ class MCPInvokeRequest(BaseModel):
 router = APIRouter(prefix="/mcp", tags=["MCP"])
 
 
+def _payload(req: MCPInvokeRequest) -> Dict[str, Any]:
+    return {
+        "tool": req.tool,
+        "model": req.model,
+        "input": req.input,
+        "extra": req.extra or {}
+    }
+
+
 @router.post("/invoke")
 async def invoke_mcp(req: MCPInvokeRequest):
     """
     Main MCP entrypoint.
     """
 
-    tool_name = req.tool
+    return await _invoke(req.tool, _payload(req))
+
+
+def llm_http_error(e: LLMError) -> HTTPException:
+    """HTTP error for a failed LLM call (status chosen by the error type)."""
+    headers = None
+    if e.retry_after is not None:
+        headers = {"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+    return HTTPException(status_code=e.status_code, detail=str(e), headers=headers)
+
+
+def routing_http_error(e: ModelRoutingError) -> HTTPException:
+    """HTTP error for a model "auto" request that could not be routed."""
+    return HTTPException(status_code=503, detail=str(e))
+
+
+def stream_error(e: Exception, what: str) -> Dict[str, Any]:
+    """Payload of the in-band SSE "error" event (status as _invoke would answer)."""
+    if isinstance(e, LLMError):
+        status = e.status_code
+    elif isinstance(e, (ToolBusyError, ModelRoutingError)):
+        status = 503
+    elif isinstance(e, ValueError):
+        status = 400
+    else:
+        status = 500
+    return {"detail": f"{what} failed: {e}", "status": status}
+
 
-    if tool_name not in TOOL_REGISTRY:
+async def _invoke(
+    tool_name: str,
+    payload: Dict[str, Any],
+    queue_timeout: Optional[float] = MCP_QUEUE_TIMEOUT_SECONDS,
+) -> Dict[str, Any]:
+    """Validate, dispatch and normalize one tool call (errors → HTTPException)."""
+
+    if tool_name not in available_tools():
         raise HTTPException(
             status_code=400,
             detail=f"Unknown MCP tool '{tool_name}'. "
-                   f"Available tools: {list(TOOL_REGISTRY.keys())}"
+                   f"Available tools: {available_tools()}"
         )
 
-    tool_fn = TOOL_REGISTRY[tool_name]
-
-    # Prepare payload
-    payload = {
-        "tool": tool_name,
-        "model": req.model,
-        "input": req.input,
-        "extra": req.extra or {}
-    }
-
     try:
-        result = tool_fn(payload)
+        result = await dispatch_tool(tool_name, payload, queue_timeout)
 
         # Tool functions may return dicts, strings, or objects.
         # Ensure we always return a clean JSON-friendly dict.
@@ -82,9 +179,223 @@ async def invoke_mcp(req: MCPInvokeRequest):
         else:
             return {"result": result}
 
+    except ToolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+    except LLMError as e:
+        raise llm_http_error(e)
+
+    except ModelRoutingError as e:
+        raise routing_http_error(e)
+
+    except ValueError as e:
+        # Invalid tool arguments (e.g. a model outside ALLOWED_MODELS)
+        raise HTTPException(status_code=400, detail=str(e))
+
     except Exception as e:
         # Surface errors cleanly
         raise HTTPException(
             status_code=500,
             detail=f"MCP tool '{tool_name}' execution failed: {e}"
         )
+
+
+# ============================================================
+# Batch invocation
+# ============================================================
+
+@router.post("/batch")
+async def invoke_mcp_batch(req: MCPBatchRequest):
+    """
+    Run many tool calls concurrently (at most `max_parallel` at once, and
+    never more of one tool than its MCP_TOOL_CONCURRENCY limit).
+
+    Identical calls (same tool, model, input and extra) are executed once
+    and their result is shared. One failing call never fails the batch.
+    Calls wait for free concurrency slots rather than failing with 503.
+    """
+
+    if len(req.calls) > MCP_BATCH_MAX_CALLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(req.calls)} calls (max {MCP_BATCH_MAX_CALLS})."
+        )
+
+    started = time.perf_counter()
+    payloads = [_payload(call) for call in req.calls]
+
+    # Deduplicate: canonical JSON of the payload → index of its first occurrence
+    first_index: Dict[str, int] = {}
+    owners: List[int] = []
+    for i, payload in enumerate(payloads):
+        key = json.dumps(payload, sort_keys=True, default=str)
+        owners.append(first_index.setdefault(key, i))
+
+    unique = sorted(set(owners))
+    max_parallel = max(1, min(req.max_parallel or MCP_BATCH_MAX_PARALLEL, MCP_BATCH_MAX_PARALLEL))
+    limit = asyncio.Semaphore(max_parallel)
+    # Per-tool share of the batch, so a batch never queues more calls of a tool than it can run
+    tool_limits = {
+        tool: asyncio.Semaphore(max(1, min(max_parallel, MCP_TOOL_CONCURRENCY.get(tool, max_parallel))))
+        for tool in {payloads[i]["tool"] for i in unique}
+    }
+    queue_timeout = MCP_BATCH_QUEUE_TIMEOUT_SECONDS or None
+
+    async def run_one(i: int) -> Dict[str, Any]:
+        # Tool slot first, so calls waiting on a busy tool do not hold batch slots
+        async with tool_limits[payloads[i]["tool"]], limit:
+            try:
+                result = await _invoke(payloads[i]["tool"], payloads[i], queue_timeout)
+                return {"ok": True, "result": result}
+            except HTTPException as e:
+                return {"ok": False, "status": e.status_code, "error": e.detail}
+
+    outcomes = dict(zip(unique, await asyncio.gather(*(run_one(i) for i in unique))))
+
+    results = []
+    for i, owner in enumerate(owners):
+        item = {"index": i, "tool": payloads[i]["tool"], **outcomes[owner]}
+        if owner != i:
+            item["duplicate_of"] = owner
+        results.append(item)
+
+    return {
+        "results": results,
+        "stats": {
+            "calls": len(payloads),
+            "executed": len(unique),
+            "succeeded": sum(1 for r in results if r["ok"]),
+            "failed": sum(1 for r in results if not r["ok"]),
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        },
+    }
+
+
+# ============================================================
+# Streaming workflow (Server-Sent Events)
+# ============================================================
+
+@router.post("/workflow/stream")
+async def stream_workflow(req: MCPInvokeRequest):
+    """
+    Run the 4-agent workflow and stream progress as Server-Sent Events,
+    so the UI can fill each agent card while the pipeline is still running.
+    """
+
+    question = req.input or ""
+    try:
+        payload, decision = route_payload("workflow", {"model": req.model or DEFAULT_CHAT_MODEL, "input": question})
+    except ModelRoutingError as e:
+        raise routing_http_error(e)
+    model = payload["model"]
+    graph_name = (req.extra or {}).get("graph") or DEFAULT_WORKFLOW_GRAPH
+    try:
+        # Before the response starts, so an unknown graph is a real 400
+        check_workflow_graph(graph_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def event_stream() -> AsyncIterator[str]:
+        if decision is not None:
+            yield format_sse("routing", decision.to_dict())
+        try:
+            async with concurrency_slot("workflow", {"model": model}):
+                async for ev in astream_workflow_events(question, model=model, graph_name=graph_name):
+                    data = {k: v for k, v in ev.items() if k != "event"}
+                    yield format_sse(ev["event"], data)
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield format_sse("error", stream_error(e, "Workflow stream"))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+# ============================================================
+# Background workflow jobs
+# ============================================================
+
+@router.post("/jobs", status_code=202)
+async def submit_job(req: MCPJobRequest):
+    """
+    Queue a workflow run and return immediately with its job id.
+    Poll /mcp/jobs/{job_id} or subscribe to /mcp/jobs/{job_id}/events.
+    """
+
+    if req.tool != "workflow":
+        raise HTTPException(status_code=400, detail="Only the 'workflow' tool can run as a job.")
+
+    graph_name = (req.extra or {}).get("graph") or DEFAULT_WORKFLOW_GRAPH
+    try:
+        payload, _ = route_payload("workflow", {"model": req.model or DEFAULT_CHAT_MODEL, "input": req.input or ""})
+    except ModelRoutingError as e:
+        raise routing_http_error(e)
+
+    try:
+        job = WORKFLOW_JOBS.submit(
+            question=req.input or "",
+            model=payload["model"],
+            graph=graph_name,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"{router.prefix}/jobs/{job.job_id}",
+        "events_url": f"{router.prefix}/jobs/{job.job_id}/events",
+    }
+
+
+def _job_or_404(job_id: str):
+    job = WORKFLOW_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job '{job_id}'.")
+    return job
+
+
+@router.post("/jobs/{job_id}/retry", status_code=202)
+async def retry_job(job_id: str):
+    """
+    Re-run a failed job with the same inputs as a new job. Agents that had
+    finished are served from the workflow node cache, so only the failed
+    part of the pipeline runs again.
+    """
+    failed = _job_or_404(job_id)
+    if failed.status != FAILED:
+        raise HTTPException(status_code=409, detail=f"Job '{job_id}' is {failed.status}, not failed.")
+
+    return await submit_job(MCPJobRequest(
+        model=failed.model,
+        input=failed.question,
+        extra={"graph": failed.graph},
+    ))
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Current status, per-agent progress and (when finished) result or error."""
+    return _job_or_404(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Job events as Server-Sent Events; the stream ends when the job finishes."""
+    job = _job_or_404(job_id)
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for ev in job.follow():
+            data = {k: v for k, v in ev.items() if k != "event"}
+            yield format_sse(ev["event"], data)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
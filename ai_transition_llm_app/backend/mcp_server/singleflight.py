@@ -0,0 +1,70 @@
+"""
+Single-flight request coalescing.
+
+When several callers ask for the same thing at the same time (same tool,
+model, input and extra), only the first one executes; the others await the
+same in-flight result. Once it finishes the key is released, so later calls
+execute normally (this is coalescing, not caching).
+
+The shared execution runs as its own task: if the caller that started it
+disconnects, the remaining callers still get the result.
+
+Used by:
+    backend/mcp_server/dispatch.py → dispatch_tool()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict
+
+
+def coalesce_key(tool_name: str, payload: Dict[str, Any]) -> str:
+    """Canonical key of a tool call."""
+    return json.dumps(
+        [tool_name, payload.get("model"), payload.get("input"), payload.get("extra") or {}],
+        sort_keys=True,
+        default=str,
+    )
+
+
+class SingleFlight:
+    """Coalesces concurrent async calls that share a key."""
+
+    def __init__(self):
+        # Tasks belong to an event loop, so keep in-flight calls per loop
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats_lock = threading.Lock()
+        self._stats = {"executed": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() unless a call with the same key is already in flight."""
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+
+        task = inflight.get(key)
+        if task is None:
+            task = loop.create_task(fn())
+            inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: inflight.pop(k, None))
+            self._count("executed")
+        else:
+            self._count("coalesced")
+
+        # shield(): one caller being cancelled must not cancel the shared task
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["in_flight"] = sum(len(calls) for calls in list(self._inflight.values()))
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
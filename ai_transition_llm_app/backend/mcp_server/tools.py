@@ -11,24 +11,68 @@ Each tool is a callable that receives:
 
 And returns JSON-friendly data.
 
+Every tool has a sync implementation (TOOL_REGISTRY) and a native async
+implementation (ASYNC_TOOL_REGISTRY) built on acall_llm(), except "evaluate",
+which is async-only (the dispatch layer awaits it directly).
+
+astream_chat() is the streaming variant of the chat tool (used by the
+/chatbot/stream SSE endpoint).
+
+All chat variants check the semantic answer cache
+(backend/semantic_cache.py) before calling the model: a paraphrase of a
+question already answered for the same data version and model is answered
+from the cache, suggestions included. Only answers produced without any
+session history are stored, so one conversation never leaks into another.
+
 Tools included:
-- chat        : Interactive chatbot (history + follow-up suggestions)
+- chat        : Interactive chatbot (per-session history + follow-up suggestions)
 - workflow    : Runs LangGraph 4-agent workflow
-- compare     : Compare two LLM responses
+- compare     : Compare N LLM responses concurrently (latency, TTFT, tokens)
 - judge       : Judge-LRM chooses best between two answers
+- search      : Top-k lookup over synthetic data records (no LLM call)
+- evaluate    : Batch compare + judge over a question set → leaderboard
 """
 
 from __future__ import annotations
 
+import contextvars
 import json
-from typing import Dict, Any, Optional, List
-
-from backend.llm_client import call_llm
-from backend.langgraph_pipeline import run_full_workflow
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, Any, Optional, List
+
+import asyncio
+
+from backend.chat_memory import DEFAULT_CHAT_SESSION, ChatMemoryStore
+from backend.llm_client import (
+    LLMError,
+    acall_llm,
+    acall_llm_measured,
+    call_llm,
+    call_llm_measured,
+    call_llm_stream,
+)
+from backend.data_store import DATA_STORE
+from backend.langgraph_pipeline import (
+    DEFAULT_WORKFLOW_GRAPH,
+    run_full_workflow,
+    arun_full_workflow,
+)
+from backend.prompt_profiler import compose_prompt, record_prompt
+from backend.context_render import render_records
+from backend.semantic_cache import CHAT_SEMANTIC_CACHE, SemanticHit
+from backend.search_index import get_index
 from backend.config import (
+    CHAT_CONTEXT_RECORDS,
+    SEARCH_MAX_K,
     DEFAULT_CHAT_MODEL,
+    COMPARE_MAX_MODELS,
     DEFAULT_COMPARE_MODEL,
     DEFAULT_JUDGE_MODEL,
+    EVAL_MAX_QUESTIONS,
+    EVAL_OUTPUT_DIR,
     ALLOWED_MODELS,
 )
 
@@ -37,33 +81,43 @@ from backend.config import (
 # MEMORY STORE FOR THE CHATBOT
 # ============================================================
 
-CHAT_HISTORY: List[Dict[str, str]] = []
+# Per-session, token-bounded history (see backend/chat_memory.py)
+CHAT_MEMORY = ChatMemoryStore()
+
+
+def chat_session_id(payload: Dict[str, Any]) -> str:
+    """Session id from payload.extra.session_id (shared default otherwise)."""
+    extra = payload.get("extra") or {}
+    return str(extra.get("session_id") or DEFAULT_CHAT_SESSION)
 
 
 # ============================================================
 # Helper → build follow-up question suggestion prompt
 # ============================================================
 
-def generate_followup_questions(model: str, user_msg: str, bot_msg: str) -> List[str]:
-    """Generates follow-up questions from the LLM."""
-    suggest_prompt = f"""
-You are assisting in an IT Transition Chatbot.
+FOLLOWUP_SYSTEM_PROMPT = "You generate follow-up questions only."
 
-Given:
-User said: {user_msg}
-Assistant answered: {bot_msg}
+FALLBACK_FOLLOWUP_QUESTIONS = [
+    "What are the top risks I should focus on next?",
+    "Which dependencies may delay the transition?",
+    "What metrics should I track weekly?"
+]
 
-Suggest 3 meaningful follow-up questions that the user may ask next.
-Return ONLY a JSON list of strings: ["q1", "q2", "q3"].
-"""
 
-    raw = call_llm(
-        model=model,
-        prompt=suggest_prompt,
-        temperature=0.1,
-        system_prompt="You generate follow-up questions only."
-    )
+def build_followup_prompt(user_msg: str, bot_msg: str) -> str:
+    """Prompt asking the LLM for follow-up question suggestions."""
+    return compose_prompt("followup", [
+        ("instructions", "You are assisting in an IT Transition Chatbot."),
+        ("exchange", f"""Given:
+User said: {user_msg}
+Assistant answered: {bot_msg}"""),
+        ("output_format", """Suggest 3 meaningful follow-up questions that the user may ask next.
+Return ONLY a JSON list of strings: ["q1", "q2", "q3"]."""),
+    ])
+
 
+def parse_followup_questions(raw: str) -> List[str]:
+    """Parse the JSON list returned by the LLM, with a static fallback."""
     try:
         data = json.loads(raw)
         if isinstance(data, list):
@@ -72,57 +126,126 @@ Return ONLY a JSON list of strings: ["q1", "q2", "q3"].
         pass
 
     # fallback
-    return [
-        "What are the top risks I should focus on next?",
-        "Which dependencies may delay the transition?",
-        "What metrics should I track weekly?"
-    ]
+    return list(FALLBACK_FOLLOWUP_QUESTIONS)
+
+
+def generate_followup_questions(model: str, user_msg: str, bot_msg: str) -> List[str]:
+    """Generates follow-up questions from the LLM (static fallback on failure)."""
+    try:
+        raw = call_llm(
+            model=model,
+            prompt=build_followup_prompt(user_msg, bot_msg),
+            temperature=0.1,
+            system_prompt=FOLLOWUP_SYSTEM_PROMPT
+        )
+    except LLMError:
+        # Suggestions are optional: never fail an answered chat turn over them
+        return list(FALLBACK_FOLLOWUP_QUESTIONS)
+    return parse_followup_questions(raw)
+
+
+async def agenerate_followup_questions(model: str, user_msg: str, bot_msg: str) -> List[str]:
+    """Async version of generate_followup_questions()."""
+    try:
+        raw = await acall_llm(
+            model=model,
+            prompt=build_followup_prompt(user_msg, bot_msg),
+            temperature=0.1,
+            system_prompt=FOLLOWUP_SYSTEM_PROMPT
+        )
+    except LLMError:
+        return list(FALLBACK_FOLLOWUP_QUESTIONS)
+    return parse_followup_questions(raw)
 
 
 # ============================================================
 # CHAT TOOL
 # ============================================================
 
+CHAT_SYSTEM_PROMPT = "You are an expert in IT Transition, KT, and Risk Management."
+
+
+def build_chat_prompt(user_message: str, session_id: str = DEFAULT_CHAT_SESSION) -> str:
+    """Build the chat prompt from the session's conversation + new message."""
+    history_text = CHAT_MEMORY.history_text(session_id)
+
+    records_text = ""
+    if CHAT_CONTEXT_RECORDS > 0:
+        data = DATA_STORE.snapshot().data
+        hits = get_index(data).search(user_message, k=CHAT_CONTEXT_RECORDS)
+        records_text = render_records(data, [hit.record for hit in hits])
+
+    return compose_prompt("chat", [
+        ("instructions", "You are an IT Transition & Risk Tracking Chatbot."),
+        ("output_format", "Respond concisely, but with actionable insights."),
+        ("history", f"""Conversation so far:
+{history_text}"""),
+        ("records", f"""Relevant project records:
+{records_text or "(none)"}"""),
+        ("question", f"""New user message:
+{user_message}"""),
+    ])
+
+
+def remember_chat_turn(user_message: str, bot_reply: str, session_id: str = DEFAULT_CHAT_SESSION) -> None:
+    """Append one user/assistant exchange to the session's chat memory."""
+    CHAT_MEMORY.append_turn(user_message, bot_reply, session_id=session_id)
+
+
+def _semantic_scope(model: str) -> tuple:
+    """Semantic cache scope: answers are only reused for the same data and model."""
+    return (DATA_STORE.snapshot().version, model)
+
+
+def _cached_chat_reply(user_message: str, model: str, session_id: str) -> Optional[SemanticHit]:
+    """Semantic cache hit for `user_message` (recorded in the session's memory), if any."""
+    in_conversation = not _shareable_reply(session_id)
+    hit = CHAT_SEMANTIC_CACHE.lookup(user_message, _semantic_scope(model), in_conversation)
+    if hit is not None:
+        remember_chat_turn(user_message, hit.answer, session_id)
+    return hit
+
+
+def _shareable_reply(session_id: str) -> bool:
+    """
+    Whether the reply about to be generated may be stored in the semantic
+    cache: only if its prompt carries no session history or summary.
+    """
+    return not CHAT_MEMORY.history_text(session_id)
+
+
 def chat_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Chatbot tool with server-side memory and suggestions.
+
+    Optional payload.extra:
+        { "session_id": "<client session id>" }
     """
 
     user_message = payload.get("input", "")
     model = payload.get("model") or DEFAULT_CHAT_MODEL
+    session_id = chat_session_id(payload)
 
-    # Build conversation context
-    history_text = ""
-    for msg in CHAT_HISTORY:
-        role = "User" if msg["role"] == "user" else "Assistant"
-        history_text += f"{role}: {msg['text']}\n"
-
-    prompt = f"""
-You are an IT Transition & Risk Tracking Chatbot.
-
-Conversation so far:
-{history_text}
-
-New user message:
-{user_message}
-
-Respond concisely, but with actionable insights.
-"""
+    hit = _cached_chat_reply(user_message, model, session_id)
+    if hit is not None:
+        return {"answer": hit.answer, "suggestions": hit.suggestions, "semantic_cache": hit.info()}
+    shareable = _shareable_reply(session_id)
 
     # Main bot response
     bot_reply = call_llm(
         model=model,
-        prompt=prompt,
+        prompt=build_chat_prompt(user_message, session_id),
         temperature=0.2,
-        system_prompt="You are an expert in IT Transition, KT, and Risk Management."
+        system_prompt=CHAT_SYSTEM_PROMPT
     )
 
     # Update memory
-    CHAT_HISTORY.append({"role": "user", "text": user_message})
-    CHAT_HISTORY.append({"role": "assistant", "text": bot_reply})
+    remember_chat_turn(user_message, bot_reply, session_id)
 
     # Generate follow-up questions
     suggestions = generate_followup_questions(model, user_message, bot_reply)
+    if shareable:
+        CHAT_SEMANTIC_CACHE.store(user_message, _semantic_scope(model), bot_reply, suggestions)
 
     return {
         "answer": bot_reply,
@@ -130,19 +253,133 @@ Respond concisely, but with actionable insights.
     }
 
 
+async def achat_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async version of chat_tool().
+    """
+
+    user_message = payload.get("input", "")
+    model = payload.get("model") or DEFAULT_CHAT_MODEL
+    session_id = chat_session_id(payload)
+
+    hit = _cached_chat_reply(user_message, model, session_id)
+    if hit is not None:
+        return {"answer": hit.answer, "suggestions": hit.suggestions, "semantic_cache": hit.info()}
+    shareable = _shareable_reply(session_id)
+
+    bot_reply = await acall_llm(
+        model=model,
+        prompt=build_chat_prompt(user_message, session_id),
+        temperature=0.2,
+        system_prompt=CHAT_SYSTEM_PROMPT
+    )
+
+    remember_chat_turn(user_message, bot_reply, session_id)
+
+    suggestions = await agenerate_followup_questions(model, user_message, bot_reply)
+    if shareable:
+        CHAT_SEMANTIC_CACHE.store(user_message, _semantic_scope(model), bot_reply, suggestions)
+
+    return {
+        "answer": bot_reply,
+        "suggestions": suggestions,
+    }
+
+
+async def astream_chat(payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming chat: yields answer tokens as soon as the model produces them.
+
+    Yields dicts shaped like:
+        {"event": "token",       "text": "..."}
+        {"event": "answer",      "answer": "<full answer>"}
+        {"event": "suggestions", "suggestions": ["q1", "q2", "q3"]}
+
+    The follow-up suggestion call is started the moment the answer is
+    complete and runs in the background while the "answer" event is
+    delivered, so it never delays the answer itself.
+
+    A semantic cache hit is delivered as a single token event, and its
+    "answer" event carries "semantic_cache" (matched question, similarity).
+    """
+
+    user_message = payload.get("input", "")
+    model = payload.get("model") or DEFAULT_CHAT_MODEL
+    session_id = chat_session_id(payload)
+
+    hit = _cached_chat_reply(user_message, model, session_id)
+    if hit is not None:
+        yield {"event": "token", "text": hit.answer}
+        yield {"event": "answer", "answer": hit.answer, "semantic_cache": hit.info()}
+        yield {"event": "suggestions", "suggestions": hit.suggestions}
+        return
+    shareable = _shareable_reply(session_id)
+
+    chunks: List[str] = []
+    async for chunk in call_llm_stream(
+        model=model,
+        prompt=build_chat_prompt(user_message, session_id),
+        temperature=0.2,
+        system_prompt=CHAT_SYSTEM_PROMPT,
+    ):
+        chunks.append(chunk)
+        yield {"event": "token", "text": chunk}
+
+    bot_reply = "".join(chunks)
+    remember_chat_turn(user_message, bot_reply, session_id)
+
+    suggestions_task = asyncio.create_task(
+        agenerate_followup_questions(model, user_message, bot_reply)
+    )
+
+    try:
+        yield {"event": "answer", "answer": bot_reply}
+        suggestions = await suggestions_task
+        if shareable:
+            CHAT_SEMANTIC_CACHE.store(user_message, _semantic_scope(model), bot_reply, suggestions)
+        yield {"event": "suggestions", "suggestions": suggestions}
+    finally:
+        # Client went away before the suggestions were delivered
+        if not suggestions_task.done():
+            suggestions_task.cancel()
+
+
 # ============================================================
 # WORKFLOW TOOL (LangGraph Multi-Agent)
 # ============================================================
 
 def workflow_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Runs LangGraph pipeline: Project → Risk → Comms → Supervisor.
+    Runs LangGraph pipeline: Project → (Risk ∥ Comms) → Supervisor.
+
+    Optional payload.extra:
+        { "graph": "<registered graph name>" }   # default: "default"
     """
 
     user_input = payload.get("input", "")
     model = payload.get("model") or DEFAULT_CHAT_MODEL
+    graph_name = payload.get("extra", {}).get("graph") or DEFAULT_WORKFLOW_GRAPH
 
-    results = run_full_workflow(user_input, model=model)
+    results = run_full_workflow(user_input, model=model, graph_name=graph_name)
+
+    return {
+        "project_agent": results["project_agent"],
+        "risk_agent": results["risk_agent"],
+        "comms_agent": results["comms_agent"],
+        "supervisor": results["supervisor"],
+    }
+
+
+async def aworkflow_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async version of workflow_tool().
+    """
+
+    user_input = payload.get("input", "")
+    model = payload.get("model") or DEFAULT_CHAT_MODEL
+    graph_name = payload.get("extra", {}).get("graph") or DEFAULT_WORKFLOW_GRAPH
+
+    results = await arun_full_workflow(user_input, model=model, graph_name=graph_name)
 
     return {
         "project_agent": results["project_agent"],
@@ -153,40 +390,173 @@ def workflow_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 
 # ============================================================
-# COMPARE TOOL (Two LLM Responses)
+# COMPARE TOOL (N LLM Responses, with latency + token metrics)
 # ============================================================
 
+def resolve_model(name: str) -> str:
+    """Model id for a model id or ALLOWED_MODELS display name; ValueError otherwise."""
+    model = ALLOWED_MODELS.get(name, name)
+    if model not in ALLOWED_MODELS.values():
+        raise ValueError(f"Model '{name}' is not in ALLOWED_MODELS.")
+    return model
+
+
+def compare_models(payload: Dict[str, Any]) -> List[str]:
+    """
+    Models to compare: extra.models if given, else [model, extra.model2].
+
+    extra.models must be a list of model ids or display names from
+    ALLOWED_MODELS (anything else raises ValueError); repeated models are
+    compared once, in the order first given.
+    """
+    extra = payload.get("extra") or {}
+    models = extra.get("models")
+    if models:
+        if not isinstance(models, list) or not all(isinstance(name, str) for name in models):
+            raise ValueError("extra.models must be a list of model names.")
+        requested = list(dict.fromkeys(resolve_model(name) for name in models))
+    else:
+        requested = [
+            resolve_model(payload.get("model") or DEFAULT_COMPARE_MODEL),
+            resolve_model(extra.get("model2") or DEFAULT_COMPARE_MODEL),
+        ]
+
+    if len(requested) > COMPARE_MAX_MODELS:
+        raise ValueError(f"Too many models to compare: {len(requested)} (max {COMPARE_MAX_MODELS}).")
+
+    return requested
+
+
+def _failed_measurement(model: str, error: LLMError) -> Dict[str, Any]:
+    return {"model": model, "answer": None, "error": str(error), "status": error.status_code}
+
+
+def _compare_result(question: str, results: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+    """
+    Shape the compare output. The first two results are also exposed under
+    the original model_1/model_2/answer_1/answer_2 keys.
+    """
+    ok = [r for r in results if r.get("answer") is not None]
+    output: Dict[str, Any] = {
+        "question": question,
+        "results": results,
+        "wall_time_s": round(time.perf_counter() - started, 3),
+        "fastest_model": min(ok, key=lambda r: r["latency_s"])["model"] if ok else None,
+        "fastest_first_token_model": min(
+            (r for r in ok if r["ttft_s"] is not None), key=lambda r: r["ttft_s"], default={}
+        ).get("model"),
+    }
+    for i, r in enumerate(results[:2], start=1):
+        output[f"model_{i}"] = r["model"]
+        output[f"answer_{i}"] = r["answer"] if r["answer"] is not None else f"[{r['error']}]"
+    return output
+
+
 def compare_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Compare outputs of two different LLMs on the same input.
+    Compare outputs of several LLMs on the same input, run concurrently.
     Expected extra payload:
         {
             "model": "<model1>",
             "extra": {
-                "model2": "<model2>"
+                "model2": "<model2>"                 # two-model form, or
+                "models": ["<m1>", "<m2>", ...]     # any number of models
             }
         }
+
+    Each result carries the answer plus latency_s, ttft_s, prompt_tokens,
+    completion_tokens and tokens_per_s. Calls bypass the response cache so
+    timings are real. A failing model yields an "error" entry instead of
+    failing the whole comparison.
     """
 
     question = payload.get("input", "")
-    model1 = payload.get("model") or DEFAULT_COMPARE_MODEL
-    model2 = payload.get("extra", {}).get("model2") or DEFAULT_COMPARE_MODEL
+    models = compare_models(payload)
+    # Each model gets the raw question; only its size is recorded
+    prompt = record_prompt("compare", question, [("question", question)])
+    started = time.perf_counter()
 
-    ans1 = call_llm(model1, prompt=question)
-    ans2 = call_llm(model2, prompt=question)
+    def measure(model: str) -> Dict[str, Any]:
+        try:
+            return call_llm_measured(model, prompt=prompt)
+        except LLMError as e:
+            return _failed_measurement(model, e)
 
-    return {
-        "model_1": model1,
-        "model_2": model2,
-        "answer_1": ans1,
-        "answer_2": ans2,
-    }
+    # Each call runs in a copy of this context so trace spans / profiling follow it
+    with ThreadPoolExecutor(max_workers=len(models), thread_name_prefix="compare") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, measure, model) for model in models]
+        results = [f.result() for f in futures]
+
+    return _compare_result(question, results, started)
+
+
+async def acompare_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async version of compare_tool(). All models are queried concurrently.
+    """
+
+    question = payload.get("input", "")
+    models = compare_models(payload)
+    # Each model gets the raw question; only its size is recorded
+    prompt = record_prompt("compare", question, [("question", question)])
+    started = time.perf_counter()
+
+    async def measure(model: str) -> Dict[str, Any]:
+        try:
+            return await acall_llm_measured(model, prompt=prompt)
+        except LLMError as e:
+            return _failed_measurement(model, e)
+
+    results = await asyncio.gather(*(measure(model) for model in models))
+
+    return _compare_result(question, list(results), started)
 
 
 # ============================================================
 # JUDGE TOOL (Which LLM Response is Better)
 # ============================================================
 
+JUDGE_SYSTEM_PROMPT = "You are an expert LLM Judge for IT Transition."
+
+
+def build_judge_prompt(question: str, ans1: str, ans2: str) -> str:
+    """Prompt asking the judge model to pick the better of two answers."""
+    return compose_prompt("judge", [
+        ("instructions", "You are a Senior IT Transition Architect."),
+        ("question", f"""Question:
+{question}"""),
+        ("answer_a", f"""Answer A:
+{ans1}"""),
+        ("answer_b", f"""Answer B:
+{ans2}"""),
+        ("output_format", """Compare A and B across:
+- Relevance to transition
+- Risk identification quality
+- Clarity & depth
+- Actionability
+- Alignment with transition best practices
+
+Return:
+1. A short comparison
+2. A final verdict strictly in format: "Winner: A" or "Winner: B\""""),
+    ])
+
+
+_VERDICT_RE = re.compile(r"winner\W*(?:is\W*)?(answer\s+)?\b(a|b|tie)\b", re.IGNORECASE)
+
+
+def parse_verdict(text: str) -> Optional[str]:
+    """
+    Structured winner from a judge response: "A", "B", "tie" or None when
+    no verdict line can be found. The last verdict in the text wins.
+    """
+    matches = _VERDICT_RE.findall(text or "")
+    if not matches:
+        return None
+    winner = matches[-1][1].lower()
+    return "tie" if winner == "tie" else winner.upper()
+
+
 def judge_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Judge which LLM response is more appropriate.
@@ -204,42 +574,156 @@ def judge_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
     ans1 = extra.get("answer_1", "")
     ans2 = extra.get("answer_2", "")
 
-    judge_prompt = f"""
-You are a Senior IT Transition Architect.
+    verdict = call_llm(
+        model,
+        prompt=build_judge_prompt(question, ans1, ans2),
+        temperature=0.0,
+        system_prompt=JUDGE_SYSTEM_PROMPT
+    )
 
-Question:
-{question}
+    return {
+        "comparison": verdict,
+        "winner": parse_verdict(verdict),
+    }
 
-Answer A:
-{ans1}
 
-Answer B:
-{ans2}
+async def ajudge_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async version of judge_tool().
+    """
 
-Compare A and B across:
-- Relevance to transition
-- Risk identification quality
-- Clarity & depth
-- Actionability
-- Alignment with transition best practices
+    model = payload.get("model") or DEFAULT_JUDGE_MODEL
+    question = payload.get("input", "")
+    extra = payload.get("extra", {})
 
-Return:
-1. A short comparison
-2. A final verdict strictly in format: "Winner: A" or "Winner: B"
-"""
+    ans1 = extra.get("answer_1", "")
+    ans2 = extra.get("answer_2", "")
 
-    verdict = call_llm(
+    verdict = await acall_llm(
         model,
-        prompt=judge_prompt,
+        prompt=build_judge_prompt(question, ans1, ans2),
         temperature=0.0,
-        system_prompt="You are an expert LLM Judge for IT Transition."
+        system_prompt=JUDGE_SYSTEM_PROMPT
     )
 
     return {
         "comparison": verdict,
+        "winner": parse_verdict(verdict),
     }
 
 
+# ============================================================
+# SEARCH TOOL (Synthetic data lookup, no LLM)
+# ============================================================
+
+SEARCH_FILTERS = ("source", "severity", "affected_area", "status", "risk_id")
+
+
+def _search_k(value: Any) -> int:
+    """extra.k as an int clamped to 1..SEARCH_MAX_K; ValueError if not an integer."""
+    if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"extra.k must be an integer, got {value!r}.")
+    try:
+        k = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"extra.k must be an integer, got {value!r}.") from None
+    return max(1, min(k, SEARCH_MAX_K))
+
+
+def search_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Top-k record lookup over the synthetic data index.
+    Expected payload:
+        {
+            "input": "<free text query>",          # optional
+            "extra": {
+                "k": 5,                            # 1..SEARCH_MAX_K
+                "method": "bm25" | "vector" | "hybrid",
+                "source": "risk_logs.json",        # optional filters
+                "severity": "High",
+                "affected_area": "Timeline",
+                "status": "Delayed",
+                "risk_id": "TR-002"
+            }
+        }
+    """
+
+    query = payload.get("input") or ""
+    extra = payload.get("extra") or {}
+
+    filters = {name: extra[name] for name in SEARCH_FILTERS if extra.get(name)}
+    snapshot = DATA_STORE.snapshot()
+    hits = get_index(snapshot.data).search(
+        query,
+        k=_search_k(extra.get("k", 5)),
+        method=extra.get("method", "bm25"),
+        **filters,
+    )
+
+    return {
+        "query": query,
+        "filters": filters,
+        "data_version": snapshot.version,
+        "results": [hit.to_dict() for hit in hits],
+    }
+
+
+async def asearch_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async entry point for search_tool() (in-memory lookup, never blocks long).
+    """
+    return search_tool(payload)
+
+
+# ============================================================
+# EVALUATE TOOL (batch compare + judge → leaderboard)
+# ============================================================
+
+_RUN_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+async def aevaluate_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Evaluate several models on a question set (see backend/evaluation.py).
+    Expected payload:
+        {
+            "model": "<judge model>",                # default: DEFAULT_JUDGE_MODEL
+            "input": ["question", ...],              # or [{"id", "question"}, ...]
+            "extra": {
+                "models": ["GPT-4o", "DeepSeek V3"],
+                "run_id": "weekly-2024-06"           # optional: resumable run log
+            }
+        }
+    """
+    # Imported here: backend.evaluation builds on this module's judge helpers
+    from backend.evaluation import normalize_questions, run_evaluation
+
+    extra = payload.get("extra") or {}
+    items = payload.get("input") or []
+    questions = normalize_questions(items if isinstance(items, list) else [items])
+
+    if not questions:
+        raise ValueError("No questions to evaluate.")
+    if len(questions) > EVAL_MAX_QUESTIONS:
+        raise ValueError(f"Too many questions: {len(questions)} (max {EVAL_MAX_QUESTIONS}); use the CLI.")
+    if len(extra.get("models") or []) < 2:
+        raise ValueError("extra.models must list at least two models.")
+
+    log_path = None
+    run_id = extra.get("run_id")
+    if run_id:
+        if not _RUN_ID_RE.match(run_id):
+            raise ValueError("run_id may only contain letters, digits, '-' and '_'.")
+        log_path = Path(EVAL_OUTPUT_DIR) / f"{run_id}.log.jsonl"
+
+    return await run_evaluation(
+        questions,
+        extra["models"],
+        judge_model=payload.get("model") or DEFAULT_JUDGE_MODEL,
+        log_path=log_path,
+    )
+
+
 # ============================================================
 # TOOL REGISTRY
 # ============================================================
@@ -249,4 +733,14 @@ TOOL_REGISTRY = {
     "workflow": workflow_tool,
     "compare": compare_tool,
     "judge": judge_tool,
+    "search": search_tool,
+}
+
+ASYNC_TOOL_REGISTRY = {
+    "chat": achat_tool,
+    "workflow": aworkflow_tool,
+    "compare": acompare_tool,
+    "judge": ajudge_tool,
+    "search": asearch_tool,
+    "evaluate": aevaluate_tool,
 }
@@ -0,0 +1,284 @@
+"""
+Complexity- and latency-aware model routing.
+
+Requests sent with model "auto" (config.AUTO_MODEL) are routed here instead
+of always paying for a flagship model:
+
+- classify_complexity(): a local, rule-based classifier (no LLM call) that
+  scores the request text on length, number of questions / parts, and
+  analysis or reasoning cues, and maps it to a tier: simple / moderate /
+  complex
+- each tier has an ordered list of candidate models
+  (config.MODEL_ROUTING_TIERS); simple chat turns go to fast models (GPT-4o
+  Mini), complex ones escalate to stronger or reasoning models (DeepSeek V3 /
+  R1); workflow agents never go below MODEL_ROUTING_AGENT_MIN_TIER
+- ModelStats: moving averages of latency and error rate per model, fed by
+  llm_client after every call that reaches a model. The first candidate
+  whose circuit breaker is not open (backend/llm_resilience.py), whose error
+  rate is acceptable and whose latency is within the tier's target wins;
+  if none qualifies, the one with the lowest expected latency is used
+- route_payload(): resolves "auto" in an MCP payload before concurrency
+  slots are taken, so per-model limits, traces and caches see the real
+  model; the decision is returned alongside the result as "routing"
+
+Stats are per worker process and start empty (unmeasured models are tried
+in tier order).
+
+A tier without candidate models in MODEL_ROUTING_TIERS raises
+ModelRoutingError (a server configuration problem, answered with 503).
+
+Used by:
+    backend/llm_client.py           → MODEL_STATS.observe() after each call
+    backend/mcp_server/dispatch.py  → route_payload() for /mcp/invoke, /chatbot
+    backend/mcp_server/router.py    → workflow stream + jobs
+    app.py                          → /chatbot/stream, /health
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.config import (
+    AUTO_MODEL,
+    MODEL_ROUTING_AGENT_MIN_TIER,
+    MODEL_ROUTING_EWMA_ALPHA,
+    MODEL_ROUTING_MAX_ERROR_RATE,
+    MODEL_ROUTING_STATS_TTL_SECONDS,
+    MODEL_ROUTING_TIERS,
+)
+from backend.llm_resilience import llm_resilience_stats
+from backend.observability import REGISTRY
+from backend.tokens import count_tokens
+
+TIERS = ("simple", "moderate", "complex")
+
+# Tools whose prompts are built by the workflow agents
+AGENT_TOOLS = frozenset({"workflow"})
+
+
+class ModelRoutingError(RuntimeError):
+    """Model "auto" could not be routed (a tier has no candidate models)."""
+
+
+ROUTING_DECISIONS = REGISTRY.counter(
+    "model_routing_decisions_total",
+    "Requests routed from model 'auto', by complexity tier and chosen model.",
+    ("task", "tier", "model"),
+)
+
+
+# ============================================================
+# Complexity classification
+# ============================================================
+
+# Asking for analysis / synthesis rather than a lookup
+_ANALYSIS_CUES = re.compile(
+    r"\b(compar\w*|analy[sz]\w*|assess\w*|evaluat\w*|why|root cause|impact|"
+    r"prioriti[sz]\w*|recommend\w*|mitigat\w*|strateg\w*|plan\w*|roadmap|"
+    r"trade-?offs?|pros and cons|justify|forecast\w*|readiness score)\b",
+    re.IGNORECASE,
+)
+
+# Multi-step reasoning
+_REASONING_CUES = re.compile(
+    r"\b(step[- ]by[- ]step|reason\w* through|what if|scenario\w*|calculat\w*|"
+    r"estimat\w*|quantif\w*|derive|prove|simulat\w*|optimi[sz]\w*)\b",
+    re.IGNORECASE,
+)
+
+# Greetings, acknowledgements and short lookups
+_SIMPLE_CUES = re.compile(
+    r"^\s*(hi|hello|hey|thanks|thank you|ok|okay|what is|what's|who is|who owns|"
+    r"when is|when does|list|show|status of)\b",
+    re.IGNORECASE,
+)
+
+_LIST_LINE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+", re.MULTILINE)
+
+
+@dataclass
+class Complexity:
+    tier: str
+    score: int
+    reasons: List[str] = field(default_factory=list)
+
+
+def classify_complexity(text: str) -> Complexity:
+    """Score `text` without calling a model and map the score to a tier."""
+    score = 0
+    reasons: List[str] = []
+
+    tokens = count_tokens(text)
+    if tokens >= 150:
+        score += 2
+        reasons.append(f"long ({tokens} tokens)")
+    elif tokens >= 50:
+        score += 1
+        reasons.append(f"medium length ({tokens} tokens)")
+
+    questions = text.count("?")
+    parts = len(_LIST_LINE.findall(text))
+    if questions >= 2 or parts >= 2:
+        score += 1
+        reasons.append(f"multi-part ({max(questions, parts)} parts)")
+
+    analysis = {m.lower() for m in _ANALYSIS_CUES.findall(text)}
+    if analysis:
+        score += min(len(analysis), 2)
+        reasons.append("analysis: " + ", ".join(sorted(analysis)))
+
+    reasoning = {m.lower() for m in _REASONING_CUES.findall(text)}
+    if reasoning:
+        score += 2
+        reasons.append("reasoning: " + ", ".join(sorted(reasoning)))
+
+    if _SIMPLE_CUES.match(text) and score <= 1:
+        score -= 1
+        reasons.append("simple lookup / small talk")
+
+    tier = "simple" if score <= 1 else "moderate" if score <= 3 else "complex"
+    return Complexity(tier, score, reasons)
+
+
+# ============================================================
+# Live per-model stats
+# ============================================================
+
+class ModelStats:
+    """Moving averages of latency and error rate per model."""
+
+    def __init__(self, alpha: float = MODEL_ROUTING_EWMA_ALPHA,
+                 ttl_seconds: float = MODEL_ROUTING_STATS_TTL_SECONDS):
+        self.alpha = alpha
+        self.ttl_seconds = ttl_seconds
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, model: str, seconds: float, ok: bool) -> None:
+        """Record one finished call (latency only counts for successful calls)."""
+        with self._lock:
+            s = self._stats.get(model)
+            if s is None:
+                s = self._stats[model] = {"calls": 0, "latency_s": None, "error_rate": 0.0, "updated": 0.0}
+            s["calls"] += 1
+            s["error_rate"] += self.alpha * ((0.0 if ok else 1.0) - s["error_rate"])
+            if ok:
+                s["latency_s"] = seconds if s["latency_s"] is None else (
+                    s["latency_s"] + self.alpha * (seconds - s["latency_s"])
+                )
+            s["updated"] = time.monotonic()
+
+    def get(self, model: str) -> Optional[Dict[str, Any]]:
+        """Current averages for `model`, or None if unmeasured or stale."""
+        with self._lock:
+            s = self._stats.get(model)
+            if s is None or time.monotonic() - s["updated"] > self.ttl_seconds:
+                return None
+            return dict(s)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            models = list(self._stats)
+        out = {}
+        for model in models:
+            s = self.get(model)
+            if s is not None:
+                out[model] = {
+                    "calls": s["calls"],
+                    "latency_s": round(s["latency_s"], 3) if s["latency_s"] is not None else None,
+                    "error_rate": round(s["error_rate"], 3),
+                }
+        return out
+
+
+MODEL_STATS = ModelStats()
+
+
+# ============================================================
+# Routing
+# ============================================================
+
+@dataclass
+class RoutingDecision:
+    model: str
+    task: str
+    tier: str
+    score: int
+    reasons: List[str]
+    skipped: Dict[str, str]      # candidate → why it was passed over
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _choose(candidates: Sequence[str], max_latency: Optional[float]) -> Tuple[str, Dict[str, str]]:
+    circuits = llm_resilience_stats()
+    skipped: Dict[str, str] = {}
+    usable: List[Tuple[float, str]] = []
+
+    for model in candidates:
+        if circuits.get(model, {}).get("circuit") == "open":
+            skipped[model] = "circuit open"
+            continue
+        s = MODEL_STATS.get(model)
+        if s is None:
+            return model, skipped
+        # Failed-only models have no latency yet: assume the tier's target
+        latency = s["latency_s"] if s["latency_s"] is not None else (max_latency or 0.0)
+        # Expected time to one successful answer
+        usable.append((latency / max(1.0 - s["error_rate"], 0.05), model))
+        if s["error_rate"] > MODEL_ROUTING_MAX_ERROR_RATE:
+            skipped[model] = f"error rate {s['error_rate']:.2f}"
+        elif max_latency is not None and latency > max_latency:
+            skipped[model] = f"latency {latency:.1f}s"
+        else:
+            return model, skipped
+
+    if usable:
+        # Nothing meets the targets: take the best expected time
+        return min(usable)[1], skipped
+    # Every circuit is open: the first candidate fails fast with a clear error
+    return candidates[0], skipped
+
+
+def route(text: str, task: str = "chat") -> RoutingDecision:
+    """
+    Pick a model for `text`; task "agent" applies MODEL_ROUTING_AGENT_MIN_TIER.
+
+    Raises ModelRoutingError if the chosen tier lists no models.
+    """
+    complexity = classify_complexity(text)
+    tier = complexity.tier
+    if (task == "agent" and MODEL_ROUTING_AGENT_MIN_TIER in TIERS
+            and TIERS.index(tier) < TIERS.index(MODEL_ROUTING_AGENT_MIN_TIER)):
+        tier = MODEL_ROUTING_AGENT_MIN_TIER
+
+    config = MODEL_ROUTING_TIERS.get(tier) or {}
+    if not config.get("models"):
+        raise ModelRoutingError(
+            f"Model 'auto' cannot be routed: MODEL_ROUTING_TIERS has no models for tier '{tier}'."
+        )
+    model, skipped = _choose(config["models"], config.get("max_latency_s"))
+    ROUTING_DECISIONS.inc(task=task, tier=tier, model=model)
+    return RoutingDecision(model, task, tier, complexity.score, complexity.reasons, skipped)
+
+
+def route_payload(tool_name: str, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[RoutingDecision]]:
+    """
+    Resolve model "auto" in an MCP payload. Returns (payload, decision);
+    payloads naming a real model are returned unchanged with no decision.
+    """
+    if payload.get("model") != AUTO_MODEL:
+        return payload, None
+    task = "agent" if tool_name in AGENT_TOOLS else "chat"
+    decision = route(str(payload.get("input") or ""), task)
+    return {**payload, "model": decision.model}, decision
+
+
+def routing_stats() -> Dict[str, Any]:
+    """Live per-model averages used for routing (for /health)."""
+    return {"models": MODEL_STATS.snapshot()}
@@ -0,0 +1,347 @@
+"""
+Metrics and trace spans.
+
+- a minimal Prometheus registry (counters, histograms, callback gauges)
+  rendered in the text exposition format for GET /metrics
+- span(): times a unit of work, links it to its parent span through a
+  contextvar (so tools → nodes → LLM calls nest under the HTTP request),
+  records errors by exception class and can feed a latency histogram
+- finished spans are kept in a bounded in-memory buffer (GET /traces) and
+  optionally logged as one JSON line each (config.TRACE_LOG_SPANS)
+- TracingMiddleware: one span + metrics per HTTP request, labelled by route
+  template, timed until the response body is fully sent (so streaming
+  endpoints are measured end to end)
+
+Metrics are per worker process.
+
+Used by:
+    app.py                           → middleware, /metrics, /traces
+    backend/mcp_server/dispatch.py   → one span per MCP tool call
+    backend/langgraph_pipeline.py    → one span per workflow node
+    backend/llm_client.py            → one span per outbound LLM call
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.config import METRICS_LATENCY_BUCKETS, TRACE_BUFFER_SIZE, TRACE_LOG_SPANS
+
+logger = logging.getLogger("backend.trace")
+
+_Labels = Tuple[str, ...]
+
+
+# ============================================================
+# Metrics
+# ============================================================
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> _Labels:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[_Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_label_text(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = METRICS_LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = sorted(float(b) for b in buckets) + [math.inf]
+        self._values: Dict[_Labels, List[float]] = {}   # bucket counts..., sum, count
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for key, row in items:
+            for bound, count in zip(self.buckets, row):
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {_number(count)}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, key)} {_number(row[-2])}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, key)} {_number(row[-1])}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge whose values are read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str],
+                 read: Callable[[], Dict[_Labels, float]]):
+        super().__init__(name, help_text, labelnames)
+        self._read = read
+
+    def _samples(self) -> List[str]:
+        try:
+            items = sorted(self._read().items())
+        except Exception:
+            return []   # a broken stats source must not break the scrape
+        return [f"{self.name}{_label_text(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str],
+              read: Callable[[], Dict[_Labels, float]]) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames, read))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body is fully sent.",
+    ("method", "route", "status"),
+)
+TOOL_CALL_SECONDS = REGISTRY.histogram(
+    "mcp_tool_duration_seconds",
+    "MCP tool call latency, including time waiting for a concurrency slot.",
+    ("tool", "outcome"),
+)
+NODE_SECONDS = REGISTRY.histogram(
+    "workflow_node_duration_seconds",
+    "LangGraph workflow node latency.",
+    ("node", "cache", "outcome"),
+)
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "llm_call_duration_seconds",
+    "Outbound LLM call latency, including retries and rate-limit waits.",
+    ("model", "mode", "outcome"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total",
+    "Tokens sent to / received from LLMs (reported by the endpoint or estimated).",
+    ("model", "kind"),
+)
+
+
+# ============================================================
+# Spans
+# ============================================================
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attrs",
+                 "start", "duration", "error", "_started")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attrs = attrs
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+
+    @property
+    def outcome(self) -> str:
+        return self.error or "ok"
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 2) if self.duration is not None else None,
+            "outcome": self.outcome,
+            "attrs": self.attrs,
+        }
+
+
+_CURRENT_SPAN: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+_FINISHED_SPANS: "deque[Dict[str, Any]]" = deque(maxlen=TRACE_BUFFER_SIZE)
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT_SPAN.get()
+
+
+@contextmanager
+def span(name: str, histogram: Optional[Histogram] = None, **attrs: Any) -> Iterator[Span]:
+    """
+    Time the enclosed block as a span (child of the current span, if any).
+
+    An exception escaping the block marks the span with the exception's
+    class name and is re-raised. If `histogram` is given, the duration is
+    observed with labels taken from the span's attributes, plus "outcome".
+    """
+    s = Span(name, _CURRENT_SPAN.get(), attrs)
+    token = _CURRENT_SPAN.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = type(e).__name__
+        raise
+    finally:
+        s.duration = time.perf_counter() - s._started
+        try:
+            _CURRENT_SPAN.reset(token)
+        except ValueError:
+            _CURRENT_SPAN.set(None)   # finished in another context (e.g. generator closed elsewhere)
+        if histogram is not None:
+            labels = {**s.attrs, "outcome": s.outcome}
+            histogram.observe(s.duration, **labels)
+        _finish(s)
+
+
+def _finish(s: Span) -> None:
+    record = s.to_dict()
+    _FINISHED_SPANS.append(record)
+    if TRACE_LOG_SPANS:
+        logger.info(json.dumps(record, default=str))
+
+
+def recent_spans(limit: int = 100, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Most recent finished spans (newest first), optionally for one trace."""
+    spans = list(_FINISHED_SPANS)
+    spans.reverse()
+    if trace_id:
+        spans = [s for s in spans if s["trace_id"] == trace_id]
+    return spans[:limit]
+
+
+def record_llm_tokens(model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """Count tokens of an LLM call and attach them to the current span."""
+    LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+    LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+    s = _CURRENT_SPAN.get()
+    if s is not None:
+        s.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+
+# ============================================================
+# HTTP middleware
+# ============================================================
+
+class TracingMiddleware:
+    """ASGI middleware: one "http.request" span per request + latency metrics."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        with span("http.request", method=scope["method"], path=scope["path"]) as s:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Route template (e.g. /mcp/jobs/{job_id}) keeps label cardinality bounded
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                s.set(route=route, status=status["code"])
+                HTTP_REQUEST_SECONDS.observe(
+                    time.perf_counter() - s._started,
+                    method=scope["method"], route=route, status=status["code"],
+                )
@@ -0,0 +1,292 @@
+"""
+Prompt size and cost profiler.
+
+Shows where prompt tokens (and therefore latency and cost) go:
+
+- prompt builders assemble their prompt from named sections with
+  compose_prompt() (question, upstream agent summaries, each synthetic data
+  file, instructions, ...); prompts sent as-is (the compare question) are
+  registered with record_prompt(), which never changes their text; the
+  breakdown rides along in a contextvar
+- when the LLM call that sends that prompt finishes, llm_client reports the
+  prompt / completion tokens and the profiler records one entry: agent,
+  model, chars and tokens per section, completion tokens, cost
+  (config.MODEL_PRICING) and the trace id of the request
+- report() aggregates recorded calls per agent (average tokens per section,
+  share of the prompt) and per model, and projects what the same traffic
+  would cost on every priced model in ALLOWED_MODELS
+
+Profiling is on for every call with PROMPT_PROFILING_ENABLED=1, or for a
+single MCP call with payload.extra.profile = true (the profile is then
+returned with the tool result). Cache hits never reach the model and are
+not recorded.
+
+Used by:
+    backend/agents/*_agent.py       → build_*_prompt()
+    backend/mcp_server/tools.py     → chat / follow-up / compare / judge prompts
+    backend/llm_client.py           → record_call() after each LLM call
+    backend/mcp_server/dispatch.py  → profile_request() for extra.profile
+    app.py                          → GET /profile/prompts
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.config import (
+    ALLOWED_MODELS,
+    MODEL_PRICING,
+    PROMPT_PROFILE_HISTORY,
+    PROMPT_PROFILING_ENABLED,
+)
+from backend.observability import current_span
+from backend.tokens import count_tokens
+
+# (section name, section text)
+PromptSection = Tuple[str, str]
+
+
+# ============================================================
+# Composing prompts
+# ============================================================
+
+@dataclass(frozen=True)
+class ComposedPrompt:
+    agent: str
+    text: str
+    sections: Tuple[PromptSection, ...]
+
+
+# Last prompt composed in this context; matched against the prompt that is sent
+_LAST_PROMPT: contextvars.ContextVar[Optional[ComposedPrompt]] = contextvars.ContextVar(
+    "last_composed_prompt", default=None
+)
+
+# Records of the current profiled request (profile_request), shared by reference
+# with contexts copied from it (worker threads, LangGraph nodes)
+_REQUEST_RECORDS: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar(
+    "profiled_request_records", default=None
+)
+
+
+def compose_prompt(agent: str, sections: Sequence[PromptSection]) -> str:
+    """
+    Join prompt sections (blank line between them) and remember the
+    breakdown for the profiler. Empty sections are kept so the section
+    list is the same on every call.
+
+    Agent and chat builders list sections from most to least static
+    (instructions and output format, then data, then per-request text), so
+    consecutive prompts of one agent start with the same instructions. The
+    data sections only join that shared prefix with CONTEXT_SELECTION_ENABLED=0
+    (whole files); with selection on they hold the records chosen for the
+    question and differ between questions.
+    """
+    text = "\n" + "\n\n".join(body for _, body in sections) + "\n"
+    return record_prompt(agent, text, sections)
+
+
+def record_prompt(agent: str, text: str, sections: Sequence[PromptSection]) -> str:
+    """Remember the breakdown of a prompt built elsewhere; returns `text` unchanged."""
+    _LAST_PROMPT.set(ComposedPrompt(agent, text, tuple(sections)))
+    return text
+
+
+def profiling_active() -> bool:
+    return PROMPT_PROFILER.enabled or _REQUEST_RECORDS.get() is not None
+
+
+@contextmanager
+def profile_request() -> Iterator[List[Dict[str, Any]]]:
+    """Profile every LLM call made inside the block; yields their records."""
+    records: List[Dict[str, Any]] = []
+    token = _REQUEST_RECORDS.set(records)
+    try:
+        yield records
+    finally:
+        _REQUEST_RECORDS.reset(token)
+
+
+# ============================================================
+# Cost
+# ============================================================
+
+def token_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """USD cost of one call from MODEL_PRICING (None if the model is not priced)."""
+    price = MODEL_PRICING.get(model)
+    if not price:
+        return None
+    return (prompt_tokens * price.get("input", 0) + completion_tokens * price.get("output", 0)) / 1_000_000
+
+
+def _sum_costs(costs: Sequence[Optional[float]]) -> Optional[float]:
+    priced = [c for c in costs if c is not None]
+    return round(sum(priced), 6) if priced else None
+
+
+# ============================================================
+# Aggregation
+# ============================================================
+
+def summarize(records: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate call records per agent (with section breakdown) and per model."""
+    agents: Dict[str, Dict[str, Any]] = {}
+    models: Dict[str, Dict[str, Any]] = {}
+
+    for r in records:
+        a = agents.setdefault(r["agent"], {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                                           "costs": [], "sections": {}})
+        a["calls"] += 1
+        a["prompt_tokens"] += r["prompt_tokens"]
+        a["completion_tokens"] += r["completion_tokens"]
+        a["costs"].append(r["cost_usd"])
+        for sec in r["sections"]:
+            s = a["sections"].setdefault(sec["name"], {"chars": 0, "tokens": 0})
+            s["chars"] += sec["chars"]
+            s["tokens"] += sec["tokens"]
+
+        m = models.setdefault(r["model"], {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "costs": []})
+        m["calls"] += 1
+        m["prompt_tokens"] += r["prompt_tokens"]
+        m["completion_tokens"] += r["completion_tokens"]
+        m["costs"].append(r["cost_usd"])
+
+    agent_rows = {}
+    for name, a in agents.items():
+        section_tokens = sum(s["tokens"] for s in a["sections"].values()) or 1
+        sections = sorted(a["sections"].items(), key=lambda item: -item[1]["tokens"])
+        agent_rows[name] = {
+            "calls": a["calls"],
+            "avg_prompt_tokens": round(a["prompt_tokens"] / a["calls"], 1),
+            "avg_completion_tokens": round(a["completion_tokens"] / a["calls"], 1),
+            "cost_usd": _sum_costs(a["costs"]),
+            "sections": [
+                {
+                    "name": sec_name,
+                    "avg_chars": round(s["chars"] / a["calls"], 1),
+                    "avg_tokens": round(s["tokens"] / a["calls"], 1),
+                    "share": round(s["tokens"] / section_tokens, 3),
+                }
+                for sec_name, s in sections
+            ],
+        }
+
+    model_rows = {
+        name: {
+            "calls": m["calls"],
+            "prompt_tokens": m["prompt_tokens"],
+            "completion_tokens": m["completion_tokens"],
+            "cost_usd": _sum_costs(m["costs"]),
+        }
+        for name, m in models.items()
+    }
+
+    prompt_tokens = sum(r["prompt_tokens"] for r in records)
+    completion_tokens = sum(r["completion_tokens"] for r in records)
+    projected = {}
+    for label, model_id in ALLOWED_MODELS.items():
+        cost = token_cost(model_id, prompt_tokens, completion_tokens)
+        if cost is not None:
+            projected[label] = round(cost, 6)
+
+    return {
+        "calls": len(records),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": _sum_costs([r["cost_usd"] for r in records]),
+        "agents": agent_rows,
+        "models": model_rows,
+        # Same tokens priced on each model in ALLOWED_MODELS (priced ones only)
+        "projected_cost_usd": projected,
+    }
+
+
+# ============================================================
+# Profiler
+# ============================================================
+
+class PromptProfiler:
+    """Keeps the most recent profiled calls and aggregates them on demand."""
+
+    def __init__(self, enabled: bool = PROMPT_PROFILING_ENABLED, history: int = PROMPT_PROFILE_HISTORY):
+        self.enabled = enabled
+        self._records: "deque[Dict[str, Any]]" = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def record_call(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        prompt_tokens: int,
+        completion_tokens: int,
+        usage_source: str,
+    ) -> None:
+        """Record one finished LLM call (no-op unless profiling is active)."""
+        request_records = _REQUEST_RECORDS.get()
+        if not self.enabled and request_records is None:
+            return
+
+        composed = _LAST_PROMPT.get()
+        if composed is not None and (composed.text is prompt or composed.text == prompt):
+            agent, sections = composed.agent, list(composed.sections)
+        else:
+            agent, sections = "other", [("prompt", prompt)]
+        if system_prompt:
+            sections.insert(0, ("system_prompt", system_prompt))
+
+        span = current_span()
+        record = {
+            "at": time.time(),
+            "trace_id": span.trace_id if span else None,
+            "agent": agent,
+            "model": model,
+            "prompt_chars": len(prompt) + len(system_prompt or ""),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "usage_source": usage_source,
+            "cost_usd": token_cost(model, prompt_tokens, completion_tokens),
+            "sections": [
+                {"name": name, "chars": len(body), "tokens": count_tokens(body)}
+                for name, body in sections
+            ],
+        }
+
+        with self._lock:
+            self._records.append(record)
+        if request_records is not None:
+            request_records.append(record)
+
+    def records(
+        self,
+        agent: Optional[str] = None,
+        model: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        last: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            records = list(self._records)
+        records = [
+            r for r in records
+            if (agent is None or r["agent"] == agent)
+            and (model is None or r["model"] == model)
+            and (trace_id is None or r["trace_id"] == trace_id)
+        ]
+        return records[-last:] if last else records
+
+    def report(self, **filters: Any) -> Dict[str, Any]:
+        """summarize() over the recorded calls matching `filters` (see records())."""
+        return {"enabled": self.enabled, **summarize(self.records(**filters))}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+PROMPT_PROFILER = PromptProfiler()
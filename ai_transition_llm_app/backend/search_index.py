@@ -0,0 +1,339 @@
+"""
+In-process search index over the synthetic data files.
+
+Builds small records out of risk_logs.json, comms_logs.json, project_data.json
+and transition_examples.json (one risk, one milestone, one comms issue, ...)
+and supports:
+
+- BM25 keyword scoring over an inverted index (pure Python)
+- a vectorized TF-IDF cosine similarity path (NumPy, optional dependency)
+- exact lookups / filters by risk id, severity, affected area, status, source
+
+Everything is in memory, so lookups take well under a millisecond for this
+corpus. The index is immutable once built; get_index() caches one per data
+object, i.e. one per backend/data_store.py snapshot version.
+
+Used by:
+    backend/context_selection.py  → agent prompt context
+    backend/mcp_server/tools.py   → "search" tool + chat context
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.tokens import count_tokens
+
+
+@lru_cache(maxsize=1)
+def _numpy():
+    """NumPy, imported when the first index is built (None if not installed)."""
+    try:
+        import numpy
+    except ImportError:  # optional dependency: vector search is disabled without it
+        return None
+    return numpy
+
+
+# ============================================================
+# Records
+# ============================================================
+
+@dataclass
+class ContextRecord:
+    source: str        # file name, e.g. "risk_logs.json"
+    path: str          # location inside the file, e.g. "transition_risks[2]"
+    value: Any         # the JSON fragment itself
+    text: str          # compact rendering used in prompts
+    tokens: int        # token count of `text`
+    order: int         # position inside the file (keeps prompt order stable)
+    always: bool = False   # file-level metadata, included regardless of score
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or "
+    "our that the their this to was we what when where which who why will "
+    "with should could would do does can i me my you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords."""
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _render(path: str, value: Any) -> str:
+    return f"{path}: {json.dumps(value, ensure_ascii=False, separators=(',', ':'))}"
+
+
+def _has_nested_objects(value: Any) -> bool:
+    if isinstance(value, dict):
+        return any(isinstance(v, (dict, list)) for v in value.values())
+    return False
+
+
+def build_records(source: str, data: Any) -> List[ContextRecord]:
+    """
+    Split one synthetic data file into records:
+    - top-level scalar fields      → one "meta" record
+    - list of objects              → one record per object
+    - object of objects / lists    → one record per sub-key
+    - anything else                → one record for the whole value
+    """
+    fragments: List[tuple] = []   # (path, value, always)
+
+    if isinstance(data, dict):
+        meta = {k: v for k, v in data.items() if not isinstance(v, (dict, list))}
+        if meta:
+            fragments.append(("meta", meta, True))
+
+        for key, value in data.items():
+            if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+                fragments.extend((f"{key}[{i}]", item, False) for i, item in enumerate(value))
+            elif _has_nested_objects(value):
+                fragments.extend((f"{key}.{sub}", v, False) for sub, v in value.items())
+            elif isinstance(value, (dict, list)):
+                fragments.append((key, value, False))
+    else:
+        fragments.append(("data", data, False))
+
+    records = []
+    for order, (path, value, always) in enumerate(fragments):
+        text = _render(path, value)
+        records.append(ContextRecord(
+            source=source,
+            path=path,
+            value=value,
+            text=text,
+            tokens=count_tokens(text),
+            order=order,
+            always=always,
+        ))
+    return records
+
+
+def _field_values(value: Any, *names: str) -> List[str]:
+    """Lowercased values of the given fields of a dict record (lists flattened)."""
+    if not isinstance(value, dict):
+        return []
+    out = []
+    for name in names:
+        v = value.get(name)
+        if isinstance(v, list):
+            out.extend(str(x).lower() for x in v)
+        elif v is not None:
+            out.append(str(v).lower())
+    return out
+
+
+# ============================================================
+# Index
+# ============================================================
+
+@dataclass
+class SearchHit:
+    record: ContextRecord
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.record.source,
+            "path": self.record.path,
+            "score": round(self.score, 4),
+            "record": self.record.value,
+        }
+
+
+class SyntheticDataIndex:
+    """BM25 + TF-IDF vector index with field filters over synthetic records."""
+
+    # BM25 parameters
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, synthetic_data: Dict[str, Any]):
+        self.records: List[ContextRecord] = []
+        for source, data in synthetic_data.items():
+            self.records.extend(build_records(source, data))
+
+        doc_terms = [tokenize(r.path + " " + r.text) for r in self.records]
+        self._doc_len = [len(terms) for terms in doc_terms]
+        self._avg_len = (sum(self._doc_len) / len(self._doc_len)) if self._doc_len else 0.0
+
+        # term -> [(doc index, term frequency)]
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for i, terms in enumerate(doc_terms):
+            for term, tf in Counter(terms).items():
+                self._postings[term].append((i, tf))
+
+        n = len(self.records)
+        self._idf = {
+            term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self._postings.items()
+        }
+
+        # Field lookups
+        self._by_risk_id: Dict[str, int] = {}
+        self._by_field: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for i, r in enumerate(self.records):
+            for rid in _field_values(r.value, "risk_id"):
+                self._by_risk_id[rid] = i
+            for sev in _field_values(r.value, "severity"):
+                self._by_field[("severity", sev)].append(i)
+            for area in _field_values(r.value, "affected_areas"):
+                self._by_field[("affected_area", area)].append(i)
+            for status in _field_values(r.value, "status"):
+                self._by_field[("status", status)].append(i)
+
+        # Vectorized TF-IDF matrix (rows L2-normalized) for cosine similarity
+        self._vocab = {term: j for j, term in enumerate(self._postings)}
+        self._matrix = None
+        np = _numpy()
+        if np is not None and n:
+            matrix = np.zeros((n, len(self._vocab)), dtype=np.float32)
+            for term, postings in self._postings.items():
+                j = self._vocab[term]
+                for i, tf in postings:
+                    matrix[i, j] = (1 + math.log(tf)) * self._idf[term]
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._matrix = matrix / norms
+
+    # --------------------------------------------------------
+    # Scoring
+    # --------------------------------------------------------
+
+    def bm25_scores(self, query: str) -> List[float]:
+        """BM25 score of every record for `query` (same order as self.records)."""
+        scores = [0.0] * len(self.records)
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self._postings[term]:
+                norm = self.K1 * (1 - self.B + self.B * self._doc_len[i] / self._avg_len)
+                scores[i] += idf * tf * (self.K1 + 1) / (tf + norm)
+        return scores
+
+    def vector_scores(self, query: str) -> List[float]:
+        """TF-IDF cosine similarity of every record (falls back to BM25 without NumPy)."""
+        if self._matrix is None:
+            return self.bm25_scores(query)
+
+        np = _numpy()
+        q = np.zeros(len(self._vocab), dtype=np.float32)
+        for term, tf in Counter(tokenize(query)).items():
+            j = self._vocab.get(term)
+            if j is not None:
+                q[j] = (1 + math.log(tf)) * self._idf[term]
+        norm = np.linalg.norm(q)
+        if norm == 0:
+            return [0.0] * len(self.records)
+        return (self._matrix @ (q / norm)).tolist()
+
+    # --------------------------------------------------------
+    # Lookup
+    # --------------------------------------------------------
+
+    def get_risk(self, risk_id: str) -> Optional[ContextRecord]:
+        i = self._by_risk_id.get(risk_id.lower())
+        return self.records[i] if i is not None else None
+
+    def filter_indices(
+        self,
+        source: Optional[str] = None,
+        severity: Optional[str] = None,
+        affected_area: Optional[str] = None,
+        status: Optional[str] = None,
+        risk_id: Optional[str] = None,
+    ) -> List[int]:
+        """Indices of records matching every given filter (case-insensitive)."""
+        candidates = set(range(len(self.records)))
+        if source:
+            candidates &= {i for i, r in enumerate(self.records) if r.source == source}
+        if severity:
+            candidates &= set(self._by_field.get(("severity", severity.lower()), ()))
+        if affected_area:
+            candidates &= set(self._by_field.get(("affected_area", affected_area.lower()), ()))
+        if status:
+            candidates &= set(self._by_field.get(("status", status.lower()), ()))
+        if risk_id:
+            i = self._by_risk_id.get(risk_id.lower())
+            candidates &= {i} if i is not None else set()
+        return sorted(candidates)
+
+    def search(
+        self,
+        query: str = "",
+        k: int = 5,
+        method: str = "bm25",
+        **filters: Optional[str],
+    ) -> List[SearchHit]:
+        """
+        Top-k records for `query`, optionally restricted by filters
+        (source, severity, affected_area, status, risk_id).
+
+        method: "bm25" | "vector" | "hybrid" (mean of both, each max-normalized)
+        With an empty query, matching records are returned in file order.
+        """
+        candidates = self.filter_indices(**filters)
+
+        if not query.strip():
+            return [SearchHit(self.records[i], 0.0) for i in candidates[:k]]
+
+        if method == "bm25":
+            scores = self.bm25_scores(query)
+        elif method == "vector":
+            scores = self.vector_scores(query)
+        elif method == "hybrid":
+            scores = [
+                (a + b) / 2
+                for a, b in zip(_max_normalize(self.bm25_scores(query)),
+                                _max_normalize(self.vector_scores(query)))
+            ]
+        else:
+            raise ValueError(f"Unknown search method '{method}'. Use bm25, vector or hybrid.")
+
+        ranked = sorted((i for i in candidates if scores[i] > 0), key=lambda i: -scores[i])
+        return [SearchHit(self.records[i], scores[i]) for i in ranked[:k]]
+
+
+def _max_normalize(scores: Sequence[float]) -> List[float]:
+    top = max(scores, default=0.0)
+    return [s / top for s in scores] if top > 0 else list(scores)
+
+
+# ============================================================
+# Shared index per data object
+# ============================================================
+
+_INDEX_CACHE: Dict[int, Tuple[Dict[str, Any], SyntheticDataIndex]] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index(synthetic_data: Dict[str, Any]) -> SyntheticDataIndex:
+    """Return the (cached) index for this synthetic data dict."""
+    key = id(synthetic_data)
+    entry = _INDEX_CACHE.get(key)
+    if entry is not None and entry[0] is synthetic_data:
+        return entry[1]
+
+    with _INDEX_LOCK:
+        entry = _INDEX_CACHE.get(key)
+        if entry is None or entry[0] is not synthetic_data:
+            # Holding a reference to the data keeps its id() from being reused
+            entry = (synthetic_data, SyntheticDataIndex(synthetic_data))
+            _INDEX_CACHE[key] = entry
+            # Only the few most recent data objects are worth keeping
+            while len(_INDEX_CACHE) > 4:
+                _INDEX_CACHE.pop(next(iter(_INDEX_CACHE)))
+    return entry[1]
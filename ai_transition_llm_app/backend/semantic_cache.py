@@ -0,0 +1,376 @@
+"""
+Semantic answer cache for the chatbot.
+
+Users ask the same questions in different words ("what are the top risks",
+"biggest risks right now?"). The exact-prompt LLM cache misses those, so
+the chat tools also look the question up here first:
+
+- questions are embedded locally (no model call): words are lowercased,
+  stop / filler words dropped, common synonyms folded together ("biggest",
+  "main", "key" → "top") and plural / verb endings trimmed; the words and
+  word pairs are feature-hashed into a fixed-size, L2-normalized vector
+- cached vectors live in one preallocated NumPy matrix, so a lookup is a
+  single matrix-vector product plus masks for scope and expiry
+- entries are scoped by (data version, model): a data reload or another
+  model never reuses an answer
+- a hit needs cosine similarity >= CHAT_SEMANTIC_CACHE_THRESHOLD and the
+  same identifiers / numbers (TR-001 vs TR-002 are different questions)
+- messages that refer back to the conversation (short or pronoun-led:
+  "why is that?", "tell me more", "what about TR-002?") are not looked up
+  in a session with history and never stored, and the chat tools only
+  store answers generated without session history
+- bounded size with LRU eviction and a TTL; expired entries free their
+  slot on the next store, and scopes without entries are forgotten
+
+The cache stores the answer together with its follow-up suggestions, so a
+hit costs no LLM call at all. NumPy (requirements.txt) is imported on
+first use; without it the cache stays empty (every lookup misses) and
+config_warnings() reports it at startup.
+
+Used by:
+    backend/mcp_server/tools.py → chat tools (sync, async, streaming)
+    app.py                      → /health, /metrics
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from backend.config import (
+    CHAT_SEMANTIC_CACHE_DIM,
+    CHAT_SEMANTIC_CACHE_ENABLED,
+    CHAT_SEMANTIC_CACHE_MAX_ENTRIES,
+    CHAT_SEMANTIC_CACHE_THRESHOLD,
+    CHAT_SEMANTIC_CACHE_TTL_SECONDS,
+)
+
+
+@lru_cache(maxsize=1)
+def _numpy():
+    """NumPy, imported on the first lookup (None if not installed)."""
+    try:
+        import numpy
+    except ImportError:  # optional dependency: the cache is disabled without it
+        return None
+    return numpy
+
+
+# ============================================================
+# Local embedding
+# ============================================================
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or "
+    "our that the their this to was we what which will "
+    "with should could would do does can i me my you your "
+    # filler that does not change what is being asked
+    "please tell show give list right now currently current today any some "
+    "there here us about just also kindly "
+    # every question here is about the transition program
+    "transition project program".split()
+)
+
+# Words folded into one canonical term
+_SYNONYMS = {
+    **dict.fromkeys(["biggest", "largest", "main", "major", "key", "primary", "highest",
+                     "critical", "most", "greatest"], "top"),
+    **dict.fromkeys(["issue", "issues", "problem", "problems", "concern", "concerns",
+                     "threat", "threats"], "risk"),
+    **dict.fromkeys(["blocker", "blockers", "blocking", "blocked", "impediment",
+                     "impediments"], "block"),
+    **dict.fromkeys(["knowledge", "kt"], "kt"),
+    **dict.fromkeys(["timeline", "schedule", "deadline", "deadlines"], "timeline"),
+    **dict.fromkeys(["status", "progress", "update", "state"], "status"),
+    **dict.fromkeys(["mitigate", "mitigation", "mitigations", "fix", "fixes", "address",
+                     "resolve", "handle"], "mitigate"),
+    **dict.fromkeys(["owner", "owners", "own", "owns", "owned", "responsible", "accountable"], "owner"),
+    **dict.fromkeys(["env", "envs", "environment", "environments"], "environment"),
+    **dict.fromkeys(["doc", "docs", "documentation", "documents", "document"], "doc"),
+}
+
+# References back to the conversation: the answer depends on the history.
+# Only the opening words and a few explicit phrases count; "that" or "more"
+# inside a standalone question ("risks that block KT") do not.
+_FOLLOW_UP_LEAD_RE = re.compile(
+    r"^\W*(and|but|so|also|then|what about|how about|it|its|that|this|those|these|"
+    r"they|them|same|more|elaborate|expand|explain)\b",
+    re.IGNORECASE,
+)
+_FOLLOW_UP_PHRASE_RE = re.compile(
+    r"\b(tell me more|more detail|more details|elaborate|expand on|you (just )?(said|mentioned)|"
+    r"(mentioned|listed|said) (above|earlier|before)|the previous|the last (one|answer)|"
+    r"(of|among|from|for|about) (those|these|them|that one|this one|it)|same for|instead)\b",
+    re.IGNORECASE,
+)
+# Messages with fewer content words than this ("why?", "why is that?") only
+# make sense in context
+_FOLLOW_UP_MIN_WORDS = 2
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ies", "es", "ed", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+def normalize_words(text: str) -> List[str]:
+    """Content words of `text`, synonym-folded and stemmed."""
+    words = []
+    for word in _WORD_RE.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        words.append(_SYNONYMS.get(word) or _stem(word))
+    return words
+
+
+def identifiers(text: str) -> FrozenSet[str]:
+    """Tokens containing digits (risk ids, dates, counts); must match exactly."""
+    return frozenset(w for w in _WORD_RE.findall(text.lower()) if any(c.isdigit() for c in w))
+
+
+def is_follow_up(text: str) -> bool:
+    """True if the message refers back to earlier turns (short or pronoun-led)."""
+    if _FOLLOW_UP_LEAD_RE.match(text) or _FOLLOW_UP_PHRASE_RE.search(text):
+        return True
+    return len(normalize_words(text)) < _FOLLOW_UP_MIN_WORDS
+
+
+def _hashed(feature: str, dim: int) -> Tuple[int, float]:
+    h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return h % dim, (1.0 if h >> 63 else -1.0)
+
+
+def embed(text: str, dim: int = CHAT_SEMANTIC_CACHE_DIM):
+    """Feature-hashed bag of words + word pairs, L2-normalized (NumPy array)."""
+    np = _numpy()
+    vector = np.zeros(dim, dtype=np.float32)
+    words = sorted(set(normalize_words(text)))
+    features = [(w, 1.0) for w in words]
+    # Word pairs (in sorted order, so word order does not matter) add a little context
+    features.extend((f"{a}|{b}", 0.5) for a, b in zip(words, words[1:]))
+    for feature, weight in features:
+        j, sign = _hashed(feature, dim)
+        vector[j] += sign * weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+# ============================================================
+# Cache
+# ============================================================
+
+@dataclass
+class SemanticHit:
+    question: str            # the cached question that matched
+    answer: str
+    suggestions: List[str]
+    similarity: float
+
+    def info(self) -> Dict[str, Any]:
+        return {"matched_question": self.question, "similarity": round(self.similarity, 4)}
+
+
+@dataclass
+class _Entry:
+    question: str
+    answer: str
+    suggestions: List[str]
+    ids: FrozenSet[str]
+
+
+class SemanticCache:
+    """
+    Fixed-capacity matrix of question vectors with LRU slot reuse.
+
+    lookup() / store() take a `scope` (any hashable, e.g. (data version,
+    model)); entries only match lookups with the same scope.
+    """
+
+    # Candidates above the threshold checked for matching identifiers
+    TOP_CANDIDATES = 5
+
+    def __init__(
+        self,
+        enabled: bool = CHAT_SEMANTIC_CACHE_ENABLED,
+        threshold: float = CHAT_SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = CHAT_SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = CHAT_SEMANTIC_CACHE_TTL_SECONDS,
+        dim: int = CHAT_SEMANTIC_CACHE_DIM,
+    ):
+        self.enabled = enabled and max_entries > 0
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.dim = dim
+
+        # Allocated on the first store (NumPy is imported lazily)
+        self._vectors = None        # (max_entries, dim) float32
+        self._scopes = None         # (max_entries,) int32 scope id, -1 = free slot
+        self._created = None        # (max_entries,) float64
+        self._entries: Dict[int, _Entry] = {}
+        self._lru: "OrderedDict[int, None]" = OrderedDict()   # slot → None, oldest first
+        self._free: List[int] = []                              # unused slots
+        self._scope_ids: Dict[Hashable, int] = {}
+        self._next_scope_id = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "skipped_follow_ups": 0}
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+
+    def cacheable(self, question: str, in_conversation: bool = True) -> bool:
+        """
+        Whether `question` may be looked up / stored (enabled, standalone).
+        Follow-ups only matter `in_conversation`: without history there is
+        nothing for the message to refer back to.
+        """
+        return (self.enabled and _numpy() is not None and bool(question.strip())
+                and not (in_conversation and is_follow_up(question)))
+
+    def lookup(self, question: str, scope: Hashable, in_conversation: bool = True) -> Optional[SemanticHit]:
+        """Cached answer for a question similar to `question` in `scope`, if any."""
+        if not self.cacheable(question, in_conversation):
+            if self.enabled and in_conversation and is_follow_up(question):
+                with self._lock:
+                    self._stats["skipped_follow_ups"] += 1
+            return None
+
+        np = _numpy()
+        query = embed(question, self.dim)
+        ids = identifiers(question)
+        now = time.time()
+
+        with self._lock:
+            scope_id = self._scope_ids.get(scope)
+            if self._vectors is None or scope_id is None:
+                self._stats["misses"] += 1
+                return None
+
+            scores = self._vectors @ query
+            valid = self._scopes == scope_id
+            if self.ttl_seconds > 0:
+                valid &= (now - self._created) <= self.ttl_seconds
+            scores = np.where(valid, scores, -1.0)
+
+            k = min(self.TOP_CANDIDATES, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            for slot in sorted(top.tolist(), key=lambda i: -scores[i]):
+                score = float(scores[slot])
+                if score < self.threshold:
+                    break
+                entry = self._entries[slot]
+                if entry.ids == ids:
+                    self._lru.move_to_end(slot)
+                    self._stats["hits"] += 1
+                    return SemanticHit(entry.question, entry.answer, list(entry.suggestions), score)
+
+            self._stats["misses"] += 1
+            return None
+
+    def store(self, question: str, scope: Hashable, answer: str, suggestions: List[str]) -> None:
+        """Remember the answer + suggestions for `question` in `scope`."""
+        if not answer or not self.cacheable(question):
+            return
+
+        np = _numpy()
+        vector = embed(question, self.dim)
+        entry = _Entry(question, answer, list(suggestions), identifiers(question))
+
+        now = time.time()
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, self.dim), dtype=np.float32)
+                self._scopes = np.full(self.max_entries, -1, dtype=np.int32)
+                self._created = np.zeros(self.max_entries, dtype=np.float64)
+                self._free = list(range(self.max_entries - 1, -1, -1))
+            self._release_expired(now)
+
+            scope_id = self._scope_ids.get(scope)
+            if scope_id is None:
+                scope_id = self._scope_ids[scope] = self._next_scope_id
+                self._next_scope_id += 1
+            slot = self._duplicate_slot(vector, scope_id, entry.ids)
+            if slot is None:
+                slot = self._free_slot()
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope_id
+            self._created[slot] = now
+            self._entries[slot] = entry
+            self._lru[slot] = None
+            self._lru.move_to_end(slot)
+            self._stats["stores"] += 1
+            self._prune_scopes()
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._scopes is not None:
+                self._scopes.fill(-1)
+                self._free = list(range(self.max_entries - 1, -1, -1))
+            self._entries.clear()
+            self._lru.clear()
+            self._scope_ids.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        stats["enabled"] = self.enabled
+        stats["threshold"] = self.threshold
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    # --------------------------------------------------------
+    # Internals (caller holds self._lock)
+    # --------------------------------------------------------
+
+    def _duplicate_slot(self, vector, scope_id: int, ids: FrozenSet[str]) -> Optional[int]:
+        """Slot already holding the same question in this scope (refreshed instead of duplicated)."""
+        np = _numpy()
+        scores = np.where(self._scopes == scope_id, self._vectors @ vector, -1.0)
+        slot = int(np.argmax(scores))
+        if scores[slot] >= 0.9999 and slot in self._entries and self._entries[slot].ids == ids:
+            return slot
+        return None
+
+    def _free_slot(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot, _ = self._lru.popitem(last=False)
+        del self._entries[slot]
+        self._stats["evictions"] += 1
+        return slot
+
+    def _release_expired(self, now: float) -> None:
+        """Return the slots of expired entries to the free list."""
+        if self.ttl_seconds <= 0:
+            return
+        np = _numpy()
+        expired = np.flatnonzero((self._scopes >= 0) & ((now - self._created) > self.ttl_seconds))
+        for slot in expired.tolist():
+            self._scopes[slot] = -1
+            del self._entries[slot]
+            del self._lru[slot]
+            self._free.append(slot)
+
+    def _prune_scopes(self) -> None:
+        """Forget scopes (e.g. old data versions) that no longer have entries."""
+        np = _numpy()
+        live = set(np.unique(self._scopes[self._scopes >= 0]).tolist())
+        if len(live) < len(self._scope_ids):
+            self._scope_ids = {scope: i for scope, i in self._scope_ids.items() if i in live}
+
+
+CHAT_SEMANTIC_CACHE = SemanticCache()
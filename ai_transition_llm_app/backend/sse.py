@@ -0,0 +1,26 @@
+"""
+Server-Sent Events helpers.
+
+Used by the streaming endpoints (workflow + chat) to frame events as:
+
+    event: <name>
+    data: <json>
+
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+# Headers that stop proxies (nginx etc.) from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Serialize one SSE frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,44 @@
+"""
+Token counting helper.
+
+Uses tiktoken (cl100k_base) when it is installed, otherwise falls back to
+the usual ~4 characters per token estimate. Counts are used for prompt
+budgets (chat memory, context selection), so an approximation is fine when
+the exact tokenizer of a GenAI Lab model is not available.
+
+tiktoken is imported on the first count, not at import time, so it stays
+out of app startup.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """cl100k_base encoding, imported on the first count (None without tiktoken)."""
+    try:
+        import tiktoken
+    except ImportError:  # optional dependency
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encoding files could not be loaded (e.g. offline)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in `text` (exact with tiktoken, estimated otherwise)."""
+    if not text:
+        return 0
+
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
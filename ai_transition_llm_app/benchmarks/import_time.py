@@ -0,0 +1,117 @@
+"""
+Import-time (cold start) benchmark.
+
+Imports each module in a fresh interpreter several times and reports the
+median wall time, the slowest imports (from `python -X importtime`) and
+whether any heavy dependency was imported eagerly. Importing must stay
+cheap: workers are autoscaled and CLI batch jobs start from the same
+package.
+
+Run from ai_transition_llm_app/:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --modules app backend.evaluation --runs 7
+    python -m benchmarks.import_time --max-seconds 1.0 --out import_time.json
+
+Exit code is 1 when a module takes longer than --max-seconds (median) or
+imports one of the --lazy modules.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Must only be imported on first use (first LLM call / workflow run / search)
+DEFAULT_LAZY_MODULES = ["langchain_openai", "langchain_core", "langgraph", "openai", "httpx", "numpy", "tiktoken"]
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "loaded": sorted(m for m in {lazy!r} if m in sys.modules)}}))
+"""
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=APP_DIR,
+                          capture_output=True, text=True, check=True)
+
+
+def measure(module: str, runs: int, lazy: List[str]) -> Dict[str, Any]:
+    """Median import time of `module` over `runs` fresh interpreters."""
+    _run(["-c", f"import {module}"])   # warm-up: compile .pyc files, fill the OS cache
+
+    samples, loaded = [], set()
+    for _ in range(runs):
+        result = json.loads(_run(["-c", _PROBE.format(module=module, lazy=lazy)]).stdout.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        loaded.update(result["loaded"])
+
+    return {
+        "module": module,
+        "median_s": round(statistics.median(samples), 4),
+        "min_s": round(min(samples), 4),
+        "max_s": round(max(samples), 4),
+        "eagerly_loaded": sorted(loaded),
+    }
+
+
+def slowest_imports(module: str, top: int) -> List[Dict[str, Any]]:
+    """Top `top` imports by cumulative time, parsed from -X importtime."""
+    stderr = _run(["-X", "importtime", "-c", f"import {module}"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        rows.append({"module": name, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    rows.sort(key=lambda r: -r["cumulative_ms"])
+    return rows[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import time of the app.")
+    parser.add_argument("--modules", nargs="+", default=["app", "backend.evaluation"])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--lazy", nargs="*", default=DEFAULT_LAZY_MODULES,
+                        help="modules that must not be imported eagerly")
+    parser.add_argument("--max-seconds", type=float, help="fail when a median exceeds this")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    failures = []
+    results = []
+    for module in args.modules:
+        result = measure(module, args.runs, args.lazy)
+        result["slowest_imports"] = slowest_imports(module, args.top)
+        results.append(result)
+
+        print(f"{module}: median {result['median_s'] * 1000:.0f} ms "
+              f"(min {result['min_s'] * 1000:.0f}, max {result['max_s'] * 1000:.0f}, {args.runs} runs)")
+        for row in result["slowest_imports"]:
+            print(f"    {row['cumulative_ms']:>8.1f} ms  {row['module']}")
+        if result["eagerly_loaded"]:
+            failures.append(f"{module} imports {', '.join(result['eagerly_loaded'])} eagerly")
+        if args.max_seconds is not None and result["median_s"] > args.max_seconds:
+            failures.append(f"{module} median {result['median_s']:.3f}s > {args.max_seconds}s")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {args.out}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Local OpenAI-compatible stand-in for the GenAI Lab endpoint.
+
+Serves POST /chat/completions (and /v1/chat/completions), streaming and
+non-streaming, with configurable behavior so benchmarks run offline and
+reproducibly:
+
+- latency before the first token (fixed + optional jitter)
+- streaming speed (tokens per second) and answer length
+- error rate (HTTP 500) and rate-limit rate (HTTP 429 with Retry-After)
+- a random seed, so the same settings give the same error pattern
+
+Answers are canned but shaped like the real thing where the app parses them:
+judge prompts get a "Winner: A/B" verdict, follow-up prompts get a JSON list.
+
+Run standalone:
+    python -m benchmarks.mock_openai_server --port 8900 --latency 0.2 --tps 80
+
+then start the app with GENAI_BASE_URL=http://127.0.0.1:8900.
+
+Used by:
+    benchmarks/run_benchmarks.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class MockSettings:
+    latency: float = 0.2            # seconds before the first token
+    jitter: float = 0.0             # extra uniform random latency, 0..jitter
+    tokens_per_second: float = 100.0
+    answer_tokens: int = 60
+    error_rate: float = 0.0         # fraction of requests answered with 500
+    rate_limit_rate: float = 0.0    # fraction of requests answered with 429
+    seed: int = 0
+
+
+FOLLOWUP_ANSWER = '["What are the next cutover steps?", "Who owns the open KT items?", "Which risks need escalation?"]'
+
+
+class MockState:
+    """Settings + seeded RNG + counters shared by all handler threads."""
+
+    def __init__(self, settings: MockSettings):
+        self.settings = settings
+        self._rng = random.Random(settings.seed)
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    def draw(self) -> tuple:
+        """(outcome, extra latency) for the next request."""
+        with self._lock:
+            self.counts["requests"] += 1
+            roll = self._rng.random()
+            jitter = self._rng.uniform(0, self.settings.jitter) if self.settings.jitter else 0.0
+            if roll < self.settings.error_rate:
+                self.counts["errors"] += 1
+                return "error", jitter
+            if roll < self.settings.error_rate + self.settings.rate_limit_rate:
+                self.counts["rate_limited"] += 1
+                return "rate_limited", jitter
+            return "ok", jitter
+
+
+def _answer_for(messages: List[Dict[str, Any]], length: int) -> str:
+    prompt = " ".join(str(m.get("content", "")) for m in messages)
+    if "Winner: A" in prompt and "Answer B" in prompt:
+        return "Both answers are relevant; A is more actionable.\nWinner: A"
+    if "JSON list of strings" in prompt:
+        return FOLLOWUP_ANSWER
+    words = ("Transition readiness is on track with open KT and cutover risks "
+             "that need owner follow-up and weekly escalation review").split()
+    return " ".join(words[i % len(words)] for i in range(length))
+
+
+def _split_tokens(text: str) -> List[str]:
+    words = text.split(" ")
+    return [w + (" " if i < len(words) - 1 else "") for i, w in enumerate(words)]
+
+
+def make_handler(state: MockState):
+    settings = state.settings
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):   # keep benchmark output clean
+            pass
+
+        def _json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+            raw = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                self._json(200, dict(state.counts))
+            else:
+                self._json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+
+            if self.path.rstrip("/") not in ("/chat/completions", "/v1/chat/completions"):
+                self._json(404, {"error": {"message": "not found"}})
+                return
+
+            outcome, jitter = state.draw()
+            time.sleep(settings.latency + jitter)
+
+            if outcome == "error":
+                self._json(500, {"error": {"message": "mock internal error", "type": "server_error"}})
+                return
+            if outcome == "rate_limited":
+                self._json(429, {"error": {"message": "mock rate limit", "type": "rate_limit"}},
+                           headers={"Retry-After": "0.1"})
+                return
+
+            model = request.get("model", "mock")
+            messages = request.get("messages", [])
+            text = _answer_for(messages, settings.answer_tokens)
+            tokens = _split_tokens(text)
+            prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(tokens),
+                "total_tokens": prompt_tokens + len(tokens),
+            }
+
+            if request.get("stream"):
+                include_usage = (request.get("stream_options") or {}).get("include_usage", False)
+                self._stream(model, tokens, usage if include_usage else None)
+            else:
+                time.sleep(len(tokens) / settings.tokens_per_second)
+                self._json(200, {
+                    "id": f"chatcmpl-{uuid.uuid4().hex}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": usage,
+                })
+
+        def _stream(self, model: str, tokens: List[str], usage: Optional[Dict[str, int]]):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+            def send(delta: Dict[str, Any], finish: Optional[str] = None, extra: Optional[Dict] = None):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}] if delta is not None else [],
+                    **(extra or {}),
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            delay = 1.0 / settings.tokens_per_second if settings.tokens_per_second > 0 else 0.0
+            send({"role": "assistant", "content": ""})
+            for token in tokens:
+                if delay:
+                    time.sleep(delay)
+                send({"content": token})
+            send({}, finish="stop")
+            if usage is not None:
+                send(None, extra={"usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def start_mock_server(settings: MockSettings, host: str = "127.0.0.1", port: int = 0):
+    """Start the server in a daemon thread; returns (server, base_url, state)."""
+    state = MockState(settings)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-openai", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}", state
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency (0..jitter s)")
+    parser.add_argument("--tps", type=float, default=100.0, help="streamed tokens per second")
+    parser.add_argument("--answer-tokens", type=int, default=60, help="tokens per answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of HTTP 429 responses")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def settings_from_args(args: argparse.Namespace) -> MockSettings:
+    return MockSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tps,
+        answer_tokens=args.answer_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible chat completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server, base_url, _ = start_mock_server(settings_from_args(args), args.host, args.port)
+    print(f"Mock OpenAI server listening on {base_url}  (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
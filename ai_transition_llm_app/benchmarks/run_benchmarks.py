@@ -0,0 +1,321 @@
+"""
+End-to-end load test of app.py against the local mock OpenAI server.
+
+Runs fully offline and reproducibly:
+
+1. starts benchmarks/mock_openai_server.py in-process (configurable latency,
+   streaming speed, error and rate-limit rates)
+2. starts the app with uvicorn in a subprocess, pointed at the mock through
+   GENAI_BASE_URL, with the response / node / semantic chat caches and the
+   local rate limiter off so every request really reaches the (mock) model
+3. load-tests each scenario (/health, /chatbot, /mcp/invoke chat (fixed and
+   "auto"-routed model) / workflow / compare / judge) at each concurrency level: a fixed number of requests,
+   each with a unique question so no cache or coalescing short-circuits it
+4. prints p50 / p95 / p99 latency, requests/sec and error counts, optionally
+   writes them as JSON and compares p95 against a saved baseline
+
+Run from ai_transition_llm_app/:
+    python -m benchmarks.run_benchmarks --concurrency 1,8,32 --requests 64
+    python -m benchmarks.run_benchmarks --out bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --max-regression 20
+
+Exit code is 1 when any scenario's p95 regressed by more than
+--max-regression percent against the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.mock_openai_server import add_mock_arguments, settings_from_args, start_mock_server
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+BENCH_MODEL = "azure_ai/genailab-maas-DeepSeek-V3-0324"
+BENCH_MODEL_2 = "azure/genailab-maas-gpt-4o"
+
+
+# ============================================================
+# Scenarios
+# ============================================================
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    build: Callable[[int], Dict[str, Any]]   # request number -> httpx request kwargs
+
+
+def _invoke(tool: str, model: str = BENCH_MODEL, **extra: Any) -> Callable[[int], Dict[str, Any]]:
+    def build(i: int) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "tool": tool,
+            "model": model,
+            "input": f"Benchmark question #{i}: what are the top transition risks?",
+        }
+        if extra:
+            body["extra"] = extra
+        return {"json": body}
+    return build
+
+
+def _chatbot(i: int) -> Dict[str, Any]:
+    return {"data": {
+        "message": f"Benchmark question #{i}: summarize KT status.",
+        "llm1": BENCH_MODEL,
+        "session_id": f"bench-{i}",
+    }}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s for s in [
+        Scenario("health", "GET", "/health", lambda i: {}),
+        Scenario("chatbot", "POST", "/chatbot", _chatbot),
+        Scenario("mcp_chat", "POST", "/mcp/invoke", _invoke("chat")),
+        Scenario("mcp_chat_auto", "POST", "/mcp/invoke", _invoke("chat", model="auto")),
+        Scenario("mcp_workflow", "POST", "/mcp/invoke", _invoke("workflow")),
+        Scenario("mcp_compare", "POST", "/mcp/invoke",
+                 _invoke("compare", model2=BENCH_MODEL_2)),
+        Scenario("mcp_judge", "POST", "/mcp/invoke",
+                 _invoke("judge", answer_1="Owners are assigned.", answer_2="Risks are unclear.")),
+    ]
+}
+
+
+# ============================================================
+# Load generation + statistics
+# ============================================================
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (values need not be sorted)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))   # ceil
+    return ordered[int(rank) - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+    counter: itertools.count,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(next(counter))
+
+    async def worker() -> None:
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, scenario.path, **scenario.build(i))
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            if status != "200":
+                errors[status] = errors.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    return {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": sum(errors.values()),
+        "error_statuses": errors,
+        "rps": round(requests / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+async def run_all(base_url: str, scenarios: List[Scenario], levels: List[int],
+                  requests: int, timeout: float) -> List[Dict[str, Any]]:
+    counter = itertools.count()
+    limits = httpx.Limits(max_connections=max(levels) + 4, max_keepalive_connections=max(levels) + 4)
+    results = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        for scenario in scenarios:
+            # Warm-up request (imports, connection setup) is not measured
+            await client.request(scenario.method, scenario.path, **scenario.build(next(counter)))
+            for level in levels:
+                result = await run_scenario(client, scenario, level, max(requests, level), counter)
+                results.append(result)
+                print(_format_row(result), flush=True)
+    return results
+
+
+# ============================================================
+# App process
+# ============================================================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(mock_url: str, port: int, workers: int, env_overrides: Dict[str, str]) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "GENAI_BASE_URL": mock_url,
+        "GENAI_KEY": "benchmark",
+        "LLM_CACHE_ENABLED": "0",
+        "WORKFLOW_NODE_CACHE_ENABLED": "0",
+        "CHAT_SEMANTIC_CACHE_ENABLED": "0",
+        "LLM_RATE_LIMIT_DEFAULT": json.dumps({"rps": 0}),
+        **env_overrides,
+    }
+    cmd = [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+           "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(cmd, cwd=APP_DIR, env=env)
+
+
+def wait_until_healthy(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited during startup (code {process.returncode}).")
+        try:
+            if httpx.get(f"{url}/health", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"App did not become healthy within {timeout:.0f}s.")
+
+
+# ============================================================
+# Reporting + regression check
+# ============================================================
+
+def _format_row(r: Dict[str, Any]) -> str:
+    return (f"{r['scenario']:<14} c={r['concurrency']:<4} n={r['requests']:<5} "
+            f"rps={r['rps']:>8.2f}  p50={r['p50_ms']:>8.1f}ms  p95={r['p95_ms']:>8.1f}ms  "
+            f"p99={r['p99_ms']:>8.1f}ms  errors={r['errors']}")
+
+
+def find_regressions(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                     max_regression_pct: float) -> List[str]:
+    """Scenarios whose p95 is more than max_regression_pct above the baseline."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = previous.get((r["scenario"], r["concurrency"]))
+        if not old or not old.get("p95_ms"):
+            continue
+        change = (r["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+        if change > max_regression_pct:
+            regressions.append(
+                f"{r['scenario']} c={r['concurrency']}: p95 {old['p95_ms']}ms → {r['p95_ms']}ms (+{change:.0f}%)"
+            )
+    return regressions
+
+
+def _parse_env(pairs: List[str]) -> Dict[str, str]:
+    env = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"--app-env expects NAME=VALUE, got {pair!r}")
+        env[name] = value
+    return env
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test app.py against a local mock LLM endpoint.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=64, help="requests per scenario and level")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout (s)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--app-url", help="benchmark an already running app instead of starting one")
+    parser.add_argument("--app-env", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra environment for the app process (repeatable)")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="allowed p95 increase over the baseline, in percent")
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    mock_settings = settings_from_args(args)
+    mock_server, mock_url, mock_state = start_mock_server(mock_settings)
+    process = None
+    try:
+        app_url = args.app_url
+        if not app_url:
+            port = _free_port()
+            app_url = f"http://127.0.0.1:{port}"
+            process = start_app(mock_url, port, args.workers, _parse_env(args.app_env))
+            wait_until_healthy(app_url, process)
+
+        print(f"Mock LLM {mock_url}: {mock_settings}")
+        print(f"App {app_url}\n")
+        results = asyncio.run(run_all(app_url, [SCENARIOS[n] for n in names], levels,
+                                      args.requests, args.timeout))
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        mock_server.shutdown()
+
+    print(f"\nMock LLM calls: {mock_state.counts}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps({
+            "mock": vars(mock_settings),
+            "results": results,
+        }, indent=2), encoding="utf-8")
+        print(f"Results written to {args.out}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = find_regressions(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\np95 regressions over {args.max_regression:.0f}%:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo p95 regression over {args.max_regression:.0f}% against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Shared test fixtures.
+
+Run from ai_transition_llm_app/:  python -m pytest -q
+"""
+
+from __future__ import annotations
+
+import pytest
+
+
+class FakeClock:
+    """
+    Stand-in for the `time` module of the code under test: time() and
+    monotonic() only move when advance() (or sleep()) is called.
+    """
+
+    def __init__(self, start: float = 1_000.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
@@ -0,0 +1,88 @@
+"""Tests for backend/chat_memory.py (token budget, rolling summary, session eviction)."""
+
+from __future__ import annotations
+
+from backend import chat_memory
+from backend.chat_memory import ChatMemoryStore
+from backend.tokens import count_tokens
+
+LONG_REPLY = "The cutover is planned for March. " + "Details follow here. " * 20
+
+
+def _store(**kwargs) -> ChatMemoryStore:
+    settings = {"token_budget": 10_000, "summary_token_budget": 10_000, "idle_seconds": 3600, "max_sessions": 10}
+    return ChatMemoryStore(**{**settings, **kwargs})
+
+
+def test_history_lists_turns_in_order():
+    store = _store()
+    store.append_turn("hello", "hi there", session_id="s")
+    store.append_turn("status?", "on track", session_id="s")
+
+    assert store.history_text("s") == "User: hello\nAssistant: hi there\nUser: status?\nAssistant: on track\n"
+    assert store.history_text("other") == ""
+
+
+def test_sessions_are_independent():
+    store = _store()
+    store.append_turn("one", "1", session_id="a")
+    store.append_turn("two", "2", session_id="b")
+    assert store.turns("a") == [{"role": "user", "text": "one"}, {"role": "assistant", "text": "1"}]
+    assert store.turns("b")[0]["text"] == "two"
+
+
+def test_over_budget_turns_fold_into_summary_but_latest_exchange_stays():
+    exchange = count_tokens("When is cutover?") + count_tokens(LONG_REPLY)
+    store = _store(token_budget=exchange + 5)
+    store.append_turn("When is cutover?", LONG_REPLY, session_id="s")
+    store.append_turn("Who owns it?", LONG_REPLY, session_id="s")
+
+    turns = store.turns("s")
+    assert [t["text"] for t in turns] == ["Who owns it?", LONG_REPLY]
+
+    history = store.history_text("s")
+    assert history.startswith("Summary of earlier conversation:\n- User asked: When is cutover?\n")
+    # Folded replies keep their first sentence only
+    assert "- Assistant said: The cutover is planned for March.\n" in history
+
+
+def test_single_exchange_over_budget_is_kept_verbatim():
+    store = _store(token_budget=1)
+    store.append_turn("question", LONG_REPLY, session_id="s")
+    assert len(store.turns("s")) == 2
+    assert "Summary" not in store.history_text("s")
+
+
+def test_summary_drops_oldest_lines_over_its_budget():
+    line_tokens = count_tokens("- User asked: question 3")
+    store = _store(token_budget=1, summary_token_budget=2 * line_tokens)
+    for i in range(5):
+        store.append_turn(f"question {i}", f"answer {i}.", session_id="s")
+
+    summary = store.history_text("s").split("\n\n")[0]
+    assert "question 0" not in summary
+    assert summary.endswith("- Assistant said: answer 3.")
+
+
+def test_live_sessions_are_capped_least_recently_used_first():
+    store = _store(max_sessions=2)
+    store.append_turn("q", "a", session_id="a")
+    store.append_turn("q", "a", session_id="b")
+    store.history_text("a")                      # "b" is now the least recently used
+    store.append_turn("q", "a", session_id="c")
+
+    assert store.stats()["sessions"] == 2
+    assert store.turns("b") == []
+    assert store.turns("a") and store.turns("c")
+
+
+def test_idle_sessions_are_swept(monkeypatch, clock):
+    monkeypatch.setattr(chat_memory, "time", clock)
+    store = _store(idle_seconds=300)
+    store.append_turn("q", "a", session_id="old")
+    clock.advance(200)
+    store.append_turn("q", "a", session_id="recent")
+
+    clock.advance(chat_memory.SWEEP_INTERVAL_SECONDS + 150)
+    assert store.turns("recent")
+    assert store.turns("old") == []
@@ -0,0 +1,141 @@
+"""Tests for request coalescing: SingleFlight (singleflight.py) and /mcp/batch dedup (router.py)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.mcp_server import router
+from backend.mcp_server.router import MCPBatchRequest, invoke_mcp_batch
+from backend.mcp_server.singleflight import SingleFlight, coalesce_key
+
+
+# ============================================================
+# SingleFlight
+# ============================================================
+
+def test_coalesce_key_ignores_extra_key_order():
+    a = coalesce_key("chat", {"model": "m", "input": "q", "extra": {"x": 1, "y": 2}})
+    b = coalesce_key("chat", {"model": "m", "input": "q", "extra": {"y": 2, "x": 1}})
+    assert a == b
+    assert a != coalesce_key("chat", {"model": "other", "input": "q", "extra": {"x": 1, "y": 2}})
+
+
+def test_concurrent_calls_with_one_key_execute_once():
+    flight = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def scenario():
+        same = [flight.do("k", lambda: work("shared")) for _ in range(5)]
+        other = flight.do("other", lambda: work("other"))
+        return await asyncio.gather(*same, other)
+
+    results = asyncio.run(scenario())
+    assert results == ["shared"] * 5 + ["other"]
+    assert sorted(calls) == ["other", "shared"]
+
+    stats = flight.stats()
+    assert stats["executed"] == 2 and stats["coalesced"] == 4
+    assert stats["in_flight"] == 0
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        return await flight.do("k", work), await flight.do("k", work)
+
+    assert asyncio.run(scenario()) == (1, 2)
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        return await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["executed"] == 1
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ("done", True)
+
+
+# ============================================================
+# /mcp/batch dedup
+# ============================================================
+
+@pytest.fixture
+def invoked(monkeypatch):
+    """Replace tool execution with a recorder; tool "bad" fails with 400."""
+    calls = []
+
+    async def fake_invoke(tool_name, payload, queue_timeout=None):
+        calls.append(payload)
+        await asyncio.sleep(0)
+        if tool_name == "bad":
+            raise HTTPException(status_code=400, detail="bad input")
+        return {"echo": payload["input"]}
+
+    monkeypatch.setattr(router, "_invoke", fake_invoke)
+    return calls
+
+
+def test_batch_runs_identical_calls_once(invoked):
+    req = MCPBatchRequest(calls=[
+        {"tool": "search", "input": "kt", "extra": {"k": 3}},
+        {"tool": "search", "input": "cutover"},
+        {"tool": "search", "input": "kt", "extra": {"k": 3}},
+        {"tool": "bad", "input": "x"},
+    ])
+    response = asyncio.run(invoke_mcp_batch(req))
+
+    assert [p["input"] for p in invoked] == ["kt", "cutover", "x"]
+    results = response["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[2]["duplicate_of"] == 0 and results[2]["result"] == {"echo": "kt"}
+    assert "duplicate_of" not in results[1]
+    assert results[3] == {"index": 3, "tool": "bad", "ok": False, "status": 400, "error": "bad input"}
+
+    stats = response["stats"]
+    assert stats["calls"] == 4 and stats["executed"] == 3
+    assert stats["succeeded"] == 3 and stats["failed"] == 1
+
+
+def test_batch_with_different_extra_is_not_deduplicated(invoked):
+    req = MCPBatchRequest(calls=[
+        {"tool": "search", "input": "kt", "extra": {"k": 3}},
+        {"tool": "search", "input": "kt", "extra": {"k": 4}},
+    ])
+    assert asyncio.run(invoke_mcp_batch(req))["stats"]["executed"] == 2
@@ -0,0 +1,133 @@
+"""Tests for backend/llm_cache.py (keys, memory LRU / TTL, SQLite tier)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend import llm_cache
+from backend.llm_cache import ResponseCache, llm_cache_key, make_cache_key
+
+
+@pytest.fixture
+def frozen(monkeypatch, clock):
+    monkeypatch.setattr(llm_cache, "time", clock)
+    return clock
+
+
+# ============================================================
+# Keys
+# ============================================================
+
+def test_cache_key_is_stable_and_input_sensitive():
+    assert make_cache_key("a", {"x": 1, "y": 2}) == make_cache_key("a", {"y": 2, "x": 1})
+    assert make_cache_key("a", 1) != make_cache_key("a", 2)
+
+    key = llm_cache_key("model", None, "prompt", 0.2)
+    assert key == llm_cache_key("model", "", "prompt", 0.2)
+    assert key != llm_cache_key("model", None, "prompt", 0.3)
+    assert key != llm_cache_key("other", None, "prompt", 0.2)
+
+
+# ============================================================
+# Memory tier
+# ============================================================
+
+def test_memory_lru_evicts_least_recently_used(frozen):
+    cache = ResponseCache(max_entries=2, ttl_seconds=0)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"        # "b" is now the oldest
+
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["memory_entries"] == 2
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_memory_entries_expire_after_ttl(frozen):
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    cache.set("k", "v")
+
+    frozen.advance(60)
+    assert cache.get("k") == "v"
+    frozen.advance(1)
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_ttl_zero_never_expires(frozen):
+    cache = ResponseCache(max_entries=10, ttl_seconds=0)
+    cache.set("k", "v")
+    frozen.advance(10 ** 9)
+    assert cache.get("k") == "v"
+
+
+def test_clear_drops_everything(tmp_path):
+    cache = ResponseCache(db_path=str(tmp_path / "cache.sqlite3"))
+    cache.set("k", "v")
+    cache.clear()
+    assert cache.get("k") is None
+    assert ResponseCache(db_path=str(tmp_path / "cache.sqlite3")).get("k") is None
+
+
+# ============================================================
+# Disk tier
+# ============================================================
+
+def test_disk_tier_survives_a_new_instance_and_promotes_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    ResponseCache(db_path=path).set("k", "v")
+
+    cache = ResponseCache(db_path=path)
+    assert cache.get("k") == "v"
+    assert cache.get("k") == "v"
+    stats = cache.stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+
+def test_disk_entries_expire_after_ttl(tmp_path, frozen):
+    path = str(tmp_path / "cache.sqlite3")
+    ResponseCache(ttl_seconds=60, db_path=path).set("k", "v")
+
+    frozen.advance(61)
+    cache = ResponseCache(ttl_seconds=60, db_path=path)
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_disk_eviction_keeps_recently_accessed_rows(tmp_path, frozen):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = ResponseCache(max_entries=1, ttl_seconds=0, db_path=path, max_disk_entries=2)
+    writer.set("a", "A")
+    frozen.advance(1)
+    writer.set("b", "B")
+    frozen.advance(1)
+
+    # A disk hit on "a" makes "b" the least recently accessed row
+    reader = ResponseCache(max_entries=1, ttl_seconds=0, db_path=path, max_disk_entries=2)
+    assert reader.get("a") == "A"
+    frozen.advance(1)
+    reader.set("c", "C")
+
+    fresh = ResponseCache(max_entries=1, ttl_seconds=0, db_path=path, max_disk_entries=2)
+    assert fresh.get("b") is None
+    assert fresh.get("a") == "A" and fresh.get("c") == "C"
+
+
+def test_async_get_and_set_use_both_tiers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+
+    async def scenario():
+        await ResponseCache(db_path=path).aset("k", "v")
+        cache = ResponseCache(db_path=path)
+        return await cache.aget("k"), await cache.aget("missing"), cache.stats()
+
+    value, missing, stats = asyncio.run(scenario())
+    assert value == "v" and missing is None
+    assert stats["disk_hits"] == 1 and stats["misses"] == 1
@@ -0,0 +1,265 @@
+"""Tests for backend/llm_resilience.py (backoff, token bucket, breaker, errors, ModelGuard)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from backend import llm_resilience
+from backend.llm_resilience import (
+    CircuitBreaker,
+    LLMCircuitOpenError,
+    LLMError,
+    LLMRateLimitError,
+    LLMTimeoutError,
+    LLMUnavailableError,
+    ModelGuard,
+    TokenBucket,
+    backoff_delay,
+    classify_error,
+)
+
+_REQUEST = httpx.Request("POST", "http://genai.test/v1/chat/completions")
+
+
+def _response(status: int, **headers: str) -> httpx.Response:
+    return httpx.Response(status, headers=headers, request=_REQUEST)
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture
+def retry_settings(monkeypatch):
+    monkeypatch.setattr(llm_resilience, "LLM_RETRY_BASE_DELAY_SECONDS", 1.0)
+    monkeypatch.setattr(llm_resilience, "LLM_RETRY_MAX_DELAY_SECONDS", 8.0)
+    monkeypatch.setattr(llm_resilience, "LLM_MAX_RETRIES", 2)
+
+
+# ============================================================
+# Backoff
+# ============================================================
+
+@pytest.mark.parametrize("attempt, cap", [(0, 1.0), (1, 2.0), (2, 4.0), (3, 8.0), (6, 8.0)])
+def test_backoff_stays_within_exponential_cap(retry_settings, attempt, cap):
+    delays = [backoff_delay(attempt) for _ in range(200)]
+    assert all(0.0 <= d <= cap for d in delays)
+    # Full jitter: delays spread over the whole window
+    assert min(delays) < cap / 2 < max(delays)
+
+
+def test_backoff_honors_retry_after(retry_settings):
+    assert all(backoff_delay(0, retry_after=5.0) >= 5.0 for _ in range(50))
+
+
+# ============================================================
+# Token bucket
+# ============================================================
+
+def test_token_bucket_allows_burst_then_queues(monkeypatch, clock):
+    monkeypatch.setattr(llm_resilience, "time", clock)
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.reserve(max_wait=1.0) == 0.0
+    assert bucket.reserve(max_wait=1.0) == 0.0
+    assert bucket.reserve(max_wait=1.0) == pytest.approx(0.1)
+    # Queued behind the previous reservation
+    assert bucket.reserve(max_wait=1.0) == pytest.approx(0.2)
+
+
+def test_token_bucket_rejects_waits_over_limit_without_booking(monkeypatch, clock):
+    monkeypatch.setattr(llm_resilience, "time", clock)
+    bucket = TokenBucket(rate=1, burst=1)
+
+    assert bucket.reserve(max_wait=0.0) == 0.0
+    assert bucket.reserve(max_wait=0.5) is None
+    assert bucket.reserve(max_wait=0.5) is None
+
+    clock.advance(1.0)
+    assert bucket.reserve(max_wait=0.0) == 0.0
+
+
+def test_token_bucket_refill_is_capped_at_burst(monkeypatch, clock):
+    monkeypatch.setattr(llm_resilience, "time", clock)
+    bucket = TokenBucket(rate=5, burst=2)
+    clock.advance(60.0)
+
+    assert bucket.reserve(max_wait=0.0) == 0.0
+    assert bucket.reserve(max_wait=0.0) == 0.0
+    assert bucket.reserve(max_wait=0.0) is None
+
+
+def test_token_bucket_without_rate_never_waits():
+    bucket = TokenBucket(rate=0, burst=1)
+    assert [bucket.reserve(max_wait=0.0) for _ in range(100)] == [0.0] * 100
+
+
+# ============================================================
+# Circuit breaker
+# ============================================================
+
+def test_breaker_opens_after_threshold_and_half_opens_after_reset(monkeypatch, clock):
+    monkeypatch.setattr(llm_resilience, "time", clock)
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after() == pytest.approx(30)
+
+    clock.advance(30)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    # Only one probe at a time
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_breaker_failed_probe_reopens(monkeypatch, clock):
+    monkeypatch.setattr(llm_resilience, "time", clock)
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10)
+
+    breaker.record_failure()
+    clock.advance(10)
+    assert breaker.allow() and breaker.state == "half_open"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_breaker_lets_another_probe_through_if_the_last_never_reported(monkeypatch, clock):
+    monkeypatch.setattr(llm_resilience, "time", clock)
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10)
+
+    breaker.record_failure()
+    clock.advance(10)
+    assert breaker.allow()
+    clock.advance(10)
+    assert breaker.allow()
+
+
+def test_breaker_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+# ============================================================
+# Error classification
+# ============================================================
+
+def test_classify_rate_limit_reads_retry_after():
+    exc = openai.RateLimitError("slow down", response=_response(429, **{"retry-after": "3"}), body=None)
+    error = classify_error(exc, "m")
+    assert isinstance(error, LLMRateLimitError)
+    assert error.transient and error.status_code == 429
+    assert error.retry_after == 3.0 and error.model == "m"
+
+
+@pytest.mark.parametrize("exc", [
+    openai.APITimeoutError(request=_REQUEST),
+    httpx.ReadTimeout("read timed out", request=_REQUEST),
+    asyncio.TimeoutError(),
+])
+def test_classify_timeouts(exc):
+    error = classify_error(exc, "m")
+    assert isinstance(error, LLMTimeoutError) and error.status_code == 504
+
+
+@pytest.mark.parametrize("exc", [
+    openai.APIConnectionError(request=_REQUEST),
+    httpx.ConnectError("refused", request=_REQUEST),
+    _StatusError(503),
+])
+def test_classify_unavailable(exc):
+    error = classify_error(exc, "m")
+    assert isinstance(error, LLMUnavailableError) and error.transient
+
+
+def test_classify_status_429_without_sdk_type():
+    assert isinstance(classify_error(_StatusError(429), "m"), LLMRateLimitError)
+
+
+@pytest.mark.parametrize("exc", [_StatusError(400), ValueError("bad response")])
+def test_classify_permanent_errors(exc):
+    error = classify_error(exc, "m")
+    assert type(error) is LLMError
+    assert not error.transient and error.status_code == 502
+
+
+def test_classify_passes_llm_errors_through():
+    error = LLMTimeoutError("already typed", "m")
+    assert classify_error(error, "other") is error
+
+
+# ============================================================
+# ModelGuard
+# ============================================================
+
+@pytest.fixture
+def guard(monkeypatch, retry_settings):
+    monkeypatch.setattr(llm_resilience, "LLM_BREAKER_FAILURE_THRESHOLD", 3)
+    monkeypatch.setattr(llm_resilience, "LLM_BREAKER_RESET_SECONDS", 30.0)
+    monkeypatch.setattr(llm_resilience, "LLM_RATE_LIMIT_DEFAULT", {"rps": 0, "burst": 1})
+    return ModelGuard("test-model")
+
+
+def test_guard_retries_transient_errors_until_max_retries(guard):
+    error, delay = guard.on_failure(_StatusError(503), attempt=0)
+    assert isinstance(error, LLMUnavailableError) and delay is not None
+    _, delay = guard.on_failure(_StatusError(503), attempt=1)
+    assert delay is not None
+    _, delay = guard.on_failure(_StatusError(503), attempt=2)
+    assert delay is None
+    assert guard.stats()["retries"] == 2
+
+
+def test_guard_gives_up_at_once_on_permanent_errors(guard):
+    error, delay = guard.on_failure(_StatusError(400), attempt=0)
+    assert delay is None and not error.transient
+    # The endpoint answered, so the model is not counted as down
+    assert guard.breaker.state == "closed"
+
+
+def test_guard_gives_up_when_retry_after_exceeds_max_delay(guard):
+    exc = openai.RateLimitError("slow down", response=_response(429, **{"retry-after": "60"}), body=None)
+    error, delay = guard.on_failure(exc, attempt=0)
+    assert isinstance(error, LLMRateLimitError) and delay is None
+
+
+def test_guard_fails_fast_while_circuit_is_open(guard):
+    for attempt in range(3):
+        guard.on_failure(_StatusError(502), attempt)
+    assert guard.stats()["circuit"] == "open"
+
+    with pytest.raises(LLMCircuitOpenError) as info:
+        guard.acquire()
+    assert info.value.retry_after == pytest.approx(30.0, abs=1.0)
+    assert guard.stats()["rejected"] == 1
+
+
+def test_guard_rejects_calls_over_local_rate_limit(monkeypatch, guard, clock):
+    monkeypatch.setattr(llm_resilience, "time", clock)
+    monkeypatch.setattr(llm_resilience, "LLM_RATE_LIMIT_MAX_WAIT_SECONDS", 0.0)
+    guard.bucket = TokenBucket(rate=1, burst=1)
+
+    guard.acquire()
+    with pytest.raises(LLMRateLimitError):
+        guard.acquire()
+    stats = guard.stats()
+    assert stats["attempts"] == 1 and stats["rejected"] == 1
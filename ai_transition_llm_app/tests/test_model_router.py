@@ -0,0 +1,131 @@
+"""Tests for backend/model_router.py (classification, ModelStats, candidate choice)."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend import model_router
+from backend.config import AUTO_MODEL
+from backend.model_router import ModelRoutingError, ModelStats, _choose, classify_complexity, route, route_payload
+
+CANDIDATES = ["fast", "medium", "slow"]
+
+
+@pytest.fixture
+def stats(monkeypatch, clock):
+    """Fresh routing stats on a fake clock, with every circuit closed."""
+    monkeypatch.setattr(model_router, "time", clock)
+    fresh = ModelStats(alpha=0.5, ttl_seconds=600)
+    monkeypatch.setattr(model_router, "MODEL_STATS", fresh)
+    monkeypatch.setattr(model_router, "MODEL_ROUTING_MAX_ERROR_RATE", 0.25)
+    monkeypatch.setattr(model_router, "llm_resilience_stats", lambda: {})
+    return fresh
+
+
+# ============================================================
+# Complexity classification
+# ============================================================
+
+def test_classify_small_talk_as_simple():
+    assert classify_complexity("hi").tier == "simple"
+    assert classify_complexity("What is the status of TR-001?").tier == "simple"
+
+
+def test_classify_multi_part_reasoning_as_complex():
+    text = ("Compare the KT readiness of both towers and estimate the impact on the cutover. "
+            "What if the SME leaves early? Which mitigations would you prioritize?")
+    complexity = classify_complexity(text)
+    assert complexity.tier == "complex"
+    assert any(reason.startswith("reasoning") for reason in complexity.reasons)
+
+
+# ============================================================
+# ModelStats
+# ============================================================
+
+def test_stats_track_moving_averages(stats):
+    stats.observe("m", 2.0, ok=True)
+    stats.observe("m", 4.0, ok=True)
+    stats.observe("m", 10.0, ok=False)
+
+    s = stats.get("m")
+    assert s["calls"] == 3
+    # Failed calls do not move the latency average
+    assert s["latency_s"] == pytest.approx(3.0)
+    assert s["error_rate"] == pytest.approx(0.5)
+
+
+def test_stats_go_stale_after_ttl(stats, clock):
+    stats.observe("m", 1.0, ok=True)
+    clock.advance(601)
+    assert stats.get("m") is None
+    assert stats.snapshot() == {}
+
+
+# ============================================================
+# Choosing a candidate
+# ============================================================
+
+def test_unmeasured_candidate_is_tried_in_order(stats):
+    assert _choose(CANDIDATES, max_latency=5.0) == ("fast", {})
+
+
+def test_slow_and_failing_candidates_are_skipped(stats):
+    stats.observe("fast", 9.0, ok=True)
+    stats.observe("medium", 1.0, ok=False)
+    stats.observe("slow", 3.0, ok=True)
+
+    model, skipped = _choose(CANDIDATES, max_latency=5.0)
+    assert model == "slow"
+    assert skipped == {"fast": "latency 9.0s", "medium": "error rate 0.50"}
+
+
+def test_open_circuits_are_skipped(stats, monkeypatch):
+    monkeypatch.setattr(model_router, "llm_resilience_stats", lambda: {"fast": {"circuit": "open"}})
+    assert _choose(CANDIDATES, max_latency=None) == ("medium", {"fast": "circuit open"})
+
+
+def test_best_expected_time_wins_when_nothing_meets_targets(stats):
+    stats.observe("fast", 8.0, ok=True)
+    stats.observe("medium", 6.0, ok=True)
+    stats.observe("slow", 20.0, ok=True)
+
+    model, skipped = _choose(CANDIDATES, max_latency=5.0)
+    assert model == "medium"
+    assert set(skipped) == set(CANDIDATES)
+
+
+def test_every_circuit_open_falls_back_to_first_candidate(stats, monkeypatch):
+    monkeypatch.setattr(model_router, "llm_resilience_stats",
+                        lambda: {m: {"circuit": "open"} for m in CANDIDATES})
+    model, skipped = _choose(CANDIDATES, max_latency=None)
+    assert model == "fast" and len(skipped) == 3
+
+
+# ============================================================
+# Routing
+# ============================================================
+
+def test_agents_never_route_below_min_tier(stats, monkeypatch):
+    monkeypatch.setattr(model_router, "MODEL_ROUTING_AGENT_MIN_TIER", "moderate")
+    monkeypatch.setattr(model_router, "MODEL_ROUTING_TIERS", {
+        "simple": {"models": ["small"]},
+        "moderate": {"models": ["large"]},
+        "complex": {"models": ["reasoning"]},
+    })
+    assert route("hi", task="chat").model == "small"
+    assert route("hi", task="agent").model == "large"
+
+
+def test_tier_without_models_raises_routing_error(stats, monkeypatch):
+    monkeypatch.setattr(model_router, "MODEL_ROUTING_TIERS", {"simple": {"models": []}})
+    with pytest.raises(ModelRoutingError, match="tier 'simple'"):
+        route("hi")
+
+
+def test_route_payload_only_resolves_auto(stats):
+    payload = {"model": "some-model", "input": "hi"}
+    assert route_payload("chat", payload) == (payload, None)
+
+    routed, decision = route_payload("chat", {"model": AUTO_MODEL, "input": "hi"})
+    assert routed["model"] == decision.model != AUTO_MODEL
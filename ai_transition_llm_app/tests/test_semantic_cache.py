@@ -0,0 +1,146 @@
+"""Tests for backend/semantic_cache.py (matching, follow-ups, scopes, LRU / TTL)."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend import semantic_cache
+from backend.semantic_cache import SemanticCache, is_follow_up, normalize_words
+
+# The cache stays empty without NumPy
+pytest.importorskip("numpy")
+
+SCOPE = ("v1", "model-a")
+
+
+def _cache(**kwargs) -> SemanticCache:
+    settings = {"enabled": True, "threshold": 0.9, "max_entries": 8, "ttl_seconds": 0, "dim": 512}
+    return SemanticCache(**{**settings, **kwargs})
+
+
+@pytest.fixture
+def frozen(monkeypatch, clock):
+    monkeypatch.setattr(semantic_cache, "time", clock)
+    return clock
+
+
+# ============================================================
+# Text handling
+# ============================================================
+
+def test_normalize_folds_synonyms_and_drops_filler():
+    assert normalize_words("What are the biggest issues right now?") == ["top", "risk"]
+    assert normalize_words("Please list the main risks") == ["top", "risk"]
+
+
+@pytest.mark.parametrize("text", [
+    "why is that?",
+    "tell me more",
+    "What about TR-002?",
+    "and the owners?",
+    "Which of those is highest?",
+    "why?",
+])
+def test_follow_ups(text):
+    assert is_follow_up(text)
+
+
+@pytest.mark.parametrize("text", [
+    "what are the top risks that block KT?",
+    "Which environments are not ready yet?",
+    "List open risks",
+])
+def test_standalone_questions_are_not_follow_ups(text):
+    assert not is_follow_up(text)
+
+
+# ============================================================
+# Lookup / store
+# ============================================================
+
+def test_paraphrase_hits_and_returns_suggestions():
+    cache = _cache()
+    cache.store("What are the biggest risks?", SCOPE, "answer", ["next?"])
+
+    hit = cache.lookup("main risks right now", SCOPE)
+    assert hit is not None
+    assert hit.answer == "answer" and hit.suggestions == ["next?"]
+    assert hit.similarity >= 0.9
+
+
+def test_different_identifiers_never_match():
+    cache = _cache()
+    cache.store("What is the status of TR-001?", SCOPE, "TR-001 answer", [])
+
+    assert cache.lookup("What is the status of TR-002?", SCOPE) is None
+    assert cache.lookup("Status of TR-001", SCOPE).answer == "TR-001 answer"
+
+
+def test_scopes_are_isolated():
+    cache = _cache()
+    cache.store("What are the top risks?", SCOPE, "answer", [])
+    assert cache.lookup("What are the top risks?", ("v2", "model-a")) is None
+    assert cache.lookup("What are the top risks?", ("v1", "model-b")) is None
+
+
+def test_follow_ups_skip_lookup_only_in_conversation():
+    cache = _cache()
+    cache.store("what about TR-002 owners", SCOPE, "never stored", [])
+    assert cache.stats()["stores"] == 0
+
+    cache.store("owners of TR-002", SCOPE, "owner answer", [])
+    assert cache.lookup("what about TR-002 owners", SCOPE, in_conversation=True) is None
+    assert cache.stats()["skipped_follow_ups"] == 1
+    assert cache.lookup("what about TR-002 owners", SCOPE, in_conversation=False) is not None
+
+
+def test_disabled_cache_never_stores():
+    cache = _cache(enabled=False)
+    cache.store("What are the top risks?", SCOPE, "answer", [])
+    assert cache.lookup("What are the top risks?", SCOPE) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_storing_the_same_question_refreshes_its_slot():
+    cache = _cache()
+    cache.store("What are the top risks?", SCOPE, "old", [])
+    cache.store("What are the top risks?", SCOPE, "new", [])
+    assert cache.stats()["entries"] == 1
+    assert cache.lookup("What are the top risks?", SCOPE).answer == "new"
+
+
+# ============================================================
+# Eviction
+# ============================================================
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = _cache(max_entries=2)
+    cache.store("Who owns the database migration?", SCOPE, "db", [])
+    cache.store("When is the cutover date?", SCOPE, "cutover", [])
+    assert cache.lookup("Who owns the database migration?", SCOPE) is not None
+
+    cache.store("Which environments are not ready?", SCOPE, "envs", [])
+    assert cache.lookup("When is the cutover date?", SCOPE) is None
+    assert cache.lookup("Who owns the database migration?", SCOPE).answer == "db"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_miss_and_free_their_slot(frozen):
+    cache = _cache(max_entries=2, ttl_seconds=60)
+    cache.store("Who owns the database migration?", SCOPE, "db", [])
+    frozen.advance(61)
+    assert cache.lookup("Who owns the database migration?", SCOPE) is None
+
+    cache.store("When is the cutover date?", SCOPE, "cutover", [])
+    cache.store("Which environments are not ready?", SCOPE, "envs", [])
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 0
+
+
+def test_scopes_without_entries_are_forgotten():
+    cache = _cache(max_entries=1)
+    for version in range(5):
+        cache.store("What are the top risks?", (version, "model-a"), f"answer {version}", [])
+
+    assert list(cache._scope_ids) == [(4, "model-a")]
+    assert cache.lookup("What are the top risks?", (4, "model-a")).answer == "answer 4"